@@ -0,0 +1,76 @@
+"""
+Recall vs latency benchmark for the LSA approximate nearest neighbor index.
+
+Builds LSA embeddings over a generated article corpus, then compares IVF
+search at several nprobe settings against exact search over all embeddings.
+
+Usage:
+    python benchmarks/benchmark_ann_recall.py --num-articles 100000 --nlist 256
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+# Make the src package importable when run from the Model directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from article_recommender import ArticleRecommender, create_sample_article_dataset
+from utils.ann_index import IVFIndex, exact_search
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--num-articles', type=int, default=100000)
+    parser.add_argument('--num-queries', type=int, default=1000)
+    parser.add_argument('--embedding-dim', type=int, default=128)
+    parser.add_argument('--nlist', type=int, default=256)
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument('--top-n', type=int, default=10)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        articles_path = os.path.join(tmp_dir, 'articles.csv')
+        create_sample_article_dataset(articles_path, num_articles=args.num_articles)
+        
+        recommender = ArticleRecommender()
+        recommender.model_type = 'lsa'
+        recommender.embedding_dim = args.embedding_dim
+        recommender.load_articles(articles_path)
+        recommender.build_article_vectors()
+    
+    embeddings = recommender.article_embeddings
+    
+    # Use held-out perturbations of article embeddings as queries
+    rng = np.random.default_rng(0)
+    queries = embeddings[rng.choice(len(embeddings), size=args.num_queries, replace=False)]
+    queries = queries + rng.normal(scale=0.05, size=queries.shape).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    
+    start = time.perf_counter()
+    exact = exact_search(embeddings, queries, args.top_n)
+    exact_ms = (time.perf_counter() - start) / len(queries) * 1000
+    exact_sets = [set(indices.tolist()) for indices, _ in exact]
+    
+    start = time.perf_counter()
+    index = IVFIndex(nlist=args.nlist)
+    index.fit(embeddings)
+    print(f"\nIVF index with {args.nlist} lists built in {time.perf_counter() - start:.2f} s")
+    
+    print(f"\n{'search':>12} {f'recall@{args.top_n}':>10} {'ms/query':>10}")
+    print(f"{'exact':>12} {1.0:>10.3f} {exact_ms:>10.3f}")
+    for nprobe in args.nprobe:
+        start = time.perf_counter()
+        approx = index.search(embeddings, queries, args.top_n, nprobe=nprobe)
+        ann_ms = (time.perf_counter() - start) / len(queries) * 1000
+        
+        recall = np.mean([
+            len(exact_set & set(indices.tolist())) / len(exact_set)
+            for exact_set, (indices, _) in zip(exact_sets, approx)
+        ])
+        print(f"{f'nprobe={nprobe}':>12} {recall:>10.3f} {ann_ms:>10.3f}")
+
+if __name__ == "__main__":
+    main()
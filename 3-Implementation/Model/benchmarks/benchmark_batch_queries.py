@@ -0,0 +1,104 @@
+"""
+Throughput benchmark for batched article recommendation queries.
+
+Compares the per-query loop over ArticleRecommender.recommend_for_user with
+the batched ArticleRecommender.recommend_for_users path.
+
+Usage:
+    python benchmarks/benchmark_batch_queries.py --num-articles 10000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+# Make the src package importable when run from the Model directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from article_recommender import ArticleRecommender, create_sample_article_dataset
+
+FOOD_ITEMS = [
+    'chicken', 'broccoli', 'rice', 'salmon', 'eggs', 'spinach', 'tofu',
+    'beans', 'oats', 'yogurt', 'banana', 'avocado', 'nuts', 'milk'
+]
+
+CONDITIONS = [
+    'diabetes', 'high blood pressure', 'pre-diabetes', 'anemia',
+    'heart disease', 'high cholesterol'
+]
+
+def generate_profiles(num_profiles: int, seed: int = 42) -> list:
+    """
+    Generate random user profiles for benchmarking.
+    
+    Args:
+        num_profiles: Number of profiles to generate
+        seed: Random seed
+        
+    Returns:
+        List of profile dictionaries accepted by recommend_for_users
+    """
+    rng = np.random.default_rng(seed)
+    profiles = []
+    for _ in range(num_profiles):
+        profiles.append({
+            'user_profile': {
+                'age': int(rng.integers(5, 80)),
+                'gender': str(rng.choice(['male', 'female']))
+            },
+            'food_items': list(rng.choice(FOOD_ITEMS, size=rng.integers(1, 4), replace=False)),
+            'health_status': {
+                'bmi': float(rng.uniform(16, 35)),
+                'conditions': list(rng.choice(CONDITIONS, size=rng.integers(0, 3), replace=False))
+            }
+        })
+    return profiles
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--num-articles', type=int, default=10000)
+    parser.add_argument('--query-counts', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--max-loop-queries', type=int, default=10000,
+                        help='Cap on queries timed with the per-query loop')
+    parser.add_argument('--top-n', type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        articles_path = os.path.join(tmp_dir, 'articles.csv')
+        create_sample_article_dataset(articles_path, num_articles=args.num_articles)
+        
+        recommender = ArticleRecommender()
+        recommender.load_articles(articles_path)
+        recommender.build_article_vectors()
+    
+    print(f"\n{'queries':>10} {'loop q/s':>12} {'batch q/s':>12} {'speedup':>9}")
+    for num_queries in args.query_counts:
+        profiles = generate_profiles(num_queries)
+        
+        # Per-query loop (capped, throughput is extrapolated)
+        loop_profiles = profiles[:args.max_loop_queries]
+        recommender.text_preprocessor.clear_cache()
+        recommender.clear_result_cache()
+        start = time.perf_counter()
+        for profile in loop_profiles:
+            recommender.recommend_for_user(
+                profile['user_profile'],
+                profile['food_items'],
+                profile['health_status'],
+                top_n=args.top_n
+            )
+        loop_qps = len(loop_profiles) / (time.perf_counter() - start)
+        
+        # Batched path
+        recommender.clear_result_cache()
+        start = time.perf_counter()
+        recommender.recommend_for_users(profiles, top_n=args.top_n)
+        batch_qps = num_queries / (time.perf_counter() - start)
+        
+        print(f"{num_queries:>10} {loop_qps:>12.0f} {batch_qps:>12.0f} {batch_qps / loop_qps:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
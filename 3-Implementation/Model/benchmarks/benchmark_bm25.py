@@ -0,0 +1,77 @@
+"""
+Throughput benchmark for BM25 scoring versus TF-IDF cosine similarity.
+
+Builds one recommender per model type over the same generated articles and
+compares build time and query throughput of the single-query and batched
+paths.
+
+Usage:
+    python benchmarks/benchmark_bm25.py --num-articles 10000 --num-queries 2000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+# Make the src package importable when run from the Model directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from article_recommender import ArticleRecommender, create_sample_article_dataset
+
+QUERY_TERMS = [
+    'protein', 'muscle', 'weight loss', 'diabetes', 'vitamins', 'heart health',
+    'children', 'seniors', 'fiber', 'hydration', 'breakfast', 'vegetarian'
+]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--num-articles', type=int, default=10000)
+    parser.add_argument('--num-queries', type=int, default=2000)
+    parser.add_argument('--top-n', type=int, default=5)
+    parser.add_argument('--bm25-delta', type=float, default=0.0,
+                        help='BM25+ delta (0 for plain BM25)')
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(42)
+    queries = [
+        ' '.join(rng.choice(QUERY_TERMS, size=3, replace=False))
+        for _ in range(args.num_queries)
+    ]
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        articles_path = os.path.join(tmp_dir, 'articles.csv')
+        create_sample_article_dataset(articles_path, num_articles=args.num_articles)
+        
+        rows = []
+        for model_type in ('tfidf', 'bm25'):
+            recommender = ArticleRecommender()
+            recommender.model_type = model_type
+            recommender.bm25_config = {'delta': args.bm25_delta}
+            recommender.result_cache = None
+            recommender.load_articles(articles_path)
+            
+            start = time.perf_counter()
+            recommender.build_article_vectors()
+            build_s = time.perf_counter() - start
+            
+            recommender.text_preprocessor.clear_cache()
+            start = time.perf_counter()
+            for query in queries:
+                recommender.find_similar_articles(query, top_n=args.top_n)
+            single_qps = len(queries) / (time.perf_counter() - start)
+            
+            start = time.perf_counter()
+            recommender.find_similar_articles_batch(queries, top_n=args.top_n)
+            batch_qps = len(queries) / (time.perf_counter() - start)
+            
+            rows.append((model_type, build_s, single_qps, batch_qps))
+    
+    print(f"\n{'model':>8} {'build s':>9} {'single q/s':>12} {'batch q/s':>11}")
+    for model_type, build_s, single_qps, batch_qps in rows:
+        print(f"{model_type:>8} {build_s:>9.2f} {single_qps:>12.0f} {batch_qps:>11.0f}")
+
+if __name__ == "__main__":
+    main()
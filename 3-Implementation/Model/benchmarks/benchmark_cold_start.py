@@ -0,0 +1,116 @@
+"""
+Cold-start benchmark for loading and querying a saved recommender.
+
+Saves a model once, then for each tokenizer backend starts a fresh Python
+process that imports the module, constructs the recommender, loads the
+model and answers a first and a warm query. Phases are timed separately
+and the total is checked against a time budget.
+
+Usage:
+    python benchmarks/benchmark_cold_start.py --num-articles 20000 --budget-ms 3000
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import yaml
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Modules whose import dominates startup when loaded eagerly
+HEAVY_MODULES = ('tensorflow', 'matplotlib', 'nltk', 'sklearn')
+
+QUERY = 'high protein breakfast for muscle recovery'
+
+def run_child(model_dir: str, config_path: str) -> None:
+    """
+    Time the cold-start phases in this process and print them as JSON.
+    
+    Args:
+        model_dir: Directory of the saved model
+        config_path: Recommender config file
+    """
+    timings = {}
+    
+    start = time.perf_counter()
+    sys.path.append(SRC_DIR)
+    from article_recommender import ArticleRecommender
+    timings['import_ms'] = (time.perf_counter() - start) * 1000
+    
+    start = time.perf_counter()
+    recommender = ArticleRecommender(config_path)
+    timings['construct_ms'] = (time.perf_counter() - start) * 1000
+    
+    start = time.perf_counter()
+    recommender.load(model_dir)
+    timings['load_ms'] = (time.perf_counter() - start) * 1000
+    
+    start = time.perf_counter()
+    recommender.find_similar_articles(QUERY)
+    timings['first_query_ms'] = (time.perf_counter() - start) * 1000
+    
+    start = time.perf_counter()
+    recommender.find_similar_articles(QUERY + ' fiber')
+    timings['warm_query_ms'] = (time.perf_counter() - start) * 1000
+    
+    timings['backend'] = recommender.text_preprocessor.backend
+    timings['heavy_modules'] = [name for name in HEAVY_MODULES if name in sys.modules]
+    print(json.dumps(timings))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--num-articles', type=int, default=20000)
+    parser.add_argument('--tokenizers', nargs='+', default=['auto', 'regex'])
+    parser.add_argument('--budget-ms', type=float, default=3000.0,
+                        help='Budget for import, construction, load and first query')
+    parser.add_argument('--child', nargs=2, metavar=('MODEL_DIR', 'CONFIG'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        run_child(*args.child)
+        return
+    
+    sys.path.append(SRC_DIR)
+    from article_recommender import ArticleRecommender, create_sample_article_dataset
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        articles_path = os.path.join(tmp_dir, 'articles.csv')
+        create_sample_article_dataset(articles_path, num_articles=args.num_articles)
+        
+        rows = []
+        for tokenizer in args.tokenizers:
+            config_path = os.path.join(tmp_dir, f'config_{tokenizer}.yaml')
+            with open(config_path, 'w') as f:
+                yaml.safe_dump({'article_recommender': {
+                    'preprocessing': {'tokenizer': tokenizer},
+                    'result_cache': {'enabled': False}
+                }}, f)
+            
+            model_dir = os.path.join(tmp_dir, f'model_{tokenizer}')
+            recommender = ArticleRecommender(config_path)
+            recommender.load_articles(articles_path)
+            recommender.build_article_vectors()
+            recommender.save(model_dir)
+            
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', model_dir, config_path],
+                capture_output=True, text=True, check=True
+            ).stdout
+            rows.append((tokenizer, json.loads(output.strip().splitlines()[-1])))
+    
+    print(f"\n{'tokenizer':>9} {'backend':>7} {'import':>8} {'construct':>9} {'load':>7} "
+          f"{'1st query':>9} {'warm':>6} {'total ms':>9} {'budget':>6}  heavy modules")
+    for tokenizer, timings in rows:
+        total = sum(timings[key] for key in ('import_ms', 'construct_ms', 'load_ms', 'first_query_ms'))
+        status = 'ok' if total <= args.budget_ms else 'OVER'
+        print(f"{tokenizer:>9} {timings['backend']:>7} {timings['import_ms']:>8.0f} "
+              f"{timings['construct_ms']:>9.1f} {timings['load_ms']:>7.1f} "
+              f"{timings['first_query_ms']:>9.1f} {timings['warm_query_ms']:>6.2f} "
+              f"{total:>9.0f} {status:>6}  {', '.join(timings['heavy_modules'])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark for MinHash/LSH near-duplicate detection.
+
+Generates articles, appends edited copies of a fraction of them as known
+near-duplicates, and compares LSH clustering with an exhaustive
+comparison of all signature pairs: detection time, and how many of the
+pairs found exhaustively LSH also finds.
+
+Usage:
+    python benchmarks/benchmark_dedup.py --scales 2000 10000 100000 --max-exhaustive 10000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Make the src package importable when run from the Model directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from article_recommender import ArticleRecommender, create_sample_article_dataset
+from utils.dedup import MinHashLSH
+
+def add_near_duplicates(articles: pd.DataFrame, fraction: float, rng: np.random.Generator) -> tuple:
+    """
+    Append edited copies of randomly chosen articles.
+    
+    Args:
+        articles: Articles DataFrame
+        fraction: Fraction of articles to copy
+        rng: Random generator
+    
+    Returns:
+        Tuple of (articles with the copies appended, source row of each copy)
+    """
+    sources = rng.choice(len(articles), int(len(articles) * fraction), replace=False)
+    copies = articles.iloc[sources].copy()
+    copies['title'] = copies['title'].str.replace(r': Part \d', '', regex=True) + ': Part 9'
+    copies['article_id'] = np.arange(len(copies)) + articles['article_id'].max() + 1
+    return pd.concat([articles, copies], ignore_index=True), sources
+
+def exhaustive_pairs(signatures: np.ndarray, threshold: float, block: int = 256) -> set:
+    """
+    Find all pairs whose estimated Jaccard similarity reaches the threshold.
+    
+    Args:
+        signatures: MinHash signatures
+        threshold: Minimum estimated similarity
+        block: Rows compared against all others at a time
+    
+    Returns:
+        Set of (row, row) pairs with the smaller row first
+    """
+    pairs = set()
+    for start in range(0, len(signatures), block):
+        similarity = (signatures[start:start + block, None, :] == signatures[None, :, :]).mean(axis=2)
+        rows, cols = np.nonzero(similarity >= threshold)
+        rows += start
+        pairs.update(zip(rows[rows < cols].tolist(), cols[rows < cols].tolist()))
+    return pairs
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[2000, 10000, 100000])
+    parser.add_argument('--duplicate-fraction', type=float, default=0.1)
+    parser.add_argument('--threshold', type=float, default=0.8)
+    parser.add_argument('--max-exhaustive', type=int, default=10000,
+                        help='Largest corpus compared exhaustively')
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(42)
+    recommender = ArticleRecommender()
+    rows = []
+    for num_articles in args.scales:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            articles_path = os.path.join(tmp_dir, 'articles.csv')
+            create_sample_article_dataset(articles_path, num_articles=num_articles, seed=42)
+            articles, sources = add_near_duplicates(pd.read_csv(articles_path), args.duplicate_fraction, rng)
+        
+        texts = recommender.text_preprocessor.preprocess_series(recommender._combine_text(articles))
+        detector = MinHashLSH(threshold=args.threshold)
+        
+        start = time.perf_counter()
+        signatures = detector.compute_signatures(texts)
+        signature_seconds = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        detector.fit(signatures)
+        lsh_seconds = time.perf_counter() - start
+        
+        # Known copies clustered with their source article
+        copies_caught = np.mean(detector.clusters[num_articles:] == detector.clusters[sources])
+        
+        exhaustive_seconds, pair_recall = float('nan'), float('nan')
+        if len(articles) <= args.max_exhaustive:
+            start = time.perf_counter()
+            pairs = exhaustive_pairs(signatures, args.threshold)
+            exhaustive_seconds = time.perf_counter() - start
+            found = sum(detector.clusters[a] == detector.clusters[b] for a, b in pairs)
+            pair_recall = found / len(pairs) if pairs else 1.0
+        
+        num_clusters = len(np.unique(detector.clusters))
+        rows.append((len(articles), copies_caught, len(articles) - num_clusters, signature_seconds,
+                     lsh_seconds, exhaustive_seconds, pair_recall))
+    
+    print(f"\n{'articles':>9} {'caught':>7} {'flagged':>8} {'minhash s':>10} {'lsh s':>7} "
+          f"{'exhaustive s':>13} {'pair recall':>12}")
+    for row in rows:
+        print(f"{row[0]:>9} {row[1]:>7.1%} {row[2]:>8} {row[3]:>10.2f} {row[4]:>7.2f} "
+              f"{row[5]:>13.2f} {row[6]:>12.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Latency benchmark for batched age and gender inference per image.
+
+Compares the previous per-face path, which preprocessed every face twice and
+called age_model.predict and gender_model.predict with a batch of one per
+face, with FaceDetector.analyze_faces, which preprocesses each face once and
+runs one forward pass per model over the stacked batch, and with the fused
+model from build_age_gender_model, which runs one forward pass in total.
+Face detection is excluded so all paths analyze the same crops.
+
+Usage:
+    python benchmarks/benchmark_face_batching.py --face-counts 1 5 10 20 30
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+# Make the src package importable when run from the Model directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from face_detection import FaceDetector, build_age_model, build_gender_model, build_age_gender_model
+
+def generate_faces(num_faces: int, rng: np.random.Generator) -> list:
+    """
+    Generate random BGR face crops of varying sizes, as returned by detect_faces.
+    
+    Args:
+        num_faces: Number of crops
+        rng: Random generator
+        
+    Returns:
+        List of uint8 face images
+    """
+    return [
+        rng.integers(0, 256, size=(int(size), int(size), 3), dtype=np.uint8)
+        for size in rng.integers(40, 160, size=num_faces)
+    ]
+
+def analyze_per_face(detector: FaceDetector, faces: list) -> list:
+    """
+    Analyze faces one at a time like the previous implementation.
+    
+    Args:
+        detector: Face detector with age and gender models
+        faces: Face images
+        
+    Returns:
+        Dictionary with age and gender predictions per face
+    """
+    results = []
+    for face in faces:
+        age = detector.age_model.predict(detector.preprocess_face(face), verbose=0)[0][0]
+        gender = detector.gender_model.predict(detector.preprocess_face(face), verbose=0)[0][0]
+        results.append({'age': int(round(age)), 'gender': "male" if gender > 0.5 else "female"})
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--face-counts', type=int, nargs='+', default=[1, 5, 10, 20, 30])
+    parser.add_argument('--images', type=int, default=10, help='Images timed per face count')
+    args = parser.parse_args()
+    
+    detector = FaceDetector()
+    detector.age_model = build_age_model()
+    detector.gender_model = build_gender_model()
+    fused_detector = FaceDetector()
+    fused_detector.age_gender_model = build_age_gender_model()
+    rng = np.random.default_rng(42)
+    
+    # Warm up all paths so graph tracing is not timed
+    warmup_faces = generate_faces(2, rng)
+    analyze_per_face(detector, warmup_faces)
+    detector.analyze_faces(warmup_faces)
+    fused_detector.analyze_faces(warmup_faces)
+    
+    print(f"\n{'faces':>6} {'per-face ms':>12} {'batched ms':>11} {'fused ms':>9} {'speedup':>9}")
+    for num_faces in args.face_counts:
+        images = [generate_faces(num_faces, rng) for _ in range(args.images)]
+        
+        start = time.perf_counter()
+        for faces in images:
+            analyze_per_face(detector, faces)
+        per_face_ms = (time.perf_counter() - start) / args.images * 1000
+        
+        start = time.perf_counter()
+        for faces in images:
+            detector.analyze_faces(faces)
+        batched_ms = (time.perf_counter() - start) / args.images * 1000
+        
+        start = time.perf_counter()
+        for faces in images:
+            fused_detector.analyze_faces(faces)
+        fused_ms = (time.perf_counter() - start) / args.images * 1000
+        
+        print(f"{num_faces:>6} {per_face_ms:>12.1f} {batched_ms:>11.1f} {fused_ms:>9.1f} "
+              f"{per_face_ms / fused_ms:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
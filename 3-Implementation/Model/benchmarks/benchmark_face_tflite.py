@@ -0,0 +1,131 @@
+"""
+Latency, memory and parity benchmark for the TFLite face inference backend.
+
+Builds the fused age/gender model, saves it as a Keras model and converts it
+to TFLite without quantization and with dynamic-range and float16
+quantization. Each variant is loaded by FaceDetector in a fresh process,
+which reports per-image latency by face count and peak RSS. Raw outputs on
+the same faces are compared with the Keras model.
+
+Usage:
+    python benchmarks/benchmark_face_tflite.py --face-counts 1 10 30 --num-threads 4
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+import numpy as np
+
+# Make the src package importable when run from the Model directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+# Variants as (name, inference backend, quantization)
+VARIANTS = [
+    ('keras', 'keras', None),
+    ('tflite', 'tflite', 'none'),
+    ('tflite dynamic', 'tflite', 'dynamic'),
+    ('tflite float16', 'tflite', 'float16')
+]
+
+def run_variant(config_path: str, face_counts: list, images: int) -> dict:
+    """
+    Measure one model variant in this process.
+    
+    Args:
+        config_path: FaceDetector configuration file
+        face_counts: Faces per image to time
+        images: Images timed per face count
+        
+    Returns:
+        Dictionary with latency per face count, raw outputs and peak RSS
+    """
+    from face_detection import FaceDetector
+    from benchmark_face_batching import generate_faces
+    
+    detector = FaceDetector(config_path)
+    rng = np.random.default_rng(42)
+    
+    # Raw outputs on fixed faces for the parity check
+    outputs = detector._predict_batch(
+        detector.age_gender_model, detector.preprocess_faces(generate_faces(16, rng))
+    )
+    
+    latency_ms = {}
+    for num_faces in face_counts:
+        batches = [generate_faces(num_faces, rng) for _ in range(images)]
+        start = time.perf_counter()
+        for faces in batches:
+            detector.analyze_faces(faces)
+        latency_ms[num_faces] = (time.perf_counter() - start) / images * 1000
+    
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'latency_ms': latency_ms,
+        'outputs': {name: values.tolist() for name, values in outputs.items()},
+        'peak_rss_mb': peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--face-counts', type=int, nargs='+', default=[1, 10, 30])
+    parser.add_argument('--images', type=int, default=10, help='Images timed per face count')
+    parser.add_argument('--num-threads', type=int, default=None, help='TFLite interpreter threads')
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child is not None:
+        print(json.dumps(run_variant(args.child, args.face_counts, args.images)))
+        return
+    
+    from face_detection import build_age_gender_model
+    from utils.common import convert_to_tflite, save_model
+    
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model = build_age_gender_model()
+        for name, backend, quantization in VARIANTS:
+            if backend == 'keras':
+                model_path = os.path.join(tmp_dir, 'age_gender_model.keras')
+                save_model(model, model_path)
+                config = {'age_gender_model_path': model_path}
+            else:
+                model_path = os.path.join(tmp_dir, f'age_gender_{quantization}.tflite')
+                convert_to_tflite(model, model_path, quantization=quantization)
+                config = {
+                    'inference_backend': 'tflite',
+                    'tflite_age_gender_model_path': model_path,
+                    'tflite_num_threads': args.num_threads
+                }
+            
+            config_path = os.path.join(tmp_dir, 'config.json')
+            with open(config_path, 'w') as f:
+                json.dump(config, f)
+            
+            # One process per variant, so peak RSS only covers that variant
+            print(f"Benchmarking {name}...")
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', config_path,
+                 '--face-counts', *map(str, args.face_counts), '--images', str(args.images)],
+                capture_output=True, text=True, check=True
+            ).stdout
+            results[name] = json.loads(output.strip().splitlines()[-1])
+            results[name]['size_mb'] = os.path.getsize(model_path) / 2 ** 20
+    
+    reference = results['keras']['outputs']
+    latency_header = ' '.join(f"{f'{count} faces ms':>12}" for count in args.face_counts)
+    print(f"\n{'variant':<15} {'size MB':>8} {'peak MB':>8} {latency_header} {'max age diff':>13} {'max gender diff':>16}")
+    for name, result in results.items():
+        latencies = ' '.join(f"{result['latency_ms'][str(count)]:>12.1f}" for count in args.face_counts)
+        age_diff = np.abs(np.subtract(result['outputs']['age'], reference['age'])).max()
+        gender_diff = np.abs(np.subtract(result['outputs']['gender'], reference['gender'])).max()
+        print(f"{name:<15} {result['size_mb']:>8.1f} {result['peak_rss_mb']:>8.0f} {latencies} "
+              f"{age_diff:>13.4f} {gender_diff:>16.4f}")
+
+if __name__ == "__main__":
+    main()
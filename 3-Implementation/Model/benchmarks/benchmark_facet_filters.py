@@ -0,0 +1,88 @@
+"""
+Latency benchmark for faceted pre-filtering.
+
+Compares unfiltered queries, filters applied before scoring through the
+facet index, and the previous approach of ranking the whole corpus and
+filtering the results afterwards.
+
+Usage:
+    python benchmarks/benchmark_facet_filters.py --num-articles 100000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+# Make the src package importable when run from the Model directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from article_recommender import ArticleRecommender, create_sample_article_dataset
+
+QUERY_TERMS = [
+    'protein', 'muscle', 'weight loss', 'diabetes', 'vitamins', 'heart health',
+    'children', 'seniors', 'fiber', 'hydration', 'breakfast', 'vegetarian'
+]
+
+FILTERS = {
+    'none': None,
+    'category': {'category': 'Sports Nutrition'},
+    'category+tag': {'category': 'Sports Nutrition', 'tags': 'protein'},
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--num-articles', type=int, default=100000)
+    parser.add_argument('--num-queries', type=int, default=200)
+    parser.add_argument('--top-n', type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        articles_path = os.path.join(tmp_dir, 'articles.csv')
+        create_sample_article_dataset(articles_path, num_articles=args.num_articles)
+        
+        recommender = ArticleRecommender()
+        recommender.result_cache = None
+        recommender.load_articles(articles_path)
+        recommender.build_article_vectors()
+    
+    # Date filter relative to the newest article
+    newest = np.datetime64(recommender.articles_df['date'].max(), 'D')
+    filter_sets = dict(FILTERS)
+    filter_sets['last 90 days'] = {'date_from': str(newest - np.timedelta64(90, 'D'))}
+    
+    rng = np.random.default_rng(42)
+    queries = [
+        ' '.join(rng.choice(QUERY_TERMS, size=3, replace=False))
+        for _ in range(args.num_queries)
+    ]
+    
+    print(f"\n{'filter':>14} {'candidates':>11} {'pre-filter ms':>14} {'post-filter ms':>15}")
+    for name, filters in filter_sets.items():
+        num_candidates = args.num_articles
+        if filters is not None:
+            num_candidates = len(recommender._facet_rows(filters))
+        
+        start = time.perf_counter()
+        for query in queries:
+            recommender.find_similar_articles(query, top_n=args.top_n, output='tuples', filters=filters)
+        pre_ms = (time.perf_counter() - start) / len(queries) * 1000
+        
+        # Previous approach: rank everything, then filter the ranked rows
+        post_ms = float('nan')
+        if filters is not None:
+            allowed = set(recommender.articles_df['article_id'].to_numpy()[recommender._facet_rows(filters)])
+            start = time.perf_counter()
+            for query in queries:
+                ranked = recommender.find_similar_articles(
+                    query, top_n=args.num_articles, output='tuples'
+                )
+                [row for row in ranked if row[0] in allowed][:args.top_n]
+            post_ms = (time.perf_counter() - start) / len(queries) * 1000
+        
+        print(f"{name:>14} {num_candidates:>11} {pre_ms:>14.2f} {post_ms:>15.2f}")
+
+if __name__ == "__main__":
+    main()
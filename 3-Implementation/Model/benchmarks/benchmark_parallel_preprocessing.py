@@ -0,0 +1,59 @@
+"""
+Scaling benchmark for parallel article text preprocessing.
+
+Times TextPreprocessor.preprocess_series on a generated article corpus with
+an increasing number of worker processes.
+
+Usage:
+    python benchmarks/benchmark_parallel_preprocessing.py --num-articles 100000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import pandas as pd
+
+# Make the src package importable when run from the Model directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from article_recommender import ArticleRecommender, create_sample_article_dataset
+from utils.text_processing import TextPreprocessor
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--num-articles', type=int, default=100000)
+    parser.add_argument('--workers', type=int, nargs='+', default=None,
+                        help='Worker counts to time (default: powers of two up to the CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    args = parser.parse_args()
+    
+    workers = args.workers
+    if workers is None:
+        cpu_count = os.cpu_count() or 1
+        workers = [2 ** i for i in range(cpu_count.bit_length()) if 2 ** i <= cpu_count]
+        if workers[-1] != cpu_count:
+            workers.append(cpu_count)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        articles_path = os.path.join(tmp_dir, 'articles.csv')
+        create_sample_article_dataset(articles_path, num_articles=args.num_articles)
+        articles_df = pd.read_csv(articles_path)
+    
+    texts = ArticleRecommender._combine_text(articles_df)
+    preprocessor = TextPreprocessor(chunk_size=args.chunk_size)
+    
+    print(f"\n{'workers':>8} {'seconds':>10} {'texts/s':>12} {'speedup':>9}")
+    baseline = None
+    for n_workers in workers:
+        start = time.perf_counter()
+        preprocessor.preprocess_series(texts, n_workers=n_workers)
+        elapsed = time.perf_counter() - start
+        
+        if baseline is None:
+            baseline = elapsed
+        print(f"{n_workers:>8} {elapsed:>10.2f} {len(texts) / elapsed:>12.0f} {baseline / elapsed:>8.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Accuracy, latency and size report for quantized TFLite age/gender models.
+
+Converts the fused age/gender model to float32, float16, dynamic-range and
+full-integer int8 TFLite models, calibrating int8 on a representative
+dataset, and runs every variant on the same held-out faces on CPU. With
+UTKFace metadata from process_utk_face_dataset, accuracy is measured against
+the labels; without it, random faces are used and only agreement with the
+float32 model is meaningful.
+
+Usage:
+    python benchmarks/benchmark_quantization.py --metadata ../data/processed/utkface_metadata.csv --model age_gender_model.keras
+    python benchmarks/benchmark_quantization.py --eval-samples 200 --output quantization.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+# Make the src package importable when run from the Model directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from face_detection import FaceDetector, build_age_gender_model
+from utils.common import convert_to_tflite, load_model
+from utils.data_processing import (
+    create_age_gender_dataset,
+    create_representative_dataset,
+    create_tf_dataset_from_dataframe
+)
+from utils.tflite_inference import TFLiteModel
+from benchmark_face_batching import generate_faces
+
+# Report names of the TFLite quantization modes
+VARIANTS = {'none': 'float32', 'float16': 'float16', 'dynamic': 'dynamic', 'int8': 'int8'}
+
+def load_utk_face_data(metadata_path: str, input_shape: tuple, calibration_samples: int, eval_samples: int, seed: int):
+    """
+    Split UTKFace metadata into calibration and evaluation images.
+    
+    Args:
+        metadata_path: Metadata CSV from process_utk_face_dataset
+        input_shape: Model input shape
+        calibration_samples: Number of calibration images
+        eval_samples: Number of evaluation images
+        seed: Random seed for the split
+        
+    Returns:
+        Tuple of (representative dataset, evaluation images, age labels, gender labels)
+    """
+    metadata = pd.read_csv(metadata_path)
+    metadata = metadata[metadata['gender'].isin(['male', 'female'])].sample(frac=1, random_state=seed)
+    calibration_df = metadata.iloc[:calibration_samples]
+    eval_df = metadata.iloc[calibration_samples:calibration_samples + eval_samples]
+    height, width = input_shape[:2]
+    
+    # Calibration images go through the generic dataframe pipeline, preprocessed like FaceDetector
+    calibration_dataset = create_tf_dataset_from_dataframe(
+        calibration_df, 'path', 'age',
+        preprocess_fn=lambda image: tf.image.resize(image, (height, width)) / 255.0,
+        shuffle=False
+    )
+    representative_dataset = create_representative_dataset(calibration_dataset, calibration_samples)
+    
+    images, ages, genders = [], [], []
+    for batch_images, labels in create_age_gender_dataset(eval_df, (width, height), shuffle=False):
+        images.append(batch_images.numpy())
+        ages.append(labels['age'].numpy())
+        genders.append(labels['gender'].numpy())
+    return representative_dataset, np.concatenate(images), np.concatenate(ages), np.concatenate(genders)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--metadata', default=None, help='UTKFace metadata CSV (random faces if omitted)')
+    parser.add_argument('--model', default=None, help='Saved age/gender Keras model (untrained if omitted)')
+    parser.add_argument('--calibration-samples', type=int, default=100)
+    parser.add_argument('--eval-samples', type=int, default=200)
+    parser.add_argument('--num-threads', type=int, default=None, help='TFLite interpreter threads')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=None, help='Optional JSON report path')
+    args = parser.parse_args()
+    
+    model = load_model(args.model) if args.model else build_age_gender_model()
+    input_shape = tuple(model.input_shape[1:])
+    
+    if args.metadata:
+        representative_dataset, images, ages, genders = load_utk_face_data(
+            args.metadata, input_shape, args.calibration_samples, args.eval_samples, args.seed
+        )
+    else:
+        detector = FaceDetector()
+        rng = np.random.default_rng(args.seed)
+        target_size = (input_shape[1], input_shape[0])
+        calibration_images = detector.preprocess_faces(generate_faces(args.calibration_samples, rng), target_size)
+        representative_dataset = create_representative_dataset(
+            tf.data.Dataset.from_tensor_slices(calibration_images).batch(32), args.calibration_samples
+        )
+        images = detector.preprocess_faces(generate_faces(args.eval_samples, rng), target_size)
+        ages = genders = None
+    
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for quantization, name in VARIANTS.items():
+            print(f"Converting {name}...")
+            model_path = os.path.join(tmp_dir, f'age_gender_{quantization}.tflite')
+            convert_to_tflite(model, model_path, quantization=quantization, representative_dataset=representative_dataset)
+            
+            tflite_model = TFLiteModel(model_path, num_threads=args.num_threads)
+            tflite_model(images[:1])
+            start = time.perf_counter()
+            outputs = tflite_model(images)
+            results[name] = {
+                'size_mb': os.path.getsize(model_path) / 2 ** 20,
+                'ms_per_face': (time.perf_counter() - start) / len(images) * 1000,
+                'age': outputs['age'][:, 0],
+                'gender': outputs['gender'][:, 0]
+            }
+    
+    reference = results['float32']
+    report = {}
+    for name, result in results.items():
+        report[name] = {
+            'size_mb': result['size_mb'],
+            'ms_per_face': result['ms_per_face'],
+            'age_mae': float(np.abs(result['age'] - ages).mean()) if ages is not None else None,
+            'gender_accuracy': float(((result['gender'] > 0.5) == genders).mean()) if genders is not None else None,
+            'age_mae_vs_float32': float(np.abs(result['age'] - reference['age']).mean()),
+            'gender_agreement_vs_float32': float(((result['gender'] > 0.5) == (reference['gender'] > 0.5)).mean())
+        }
+    
+    print(f"\n{'variant':<9} {'size MB':>8} {'ms/face':>8} {'age MAE':>8} {'gender acc':>11} "
+          f"{'age diff vs fp32':>17} {'gender agree':>13}")
+    for name, r in report.items():
+        age_mae = f"{r['age_mae']:.2f}" if r['age_mae'] is not None else '-'
+        accuracy = f"{r['gender_accuracy']:.1%}" if r['gender_accuracy'] is not None else '-'
+        print(f"{name:<9} {r['size_mb']:>8.1f} {r['ms_per_face']:>8.2f} {age_mae:>8} {accuracy:>11} "
+              f"{r['age_mae_vs_float32']:>17.4f} {r['gender_agreement_vs_float32']:>13.1%}")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'eval_samples': len(images), 'variants': report}, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Per-request allocation benchmark for recommendation result formats.
+
+Ranks a set of queries once, then measures the time and peak traced memory
+of rendering each ranking in every ArticleRecommender result format. The
+previous DataFrame path (iloc copy, similarity column, column slice) is
+included for comparison.
+
+Usage:
+    python benchmarks/benchmark_result_formats.py --num-articles 10000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+import numpy as np
+
+# Make the src package importable when run from the Model directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from article_recommender import (
+    ArticleRecommender,
+    create_sample_article_dataset,
+    RESULT_COLUMNS,
+    RESULT_FORMATS
+)
+
+QUERY_TERMS = [
+    'protein', 'muscle', 'weight loss', 'diabetes', 'vitamins', 'heart health',
+    'children', 'seniors', 'fiber', 'hydration', 'breakfast', 'vegetarian'
+]
+
+def render_legacy_frame(recommender: ArticleRecommender, indices: np.ndarray, scores: np.ndarray):
+    """
+    Render results the way find_similar_articles did before the result formats.
+    
+    Args:
+        recommender: Recommender with loaded articles
+        indices: Row indices of the selected articles
+        scores: Similarity scores aligned with indices
+        
+    Returns:
+        DataFrame with article id, title, category, tags and similarity
+    """
+    results = recommender.articles_df.iloc[indices].copy()
+    results['similarity'] = scores
+    return results[list(RESULT_COLUMNS) + ['similarity']]
+
+def measure(render, rankings: list) -> tuple:
+    """
+    Measure the mean time and peak traced memory of rendering each ranking.
+    
+    Args:
+        render: Function taking (indices, scores)
+        rankings: List of (indices, scores) tuples
+        
+    Returns:
+        Tuple of (microseconds per request, peak bytes per request)
+    """
+    # Warm up lazily built state such as the result column arrays
+    render(*rankings[0])
+    
+    start = time.perf_counter()
+    for indices, scores in rankings:
+        render(indices, scores)
+    elapsed_us = (time.perf_counter() - start) / len(rankings) * 1e6
+    
+    peaks = []
+    tracemalloc.start()
+    for indices, scores in rankings:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        render(indices, scores)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - baseline)
+    tracemalloc.stop()
+    
+    return elapsed_us, float(np.mean(peaks))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--num-articles', type=int, default=10000)
+    parser.add_argument('--num-queries', type=int, default=1000)
+    parser.add_argument('--top-n', type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        articles_path = os.path.join(tmp_dir, 'articles.csv')
+        create_sample_article_dataset(articles_path, num_articles=args.num_articles)
+        
+        recommender = ArticleRecommender()
+        recommender.load_articles(articles_path)
+        recommender.build_article_vectors()
+    
+    rng = np.random.default_rng(42)
+    queries = [
+        ' '.join(rng.choice(QUERY_TERMS, size=3, replace=False))
+        for _ in range(args.num_queries)
+    ]
+    rankings = recommender._rank_queries_batch(
+        queries, args.top_n, recommender.query_batch_size, None
+    )
+    
+    renderers = {'legacy frame': lambda indices, scores: render_legacy_frame(recommender, indices, scores)}
+    for output in RESULT_FORMATS:
+        renderers[output] = lambda indices, scores, output=output: recommender._build_results(
+            indices, scores, output
+        )
+    
+    print(f"\n{'format':>14} {'us/request':>12} {'peak KiB/request':>18}")
+    for name, render in renderers.items():
+        elapsed_us, peak_bytes = measure(render, rankings)
+        print(f"{name:>14} {elapsed_us:>12.1f} {peak_bytes / 1024:>18.2f}")
+
+if __name__ == "__main__":
+    main()
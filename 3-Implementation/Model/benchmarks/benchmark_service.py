@@ -0,0 +1,107 @@
+"""
+Throughput benchmark for the micro-batching recommendation service.
+
+Compares answering concurrent user requests one at a time with
+recommend_for_user against submitting them concurrently to
+RecommendationService, which batches requests arriving within a short
+window into one similarity computation. The result cache is disabled so
+every request is scored.
+
+Usage:
+    python benchmarks/benchmark_service.py --num-articles 50000 --concurrency 256
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import numpy as np
+
+# Make the src package importable when run from the Model directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from article_recommender import ArticleRecommender, create_sample_article_dataset
+from recommender_service import RecommendationService
+
+FOODS = ['chicken', 'rice', 'broccoli', 'salmon', 'oats', 'eggs', 'tofu', 'spinach']
+CONDITIONS = ['diabetes', 'hypertension', 'high cholesterol', 'obesity']
+
+def make_profiles(num_profiles: int, rng: np.random.Generator):
+    """Create random user profiles with mostly distinct canonical queries."""
+    return [
+        {
+            'user_profile': {
+                'age': int(rng.integers(18, 80)),
+                'gender': str(rng.choice(['male', 'female'])),
+                'activity_level': str(rng.choice(['low', 'moderate', 'high']))
+            },
+            'food_items': list(rng.choice(FOODS, size=3, replace=False)),
+            'health_status': {
+                'bmi': float(rng.uniform(17, 35)),
+                'conditions': list(rng.choice(CONDITIONS, size=int(rng.integers(0, 3)), replace=False))
+            }
+        }
+        for _ in range(num_profiles)
+    ]
+
+async def run_service(service: RecommendationService, profiles, concurrency: int, top_n: int) -> float:
+    """Submit the profiles in waves of concurrent requests and return the elapsed seconds."""
+    await service.start()
+    start = time.perf_counter()
+    for wave in range(0, len(profiles), concurrency):
+        await asyncio.gather(*[
+            service.recommend(profile, top_n) for profile in profiles[wave:wave + concurrency]
+        ])
+    elapsed = time.perf_counter() - start
+    await service.stop()
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--num-articles', type=int, default=50000)
+    parser.add_argument('--num-requests', type=int, default=2048)
+    parser.add_argument('--concurrency', type=int, default=256)
+    parser.add_argument('--top-n', type=int, default=5)
+    parser.add_argument('--windows-ms', type=float, nargs='+', default=[1.0, 5.0])
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        articles_path = os.path.join(tmp_dir, 'articles.csv')
+        create_sample_article_dataset(articles_path, num_articles=args.num_articles)
+        
+        recommender = ArticleRecommender()
+        recommender.result_cache = None
+        recommender.load_articles(articles_path)
+        recommender.build_article_vectors()
+    
+    profiles = make_profiles(args.num_requests, np.random.default_rng(42))
+    
+    rows = []
+    start = time.perf_counter()
+    for profile in profiles:
+        recommender.recommend_for_user(
+            profile['user_profile'], profile['food_items'], profile['health_status'], top_n=args.top_n
+        )
+    elapsed = time.perf_counter() - start
+    rows.append(('sequential', args.num_requests / elapsed, float('nan'), float('nan'), float('nan')))
+    
+    for window_ms in args.windows_ms:
+        service = RecommendationService(
+            recommender, batch_window_ms=window_ms, max_batch_size=args.max_batch_size
+        )
+        elapsed = asyncio.run(run_service(service, profiles, args.concurrency, args.top_n))
+        metrics = service.metrics.snapshot(0)
+        rows.append((
+            f'service {window_ms:g} ms', args.num_requests / elapsed,
+            metrics['avg_batch_size'], metrics['latency_p50_ms'], metrics['latency_p99_ms']
+        ))
+    
+    print(f"\n{'mode':>16} {'req/s':>9} {'avg batch':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, throughput, batch_size, p50, p99 in rows:
+        print(f"{name:>16} {throughput:>9.0f} {batch_size:>10.1f} {p50:>8.2f} {p99:>8.2f}")
+
+if __name__ == "__main__":
+    main()
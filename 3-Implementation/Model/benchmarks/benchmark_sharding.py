@@ -0,0 +1,90 @@
+"""
+Latency benchmark for sharded scatter-gather search.
+
+Builds the recommender once per shard count and worker count and measures
+single and batch query latency. Shards store pre-transposed vectors and are
+scored by a thread pool whose top-N lists are merged, so results are
+identical to the unsharded index. Running each shard count with one worker
+(shards scored one after another) and with one worker per shard separates
+the gain of the sharded layout from that of the thread fan-out.
+
+Usage:
+    python benchmarks/benchmark_sharding.py --num-articles 200000 --shards 1 2 4 8 --workers 1 0
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+# Make the src package importable when run from the Model directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from article_recommender import ArticleRecommender, create_sample_article_dataset
+
+QUERY_TERMS = [
+    'protein', 'muscle', 'weight loss', 'diabetes', 'vitamins', 'heart health',
+    'children', 'seniors', 'fiber', 'hydration', 'breakfast', 'vegetarian'
+]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--num-articles', type=int, default=100000)
+    parser.add_argument('--num-queries', type=int, default=200)
+    parser.add_argument('--top-n', type=int, default=5)
+    parser.add_argument('--model-type', default='tfidf')
+    parser.add_argument('--strategy', default='hash')
+    parser.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 0],
+                        help='Shard scoring threads to compare (0 uses one per shard)')
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(42)
+    queries = [
+        ' '.join(rng.choice(QUERY_TERMS, size=3, replace=False))
+        for _ in range(args.num_queries)
+    ]
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        articles_path = os.path.join(tmp_dir, 'articles.csv')
+        create_sample_article_dataset(articles_path, num_articles=args.num_articles)
+        
+        rows = []
+        reference = None
+        configs = [(1, 1)] if 1 in args.shards else []
+        configs += [(num_shards, n_workers) for num_shards in args.shards if num_shards > 1 for n_workers in args.workers]
+        for num_shards, n_workers in configs:
+            recommender = ArticleRecommender()
+            recommender.model_type = args.model_type
+            recommender.result_cache = None
+            recommender.sharding_config = {
+                'num_shards': num_shards, 'strategy': args.strategy, 'n_workers': n_workers
+            }
+            recommender.load_articles(articles_path)
+            recommender.build_article_vectors()
+            
+            start = time.perf_counter()
+            for query in queries:
+                recommender.find_similar_articles(query, top_n=args.top_n, output='tuples')
+            single_ms = (time.perf_counter() - start) / len(queries) * 1000
+            
+            start = time.perf_counter()
+            results = recommender.find_similar_articles_batch(queries, top_n=args.top_n, output='tuples')
+            batch_ms = (time.perf_counter() - start) / len(queries) * 1000
+            
+            ids = [[row[0] for row in result] for result in results]
+            if reference is None:
+                reference = ids
+            workers = n_workers or num_shards
+            rows.append((num_shards, workers, single_ms, batch_ms, ids == reference))
+            
+            recommender.close()
+    
+    print(f"\n{'shards':>6} {'workers':>8} {'single ms':>10} {'batch ms/query':>15} {'same results':>13}")
+    for num_shards, workers, single_ms, batch_ms, same in rows:
+        print(f"{num_shards:>6} {workers:>8} {single_ms:>10.2f} {batch_ms:>15.3f} {str(same):>13}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Benchmark suite for the article recommender hot paths.
+
+For each corpus size, a fresh process generates articles with
+create_sample_article_dataset and measures preprocess_text,
+build_article_vectors, find_similar_articles (single and batch) and
+recommend_for_user: build time, peak RSS, latency percentiles and QPS.
+Every timed path is first called untimed on separate warmup inputs.
+Results are written as JSON so runs of different versions can be compared
+with --compare.
+
+To record a baseline, run this script against an older checkout of src
+(e.g. with PYTHONPATH pointing at it). Features missing from older
+versions are detected at run time: the seeded dataset, the preprocessing
+cache and the result cache are skipped, and find_similar_articles_batch
+is not measured if it does not exist, so it is left out of the
+comparison. Older versions generate the corpus with the unseeded
+legacy generator, so baseline and current corpora are statistically
+similar rather than identical.
+
+Usage:
+    python benchmarks/run_benchmarks.py --scales 1000 10000 100000 1000000 --output results.json
+    python benchmarks/run_benchmarks.py --scales 1000 10000 --compare results.json
+"""
+
+import os
+import sys
+import json
+import time
+import inspect
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+from datetime import datetime
+import numpy as np
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Make the src package importable when run from the Model directory
+sys.path.append(os.path.join(BENCHMARK_DIR, '..', 'src'))
+
+QUERY_TERMS = [
+    'protein', 'muscle', 'weight loss', 'diabetes', 'vitamins', 'heart health',
+    'children', 'seniors', 'fiber', 'hydration', 'breakfast', 'vegetarian'
+]
+
+# Metrics compared between runs, with True where higher is better
+COMPARED_METRICS = {
+    'build_seconds': False,
+    'peak_rss_mb': False,
+    'preprocess_text.p50_ms': False,
+    'find_similar_articles.p50_ms': False,
+    'find_similar_articles.p99_ms': False,
+    'find_similar_articles.qps': True,
+    'find_similar_articles_batch.qps': True,
+    'recommend_for_user.p50_ms': False,
+    'recommend_for_user.qps': True
+}
+
+def peak_rss_mb() -> float:
+    """
+    Get the peak resident set size of this process.
+
+    Returns:
+        Peak RSS in MiB
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+def summarize(latencies: list) -> dict:
+    """
+    Summarize per-call latencies.
+
+    Args:
+        latencies: Seconds per call
+
+    Returns:
+        Dictionary with mean, p50, p90, p99 and max in milliseconds and calls per second
+    """
+    latencies_ms = np.asarray(latencies) * 1000
+    p50, p90, p99 = np.percentile(latencies_ms, [50, 90, 99])
+    return {
+        'calls': len(latencies_ms),
+        'mean_ms': float(latencies_ms.mean()),
+        'p50_ms': float(p50),
+        'p90_ms': float(p90),
+        'p99_ms': float(p99),
+        'max_ms': float(latencies_ms.max()),
+        'qps': float(len(latencies_ms) / (latencies_ms.sum() / 1000))
+    }
+
+def time_calls(function, inputs: list, warmup_inputs: list = ()) -> list:
+    """
+    Time a function call per input after untimed warmup calls.
+
+    Args:
+        function: Function taking one input
+        inputs: Inputs to call the function with
+        warmup_inputs: Inputs called untimed first, distinct from inputs so
+            no timed call hits a cache the warmup filled
+
+    Returns:
+        Seconds per call
+    """
+    for value in warmup_inputs:
+        function(value)
+
+    latencies = []
+    for value in inputs:
+        start = time.perf_counter()
+        function(value)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def generate_queries(num_queries: int, seed: int, suffix: str = '') -> list:
+    """
+    Generate distinct query texts, so timed calls never hit the preprocessing cache.
+
+    Args:
+        num_queries: Number of queries
+        seed: Random seed
+        suffix: Text appended before the query number, to keep query sets apart
+
+    Returns:
+        List of query texts
+    """
+    rng = np.random.default_rng(seed)
+    return [
+        ' '.join(rng.choice(QUERY_TERMS, size=3, replace=False)) + f' {suffix}{i}'
+        for i in range(num_queries)
+    ]
+
+def run_scale(num_articles: int, num_queries: int, num_warmup: int, model_type: str) -> dict:
+    """
+    Benchmark all hot paths at one corpus size in this process.
+
+    Args:
+        num_articles: Number of generated articles
+        num_queries: Number of timed calls per query path
+        num_warmup: Number of untimed warmup calls per query path
+        model_type: Recommender model type
+
+    Returns:
+        Dictionary of measurements
+    """
+    from article_recommender import ArticleRecommender, create_sample_article_dataset
+    from benchmark_batch_queries import generate_profiles
+
+    result = {'num_articles': num_articles, 'model_type': model_type}
+    queries = generate_queries(num_queries, seed=42)
+    warmup_queries = generate_queries(num_warmup, seed=43, suffix='w')
+    profiles = generate_profiles(num_queries)
+    warmup_profiles = generate_profiles(num_warmup, seed=43)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        articles_path = os.path.join(tmp_dir, 'articles.csv')
+        start = time.perf_counter()
+        if 'seed' in inspect.signature(create_sample_article_dataset).parameters:
+            create_sample_article_dataset(articles_path, num_articles=num_articles, seed=42)
+        else:
+            np.random.seed(42)
+            create_sample_article_dataset(articles_path, num_articles=num_articles)
+        result['dataset_seconds'] = time.perf_counter() - start
+
+        recommender = ArticleRecommender()
+        recommender.model_type = model_type
+        # Older versions have no result cache; setting the attribute is harmless
+        recommender.result_cache = None
+
+        start = time.perf_counter()
+        recommender.load_articles(articles_path)
+        result['load_seconds'] = time.perf_counter() - start
+
+    result['preprocess_text'] = summarize(time_calls(recommender.preprocess_text, queries, warmup_queries))
+    text_preprocessor = getattr(recommender, 'text_preprocessor', None)
+    if text_preprocessor is not None:
+        text_preprocessor.clear_cache()
+
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    recommender.build_article_vectors()
+    result['build_seconds'] = time.perf_counter() - start
+    result['build_rss_growth_mb'] = peak_rss_mb() - rss_before
+
+    result['find_similar_articles'] = summarize(time_calls(
+        lambda query: recommender.find_similar_articles(query, top_n=5), queries, warmup_queries
+    ))
+
+    if hasattr(recommender, 'find_similar_articles_batch'):
+        recommender.find_similar_articles_batch(warmup_queries, top_n=5)
+        start = time.perf_counter()
+        recommender.find_similar_articles_batch(queries, top_n=5)
+        elapsed = time.perf_counter() - start
+        result['find_similar_articles_batch'] = {'calls': len(queries), 'qps': len(queries) / elapsed}
+
+    result['recommend_for_user'] = summarize(time_calls(
+        lambda profile: recommender.recommend_for_user(
+            profile['user_profile'], profile['food_items'], profile['health_status'], top_n=5
+        ),
+        profiles,
+        warmup_profiles
+    ))
+
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+def get_metric(result: dict, name: str):
+    """
+    Get a possibly nested metric by its dotted name.
+
+    Args:
+        result: Measurements of one scale
+        name: Dotted metric name
+
+    Returns:
+        Metric value, or None if missing
+    """
+    for key in name.split('.'):
+        if not isinstance(result, dict) or key not in result:
+            return None
+        result = result[key]
+    return result
+
+def print_comparison(results: list, baseline: dict, threshold: float) -> None:
+    """
+    Print the relative change of each compared metric against a baseline run.
+
+    Args:
+        results: Measurements per scale of this run
+        baseline: JSON report of the baseline run
+        threshold: Percent change in the bad direction flagged as a regression
+    """
+    baseline_scales = {r['num_articles']: r for r in baseline['results']}
+    print(f"\nComparison with {baseline['metadata'].get('git_commit')} ({baseline['metadata'].get('timestamp')})")
+    print(f"{'articles':>9} {'metric':<34} {'baseline':>11} {'current':>11} {'change':>8}")
+    for result in results:
+        previous = baseline_scales.get(result['num_articles'])
+        if previous is None:
+            continue
+        for name, higher_is_better in COMPARED_METRICS.items():
+            old, new = get_metric(previous, name), get_metric(result, name)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            regression = change < -threshold if higher_is_better else change > threshold
+            print(f"{result['num_articles']:>9} {name:<34} {old:>11.3f} {new:>11.3f} "
+                  f"{change:>+7.1f}%{' !' if regression else ''}")
+
+def git_commit() -> str:
+    """
+    Get the current git commit of the repository, if available.
+
+    Returns:
+        Short commit hash, or None outside a git checkout
+    """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=BENCHMARK_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--num-queries', type=int, default=500)
+    parser.add_argument('--num-warmup', type=int, default=20, help='Untimed warmup calls per query path')
+    parser.add_argument('--model-type', default='tfidf')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON report path')
+    parser.add_argument('--compare', default=None, help='Baseline JSON report to compare against')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Percent change flagged as a regression in the comparison')
+    parser.add_argument('--child', type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(run_scale(args.child, args.num_queries, args.num_warmup, args.model_type)))
+        return
+
+    # One process per scale, so peak RSS is not inherited from smaller scales
+    results = []
+    for num_articles in args.scales:
+        print(f"Benchmarking {num_articles} articles...")
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', str(num_articles),
+             '--num-queries', str(args.num_queries), '--num-warmup', str(args.num_warmup),
+             '--model-type', args.model_type],
+            capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    import sklearn
+    import pandas as pd
+    report = {
+        'metadata': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'sklearn': sklearn.__version__,
+            'num_queries': args.num_queries,
+            'num_warmup': args.num_warmup,
+            'model_type': args.model_type
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'articles':>9} {'build s':>8} {'peak MB':>8} {'prep p50':>9} {'find p50':>9} "
+          f"{'find p99':>9} {'find q/s':>9} {'batch q/s':>10} {'user p50':>9} {'user q/s':>9}")
+    for r in results:
+        batch_qps = get_metric(r, 'find_similar_articles_batch.qps')
+        print(f"{r['num_articles']:>9} {r['build_seconds']:>8.2f} {r['peak_rss_mb']:>8.0f} "
+              f"{r['preprocess_text']['p50_ms']:>9.3f} {r['find_similar_articles']['p50_ms']:>9.2f} "
+              f"{r['find_similar_articles']['p99_ms']:>9.2f} {r['find_similar_articles']['qps']:>9.0f} "
+              f"{'-' if batch_qps is None else f'{batch_qps:.0f}':>10} {r['recommend_for_user']['p50_ms']:>9.2f} "
+              f"{r['recommend_for_user']['qps']:>9.0f}")
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(results, json.load(f), args.threshold)
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,19 @@ based on user profiles, food items, and health status.
 """
 
 import os
+import copy
+import json
+import uuid
+import shutil
+import threading
 import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
-from typing import Dict, List, Tuple, Union, Optional, Any
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.decomposition import TruncatedSVD
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Tuple, Union, Optional, Any
 
 # Import common utilities
 from utils.common import (
@@ -20,188 +27,1602 @@ from utils.common import (
     save_model,
     load_model
 )
+from utils.text_processing import TextPreprocessor
+from utils.ranking import select_top_n, select_top_n_rows
+from utils.inverted_index import InvertedIndex
+from utils.vectorization import HashingTfidfVectorizer
+from utils.ann_index import IVFIndex, exact_search
+from utils.caching import ResultCache
+from utils.bm25 import BM25Weighter
+from utils.facets import FacetIndex, canonical_filters
+from utils.sharding import SHARDING_STRATEGIES, ShardedIndex, assign_shards
+from utils.dedup import MinHashLSH
+from utils.text_columns import Utf8Column, encode_utf8
+
+# Supported article_recommender.model_type values
+MODEL_TYPES = ('tfidf', 'lsa', 'bm25')
+
+# Version of the on-disk model format written by ArticleRecommender.save
+MODEL_FORMAT_VERSION = 2
+
+# Vectorizer parameters stored in the model manifest
+VECTORIZER_PARAMS = (
+    'lowercase', 'max_features', 'norm', 'use_idf', 'smooth_idf', 'sublinear_tf',
+    'ngram_range', 'token_pattern', 'analyzer', 'strip_accents', 'binary'
+)
+
+# Article text fields, in the order they are combined for vectorization
+TEXT_FIELDS = ('title', 'content', 'tags', 'category')
+
+# Columns derived from article text during vectorization, not saved with the model
+DERIVED_TEXT_COLUMNS = ('combined_text', 'processed_text')
+
+# Article columns kept for result rendering when streaming articles from CSV
+STREAMING_METADATA_COLUMNS = ('article_id', 'title', 'category', 'tags', 'date')
+
+# Article columns returned with each recommendation, followed by the similarity
+RESULT_COLUMNS = ('article_id', 'title', 'category', 'tags')
+
+# Text columns read per result row or by filters, saved as fixed-width unicode
+# arrays; other text columns (e.g. content) are saved as variable-length UTF-8
+FIXED_WIDTH_COLUMNS = RESULT_COLUMNS + ('date',)
+
+# Supported result formats: list of dicts, list of tuples, NumPy structured array, DataFrame
+RESULT_FORMATS = ('records', 'tuples', 'structured', 'frame')
+
+# Recommendation results in any of the RESULT_FORMATS
+ArticleResults = Union[List[Dict[str, Any]], List[Tuple], np.ndarray, pd.DataFrame]
+
+class IndexSnapshot:
+    """Article vectors, search indexes and result columns that queries read together."""
+    
+    def __init__(
+        self,
+        version: int = 0,
+        vectorizer: Any = None,
+        bm25: Optional[BM25Weighter] = None,
+        svd_components: Optional[np.ndarray] = None,
+        article_vectors: Optional[sp.csr_matrix] = None,
+        article_embeddings: Optional[np.ndarray] = None,
+        inverted_index: Optional[InvertedIndex] = None,
+        ann_index: Optional[IVFIndex] = None,
+        sharded_index: Optional[ShardedIndex] = None,
+        exclude: Optional[np.ndarray] = None,
+        columns: Optional[Union[pd.DataFrame, Dict[str, np.ndarray]]] = None,
+        has_articles: bool = False,
+        facet_index: Optional[FacetIndex] = None
+    ):
+        """
+        Bundle the search state of one data version.
+        
+        A snapshot is never modified after it is published, apart from the
+        facet index built on its first filtered query, so queries can score
+        against it without holding the recommender's lock.
+        
+        Args:
+            version: Data version, used to tag cached results
+            vectorizer: Fitted vectorizer for the queries
+            bm25: BM25 statistics for model_type 'bm25'
+            svd_components: LSA components for model_type 'lsa'
+            article_vectors: Article vectors
+            article_embeddings: Dense LSA embeddings
+            inverted_index: Optional inverted index over the article vectors
+            ann_index: Optional IVF index over the embeddings
+            sharded_index: Optional sharded index
+            exclude: Boolean mask of articles excluded from results, or None
+            columns: Articles DataFrame or dictionary of metadata columns
+            has_articles: Whether any articles are loaded
+            facet_index: Facet index carried over from a snapshot with the same columns
+        """
+        self.version = version
+        self.vectorizer = vectorizer
+        self.bm25 = bm25
+        self.svd_components = svd_components
+        self.article_vectors = article_vectors
+        self.article_embeddings = article_embeddings
+        self.inverted_index = inverted_index
+        self.ann_index = ann_index
+        self.sharded_index = sharded_index
+        self.exclude = exclude
+        self.columns = columns
+        self.has_articles = has_articles
+        self.facet_index = facet_index
+        self.result_arrays = self._result_column_arrays(columns, has_articles)
+    
+    @staticmethod
+    def _result_column_arrays(
+        columns: Optional[Union[pd.DataFrame, Dict[str, np.ndarray]]],
+        has_articles: bool
+    ) -> Tuple[Dict[str, np.ndarray], np.dtype]:
+        """
+        Get the result columns as arrays and the matching structured dtype.
+        
+        The arrays are extracted once per snapshot, so rendering a result
+        only gathers the selected rows instead of copying DataFrame slices.
+        
+        Args:
+            columns: Articles DataFrame or dictionary of metadata columns
+            has_articles: Whether any articles are loaded
+        
+        Returns:
+            Tuple of (column name -> array over all article rows, structured dtype)
+        """
+        if isinstance(columns, dict):
+            # Memory-mapped columns are already compact arrays
+            arrays = {col: columns[col] for col in RESULT_COLUMNS}
+        elif columns is not None and has_articles:
+            arrays = {col: columns[col].to_numpy() for col in RESULT_COLUMNS}
+        else:
+            arrays = {col: np.array([], dtype=object) for col in RESULT_COLUMNS}
+        
+        # Numeric and fixed-width string columns keep their dtype, others are stored as objects
+        dtype = np.dtype(
+            [(col, arr.dtype if arr.dtype.kind in 'biufU' else object) for col, arr in arrays.items()]
+            + [('similarity', np.float64)]
+        )
+        return arrays, dtype
+    
+    def facet_rows(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        Resolve filters to candidate article rows with the facet index.
+        
+        The facet index is built on the first filtered query and carried over
+        to later snapshots until the article columns change. Removed articles
+        are handled by the exclusion mask.
+        
+        Args:
+            filters: Filter dictionary with 'category', 'tags', 'date_from'
+                and 'date_to' keys, or None
+        
+        Returns:
+            Sorted candidate row indices, or None if no filter is set
+        """
+        if not canonical_filters(filters):
+            return None
+        
+        facet_index = self.facet_index
+        if facet_index is None:
+            # Concurrent first queries may both build it; either copy is valid
+            facet_index = FacetIndex(
+                self.columns['category'],
+                self.columns['tags'],
+                self.columns['date'] if 'date' in self.columns else None
+            )
+            self.facet_index = facet_index
+        return facet_index.candidates(filters)
 
 class ArticleRecommender:
     """Recommender system for nutrition and health articles."""
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None):
+        """
+        Initialize the article recommender system.
+        
+        Args:
+            config_path: Optional path to configuration file
+        """
+        self.config = {}
+        if config_path and os.path.exists(config_path):
+            self.config = load_config(config_path)
+            # Accept the full project config as well as the recommender section
+            self.config = self.config.get('article_recommender', self.config)
+        
+        # Set default configurations
+        self.model_type = self.config.get('model_type', 'tfidf')
+        if self.model_type not in MODEL_TYPES:
+            raise ValueError(f"Unknown model type: {self.model_type}. Options: {MODEL_TYPES}")
+        self.articles_path = self.config.get('articles_path', None)
+        self.model_path = self.config.get('model_path', None)
+        self.top_n = self.config.get('top_n', 5)
+        self.max_features = self.config.get('max_features', 5000)
+        self.query_batch_size = self.config.get('query_batch_size', 1024)
+        self.min_similarity = self.config.get('min_similarity', None)
+        self.result_format = self.config.get('result_format', 'records')
+        if self.result_format not in RESULT_FORMATS:
+            raise ValueError(f"Unknown result format: {self.result_format}. Options: {RESULT_FORMATS}")
+        self.use_inverted_index = self.config.get('use_inverted_index', False)
+        self.index_scoring_mode = self.config.get('index_scoring_mode', 'exhaustive')
+        self.compaction_threshold = self.config.get('compaction_threshold', 0.2)
+        self.background_compaction = self.config.get('background_compaction', False)
+        self.stream_chunksize = self.config.get('stream_chunksize', 10000)
+        self.hashing_features = self.config.get('hashing_features', 2 ** 18)
+        self.embedding_dim = self.config.get('embedding_dim', 128)
+        self.ann_config = self.config.get('ann', {})
+        self.bm25_config = self.config.get('bm25', {})
+        self.sharding_config = self.config.get('sharding', {})
+        if self.sharding_config.get('strategy', 'hash') not in SHARDING_STRATEGIES:
+            raise ValueError(
+                f"Unknown sharding strategy: {self.sharding_config.get('strategy')}. "
+                f"Options: {SHARDING_STRATEGIES}"
+            )
+        self.field_weights = self._resolve_field_weights(self.config.get('field_weights'))
+        self.dedup_config = self.config.get('dedup', {})
+        self.result_cache_config = self.config.get('result_cache', {})
+        self.preprocessing_config = self.config.get('preprocessing', {})
+        
+        # Initialize text preprocessor with a bounded cache for repeated queries;
+        # NLTK resources are resolved on first use and never downloaded by default
+        self.text_preprocessor = self._create_text_preprocessor(
+            self.preprocessing_config.get('tokenizer', 'auto')
+        )
+        
+        # Cache of user recommendations keyed on the canonical query; entries
+        # are tagged with the data version so changes to the articles invalidate them
+        self.result_cache = None
+        if self.result_cache_config.get('enabled', True):
+            self.result_cache = ResultCache(
+                max_size=self.result_cache_config.get('max_size', 1024),
+                ttl_seconds=self.result_cache_config.get('ttl_seconds', 300)
+            )
+        self._data_version = 0
+        
+        # Search state read by queries, replaced as a whole after every change
+        self._snapshot = IndexSnapshot()
+        
+        # Initialize article data
+        self._articles_df = None
+        self._metadata_columns = None
+        if self.articles_path and os.path.exists(self.articles_path):
+            self.load_articles(self.articles_path)
+        
+        # Initialize vectorizer and article vectors
+        self.vectorizer = None
+        self._article_vectors = None
+        self.inverted_index = None
+        
+        # BM25 document statistics (model_type 'bm25')
+        self.bm25 = None
+        
+        # Article shards with pre-transposed vectors (sharding.num_shards > 1),
+        # which replace the row-major article vectors, and their scoring threads
+        self.sharded_index = None
+        self._shard_executor = None
+        
+        # Near-duplicate clusters (dedup.enabled) and rows hidden from results
+        self.minhash = None
+        self._duplicate_mask = None
+        
+        # Dense LSA embeddings and ANN index (model_type 'lsa')
+        self.svd_components = None
+        self.article_embeddings = None
+        self.ann_index = None
+        
+        # Incremental ingestion state: tombstoned rows and changes since the last IDF refresh
+        self.removed_mask = None
+        self._rows_changed = 0
+        # Serializes writers; queries read the published snapshot without it
+        self._lock = threading.RLock()
+        self._compaction_thread = None
+    
+    def _create_text_preprocessor(self, tokenizer: str) -> TextPreprocessor:
+        """
+        Create the text preprocessor from the preprocessing config.
+        
+        Args:
+            tokenizer: Tokenizer backend ('auto', 'nltk' or 'regex')
+        
+        Returns:
+            Text preprocessor
+        """
+        return TextPreprocessor(
+            language=self.preprocessing_config.get('language', 'english'),
+            cache_size=self.preprocessing_config.get('cache_size', 10000),
+            n_workers=self.preprocessing_config.get('n_workers', 1),
+            chunk_size=self.preprocessing_config.get('parallel_chunk_size', 5000),
+            tokenizer=tokenizer,
+            download=self.preprocessing_config.get('download_nltk', False)
+        )
+    
+    def load_articles(self, articles_path: str) -> None:
+        """
+        Load articles from a CSV or Parquet file.
+        
+        Args:
+            articles_path: Path to the articles CSV (or '.parquet') file
+        """
+        try:
+            if articles_path.endswith('.parquet'):
+                articles = pd.read_parquet(articles_path)
+            else:
+                articles = pd.read_csv(articles_path)
+            self.articles_df = self._ensure_required_columns(articles)
+            print(f"Loaded {len(self.articles_df)} articles from {articles_path}")
+        except Exception as e:
+            print(f"Error loading articles: {e}")
+            # Create empty dataframe with required columns
+            self.articles_df = pd.DataFrame(columns=[
+                'article_id', 'title', 'content', 'tags', 'category', 'author', 'date'
+            ])
+    
+    @property
+    def articles_df(self) -> Optional[pd.DataFrame]:
+        """Article data, built from memory-mapped metadata columns on first access."""
+        if self._articles_df is None and self._metadata_columns is not None:
+            self._articles_df = pd.DataFrame(
+                {col: np.asarray(values) for col, values in self._metadata_columns.items()}
+            )
+            self._metadata_columns = None
+        return self._articles_df
+    
+    @articles_df.setter
+    def articles_df(self, articles_df: Optional[pd.DataFrame]) -> None:
+        self._articles_df = articles_df
+        self._metadata_columns = None
+    
+    @property
+    def article_vectors(self) -> Optional[sp.csr_matrix]:
+        """Article vectors, reassembled from the shards when sharding is enabled."""
+        if self._article_vectors is None and self.sharded_index is not None:
+            return self.sharded_index.vectors()
+        return self._article_vectors
+    
+    @article_vectors.setter
+    def article_vectors(self, article_vectors: Optional[sp.csr_matrix]) -> None:
+        self._article_vectors = article_vectors
+    
+    def _num_vectors(self) -> Optional[int]:
+        """
+        Get the number of article vectors without reassembling shards.
+        
+        Returns:
+            Number of vector rows, or None if no vectors are built
+        """
+        if self._article_vectors is not None:
+            return self._article_vectors.shape[0]
+        if self.sharded_index is not None:
+            return self.sharded_index.num_rows
+        return None
+    
+    def _has_articles(self) -> bool:
+        """
+        Check whether any articles are available without materializing them.
+        
+        Returns:
+            True if articles are loaded
+        """
+        if self._metadata_columns is not None:
+            return bool(self._num_vectors())
+        return self._articles_df is not None and not self._articles_df.empty
+    
+    @staticmethod
+    def _ensure_required_columns(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ensure the text columns used for vectorization exist.
+        
+        Args:
+            df: Articles DataFrame
+        
+        Returns:
+            DataFrame with missing text columns created empty
+        """
+        required_cols = ['title', 'content', 'tags', 'category']
+        for col in required_cols:
+            if col not in df.columns:
+                df[col] = ""
+                print(f"Warning: '{col}' column not found, creating empty column")
+        return df
+    
+    @staticmethod
+    def _combine_text(df: pd.DataFrame) -> pd.Series:
+        """
+        Combine the text fields of articles into one string per article.
+        
+        Args:
+            df: Articles DataFrame
+        
+        Returns:
+            Series of combined article text
+        """
+        return (
+            df['title'].fillna('') + ' ' + 
+            df['content'].fillna('') + ' ' + 
+            df['tags'].fillna('') + ' ' + 
+            df['category'].fillna('')
+        )
+    
+    @staticmethod
+    def _resolve_field_weights(field_weights: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
+        """
+        Validate configured field weights and fill in unlisted fields.
+        
+        Args:
+            field_weights: Weight per text field, or None to vectorize the combined text
+        
+        Returns:
+            Weight of every text field, or None if no weights are configured
+        """
+        if not field_weights:
+            return None
+        
+        unknown = set(field_weights) - set(TEXT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields in field_weights: {sorted(unknown)}. Options: {TEXT_FIELDS}")
+        
+        # Unlisted fields keep a neutral weight
+        weights = {field: float(field_weights.get(field, 1.0)) for field in TEXT_FIELDS}
+        if min(weights.values()) <= 0:
+            raise ValueError(f"Field weights must be positive: {weights}")
+        return weights
+    
+    def _preprocess_fields(self, df: pd.DataFrame) -> List[pd.Series]:
+        """
+        Preprocess each text field of the articles separately.
+        
+        Args:
+            df: Articles DataFrame
+        
+        Returns:
+            List of preprocessed text Series in TEXT_FIELDS order
+        """
+        return [self.text_preprocessor.preprocess_series(df[field]) for field in TEXT_FIELDS]
+    
+    @staticmethod
+    def _count_terms(vectorizer: Any, texts: Iterable[str]) -> sp.csr_matrix:
+        """
+        Count terms of preprocessed texts with a fitted vectorizer, without IDF weighting.
+        
+        Args:
+            vectorizer: Fitted TfidfVectorizer or HashingTfidfVectorizer
+            texts: Preprocessed texts
+        
+        Returns:
+            Sparse matrix of raw term counts
+        """
+        if isinstance(vectorizer, HashingTfidfVectorizer):
+            return vectorizer.count(texts)
+        # TfidfVectorizer extends CountVectorizer, whose transform returns raw counts
+        return CountVectorizer.transform(vectorizer, texts).tocsr()
+    
+    def _field_weighted_counts(self, processed_fields: List[pd.Series], vectorizer: Any) -> sp.csr_matrix:
+        """
+        Fuse per-field term counts into one field-weighted count per article term.
+        
+        All fields are counted in a single pass over the stacked field texts,
+        then one sparse product with an articles x (fields * articles) weight
+        matrix sums the weighted counts of each article, as in BM25F.
+        
+        Args:
+            processed_fields: Preprocessed text Series in TEXT_FIELDS order
+            vectorizer: Fitted vectorizer defining the term columns
+        
+        Returns:
+            Sparse matrix of field-weighted term counts
+        """
+        num_articles = len(processed_fields[0])
+        counts = self._count_terms(vectorizer, pd.concat(processed_fields, ignore_index=True))
+        
+        weights = np.array(
+            [self.field_weights[field] for field in TEXT_FIELDS],
+            dtype=np.result_type(counts.dtype, np.float32)
+        )
+        fusion = sp.csr_matrix(
+            (
+                np.repeat(weights, num_articles),
+                (np.tile(np.arange(num_articles), len(TEXT_FIELDS)), np.arange(num_articles * len(TEXT_FIELDS)))
+            ),
+            shape=(num_articles, num_articles * len(TEXT_FIELDS))
+        )
+        return (fusion @ counts).tocsr()
+    
+    def _create_bm25(self) -> BM25Weighter:
+        """
+        Create a BM25 weighter with the parameters from config.
+        
+        Returns:
+            Unfitted BM25 weighter
+        """
+        return BM25Weighter(
+            k1=self.bm25_config.get('k1', 1.2),
+            b=self.bm25_config.get('b', 0.75),
+            delta=self.bm25_config.get('delta', 0.0)
+        )
+    
+    def _article_counts(self, df: pd.DataFrame, vectorizer: Any) -> sp.csr_matrix:
+        """
+        Count article terms, field-weighted if field weights are configured.
+        
+        Args:
+            df: Articles DataFrame
+            vectorizer: Fitted vectorizer defining the term columns
+        
+        Returns:
+            Sparse matrix of term counts
+        """
+        if self.field_weights is not None:
+            return self._field_weighted_counts(self._preprocess_fields(df), vectorizer)
+        return self._count_terms(
+            vectorizer, self.text_preprocessor.preprocess_series(self._combine_text(df))
+        )
+    
+    def _weight_counts(self, counts: sp.csr_matrix) -> sp.csr_matrix:
+        """
+        Apply the fitted term weighting to term counts.
+        
+        Args:
+            counts: Sparse matrix of (field-weighted) term counts
+        
+        Returns:
+            BM25 weights for model_type 'bm25', otherwise TF-IDF with L2-normalized rows
+        """
+        if self.bm25 is not None:
+            return self.bm25.weight(counts)
+        if isinstance(self.vectorizer, HashingTfidfVectorizer):
+            return self.vectorizer.weight(counts)
+        return normalize(counts @ sp.diags(self.vectorizer.idf_), norm='l2', copy=False).tocsr()
+    
+    def _vectorize_articles(self, df: pd.DataFrame) -> sp.csr_matrix:
+        """
+        Vectorize articles with the fitted vectorizer.
+        
+        Args:
+            df: Articles DataFrame
+        
+        Returns:
+            TF-IDF matrix with L2-normalized rows
+        """
+        if self.field_weights is not None:
+            return self._weight_counts(self._article_counts(df, self.vectorizer))
+        return self.vectorizer.transform(
+            self.text_preprocessor.preprocess_series(self._combine_text(df))
+        )
+    
+    def _vectorize_queries(self, snapshot: IndexSnapshot, processed_queries: Iterable[str]) -> sp.csr_matrix:
+        """
+        Vectorize preprocessed queries for scoring against the article vectors.
+        
+        Args:
+            snapshot: Search state the queries are scored against
+            processed_queries: Preprocessed query texts
+        
+        Returns:
+            Query term counts for BM25, otherwise L2-normalized TF-IDF vectors
+        """
+        if snapshot.bm25 is not None:
+            # A BM25 score sums the document weights of every query term occurrence
+            return self._count_terms(snapshot.vectorizer, processed_queries).astype(np.float64)
+        return snapshot.vectorizer.transform(processed_queries)
+    
+    def preprocess_text(self, text: str) -> str:
+        """
+        Preprocess text for feature extraction.
+        
+        Args:
+            text: Input text
+        
+        Returns:
+            Preprocessed text
+        """
+        # Tokenize and remove stopwords (cached for repeated text)
+        return self.text_preprocessor.preprocess(text)
+    
+    def build_article_vectors(self) -> None:
+        """
+        Build TF-IDF (or BM25 for model_type 'bm25') vectors for all articles.
+        """
+        if self.articles_df is None or self.articles_df.empty:
+            print("No articles available. Please load articles first.")
+            return
+        
+        # Initialize vectorizer
+        self.vectorizer = TfidfVectorizer(max_features=self.max_features)
+        self.bm25 = None
+        
+        if self.field_weights is not None or self.model_type == 'bm25':
+            if self.field_weights is not None:
+                # Fit vocabulary and IDF on the combined fields, then weight term
+                # frequencies per field so short title and tag hits are not drowned out
+                processed_fields = self._preprocess_fields(self.articles_df)
+                combined_text = processed_fields[0].str.cat(processed_fields[1:], sep=' ')
+                self.vectorizer.fit(combined_text)
+                self._fit_duplicates(combined_text)
+                counts = self._field_weighted_counts(processed_fields, self.vectorizer)
+                del processed_fields, combined_text
+            else:
+                processed_text = self.text_preprocessor.preprocess_series(
+                    self._combine_text(self.articles_df)
+                )
+                self.vectorizer.fit(processed_text)
+                self._fit_duplicates(processed_text)
+                counts = self._count_terms(self.vectorizer, processed_text)
+                del processed_text
+            
+            if self.model_type == 'bm25':
+                # Length normalization and saturation are precomputed per document term
+                self.bm25 = self._create_bm25()
+                self.bm25.fit(counts)
+            self.article_vectors = self._weight_counts(counts)
+            del counts
+        else:
+            # Combine and preprocess article text fields in one batch; the
+            # intermediate text is not stored on the DataFrame to save memory
+            processed_text = self.text_preprocessor.preprocess_series(
+                self._combine_text(self.articles_df)
+            )
+            
+            # Build article vectors
+            self.article_vectors = self.vectorizer.fit_transform(processed_text)
+            self._fit_duplicates(processed_text)
+            del processed_text
+        
+        weighting = 'BM25' if self.bm25 is not None else 'TF-IDF'
+        print(f"Built {weighting} vectors for {len(self.articles_df)} articles with {self.article_vectors.shape[1]} features")
+        
+        self.removed_mask = np.zeros(self.article_vectors.shape[0], dtype=bool)
+        self._rows_changed = 0
+        self._update_duplicates()
+        self._build_indexes()
+        self._invalidate_results()
+        self._drop_duplicates()
+    
+    def build_from_csv(self, articles_path: str, chunksize: int = None) -> None:
+        """
+        Build article vectors by streaming a CSV file in chunks.
+        
+        Each chunk is preprocessed and hashed into term counts, after which
+        its raw text is discarded. Only the columns needed to render results
+        are kept. IDF weights are computed from document frequencies
+        accumulated over all chunks, so memory stays bounded by the sparse
+        vectors rather than the article text.
+        
+        Args:
+            articles_path: Path to the articles CSV file
+            chunksize: Number of rows read per chunk (default from config)
+        """
+        if chunksize is None:
+            chunksize = self.stream_chunksize
+        
+        vectorizer = HashingTfidfVectorizer(n_features=self.hashing_features)
+        minhash = self._create_minhash()
+        count_chunks = []
+        signature_chunks = []
+        metadata_chunks = []
+        
+        for chunk in pd.read_csv(articles_path, chunksize=chunksize):
+            chunk = self._ensure_required_columns(chunk)
+            
+            # Preprocess and hash the chunk, then drop its text
+            if self.field_weights is not None:
+                processed_fields = self._preprocess_fields(chunk)
+                count_chunks.append(vectorizer.partial_fit_counts(
+                    self._field_weighted_counts(processed_fields, vectorizer)
+                ))
+                if minhash is not None:
+                    signature_chunks.append(minhash.compute_signatures(
+                        processed_fields[0].str.cat(processed_fields[1:], sep=' ')
+                    ))
+                del processed_fields
+            else:
+                processed_text = self.text_preprocessor.preprocess_series(self._combine_text(chunk))
+                count_chunks.append(vectorizer.partial_fit(processed_text))
+                if minhash is not None:
+                    signature_chunks.append(minhash.compute_signatures(processed_text))
+                del processed_text
+            metadata_chunks.append(
+                chunk[[col for col in STREAMING_METADATA_COLUMNS if col in chunk.columns]]
+            )
+            del chunk
+        
+        if not count_chunks:
+            print(f"No articles found in {articles_path}")
+            return
+        
+        # Weight all counts with the global IDF (or BM25 statistics)
+        counts = sp.vstack(count_chunks, format='csr')
+        del count_chunks
+        vectorizer.finalize()
+        bm25 = None
+        if self.model_type == 'bm25':
+            bm25 = self._create_bm25()
+            bm25.fit(counts)
+            article_vectors = bm25.weight(counts)
+        else:
+            article_vectors = vectorizer.weight(counts)
+        del counts
+        if minhash is not None:
+            minhash.fit(np.vstack(signature_chunks))
+        del signature_chunks
+        
+        with self._lock:
+            self.articles_df = pd.concat(metadata_chunks, ignore_index=True)
+            self.vectorizer = vectorizer
+            self.bm25 = bm25
+            self.article_vectors = article_vectors
+            self.minhash = minhash
+            self.removed_mask = np.zeros(article_vectors.shape[0], dtype=bool)
+            self._rows_changed = 0
+            self._update_duplicates()
+            self._build_indexes()
+            self._invalidate_results()
+        
+        print(f"Built hashed TF-IDF vectors for {article_vectors.shape[0]} articles from {articles_path}")
+        self._drop_duplicates()
+    
+    def _create_minhash(self) -> Optional[MinHashLSH]:
+        """
+        Create the near-duplicate detector from config.
+        
+        Returns:
+            Unfitted MinHashLSH, or None if duplicate detection is disabled
+        """
+        if not self.dedup_config.get('enabled', False):
+            return None
+        return MinHashLSH(
+            num_perm=self.dedup_config.get('num_perm', 64),
+            bands=self.dedup_config.get('bands', 16),
+            shingle_size=self.dedup_config.get('shingle_size', 3),
+            threshold=self.dedup_config.get('threshold', 0.8)
+        )
+    
+    def _fit_duplicates(self, processed_text: pd.Series) -> None:
+        """
+        Cluster near-duplicate articles if enabled in config.
+        
+        Args:
+            processed_text: Preprocessed combined text of all articles
+        """
+        self.minhash = self._create_minhash()
+        if self.minhash is not None:
+            self.minhash.fit(self.minhash.compute_signatures(processed_text))
+    
+    def _update_duplicates(self) -> None:
+        """
+        Mark the articles that are not the representative of their cluster.
+        
+        The representative is the first article of the cluster that is not
+        removed, so removing it promotes the next member.
+        """
+        self._duplicate_mask = None
+        if self.minhash is None:
+            return
+        representatives = self.minhash.representatives(self.removed_mask)
+        self._duplicate_mask = (
+            (representatives != np.arange(len(representatives))) & ~self.removed_mask
+        )
+    
+    def _drop_duplicates(self) -> None:
+        """
+        Remove non-representative near-duplicates if dedup.drop_duplicates is set.
+        """
+        if self._duplicate_mask is None or not self.dedup_config.get('drop_duplicates', False):
+            return
+        if self._duplicate_mask.any():
+            self.remove_articles(self.find_duplicates()['article_id'].tolist())
+    
+    def find_duplicates(self) -> pd.DataFrame:
+        """
+        List near-duplicate articles and the article representing their cluster.
+        
+        Returns:
+            DataFrame with 'article_id' and 'duplicate_of' for every article
+            that is not the representative of its cluster
+        """
+        if self.minhash is None:
+            raise ValueError("Duplicate detection is disabled. Set dedup.enabled in config.")
+        
+        with self._lock:
+            if self._metadata_columns is not None:
+                article_ids = np.asarray(self._metadata_columns['article_id'])
+            else:
+                article_ids = self.articles_df['article_id'].to_numpy()
+            rows = np.flatnonzero(self._duplicate_mask)
+            representatives = self.minhash.representatives(self.removed_mask)[rows]
+        return pd.DataFrame({'article_id': article_ids[rows], 'duplicate_of': article_ids[representatives]})
+    
+    def _build_indexes(self) -> None:
+        """
+        Build the search structures enabled in config over the article vectors.
+        """
+        self.build_inverted_index()
+        self.build_dense_index()
+        self.build_sharded_index()
+    
+    def build_inverted_index(self) -> None:
+        """
+        Build the inverted index over the article vectors if enabled in config.
+        """
+        self.inverted_index = None
+        article_vectors = self.article_vectors
+        if self.use_inverted_index and article_vectors is not None:
+            self.inverted_index = InvertedIndex(article_vectors)
+            print(f"Built inverted index with {article_vectors.nnz} postings")
+    
+    def _shard_ids(self, columns: Union[pd.DataFrame, Dict[str, np.ndarray]], num_shards: int) -> np.ndarray:
+        """
+        Get the shard of each article from its shard key.
+        
+        Args:
+            columns: Articles DataFrame or dictionary of metadata columns
+            num_shards: Number of shards
+        
+        Returns:
+            Shard index per article
+        """
+        key = 'category' if self.sharding_config.get('strategy', 'hash') == 'category' else 'article_id'
+        return assign_shards(columns[key], num_shards)
+    
+    def build_sharded_index(self) -> None:
+        """
+        Partition the article vectors into shards if enabled in config.
+        
+        Shards are row slices of the globally weighted vectors, so all shards
+        share the same IDF statistics. The shards keep the only copy of the
+        vectors; the row-major matrix is dropped and article_vectors
+        reassembles it from the shards on access. LSA embeddings are not
+        copied into the shards.
+        """
+        article_vectors = self.article_vectors
+        self.sharded_index = None
+        self._article_vectors = article_vectors
+        
+        num_shards = self.sharding_config.get('num_shards', 1)
+        if num_shards <= 1 or article_vectors is None:
+            return
+        
+        columns = self._metadata_columns if self._metadata_columns is not None else self._articles_df
+        sharded_index = ShardedIndex(num_shards, article_vectors.shape[1], executor=self._get_shard_executor(num_shards))
+        sharded_index.append(self._shard_ids(columns, num_shards), article_vectors)
+        self.sharded_index = sharded_index
+        self._article_vectors = None
+        print(f"Partitioned {article_vectors.shape[0]} articles into {num_shards} shards")
+    
+    def _get_shard_executor(self, num_shards: int) -> Optional[ThreadPoolExecutor]:
+        """
+        Get the thread pool scoring shards, created on first use.
+        
+        One pool serves every sharded index of the recommender, so indexes
+        rebuilt by compaction or loading do not leave threads behind, and
+        queries still running on an older snapshot can keep using it.
+        
+        Args:
+            num_shards: Number of shards, the pool size if sharding.n_workers is 0
+        
+        Returns:
+            Thread pool, or None if shards are scored in the calling thread
+        """
+        n_workers = self.sharding_config.get('n_workers', 1) or num_shards
+        if n_workers <= 1:
+            return None
+        if self._shard_executor is None:
+            self._shard_executor = ThreadPoolExecutor(max_workers=n_workers)
+        return self._shard_executor
+    
+    def close(self) -> None:
+        """
+        Stop the shard scoring threads.
+        
+        Sharded queries issued after closing raise an error.
+        """
+        if self._shard_executor is not None:
+            self._shard_executor.shutdown(wait=False)
+            self._shard_executor = None
+    
+    def _search_shards(
+        self,
+        snapshot: IndexSnapshot,
+        query_vectors: sp.spmatrix,
+        top_n: int,
+        min_similarity: Optional[float],
+        exclude: Optional[np.ndarray]
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Score all shards and merge their top-N lists.
+        
+        Args:
+            snapshot: Search state to score against
+            query_vectors: Vectorized queries
+            top_n: Number of top articles per query
+            min_similarity: Optional minimum similarity
+            exclude: Optional boolean mask of articles that must not be returned
+        
+        Returns:
+            List of (article indices, similarity scores) per query
+        """
+        query_embeddings = None
+        if snapshot.article_embeddings is not None:
+            query_embeddings = self._embed(query_vectors, snapshot.svd_components)
+        return snapshot.sharded_index.search(
+            query_vectors, top_n, min_similarity, exclude, query_embeddings, snapshot.article_embeddings
+        )
+    
+    def build_dense_index(self) -> None:
+        """
+        Build LSA embeddings and the ANN index if model_type is 'lsa'.
+        
+        Embeddings come from a truncated SVD of the TF-IDF matrix, computed
+        locally. With ann.nlist > 0 they are served by an IVF index,
+        otherwise queries use exact search over all embeddings.
+        """
+        self.svd_components = None
+        self.article_embeddings = None
+        self.ann_index = None
+        article_vectors = self.article_vectors
+        if self.model_type != 'lsa' or article_vectors is None:
+            return
+        
+        n_components = min(self.embedding_dim, min(article_vectors.shape) - 1)
+        svd = TruncatedSVD(n_components=n_components, random_state=42)
+        svd.fit(article_vectors)
+        self.svd_components = svd.components_.astype(np.float32)
+        self.article_embeddings = self._embed(article_vectors)
+        
+        self._build_ann_index()
+        print(f"Built {n_components}-dimensional LSA embeddings for {len(self.article_embeddings)} articles")
+    
+    def _build_ann_index(self) -> None:
+        """
+        Build the IVF index over the article embeddings if enabled in config.
+        """
+        self.ann_index = None
+        if self.ann_config.get('nlist', 0) > 0:
+            self.ann_index = IVFIndex(
+                nlist=self.ann_config['nlist'],
+                nprobe=self.ann_config.get('nprobe', 8),
+                n_iter=self.ann_config.get('n_iter', 20)
+            )
+            self.ann_index.fit(self.article_embeddings)
+    
+    def _embed(self, vectors: sp.spmatrix, svd_components: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Project TF-IDF vectors onto the LSA components.
+        
+        Args:
+            vectors: Sparse TF-IDF matrix
+            svd_components: LSA components (default the current ones)
+        
+        Returns:
+            L2-normalized dense embeddings
+        """
+        if svd_components is None:
+            svd_components = self.svd_components
+        embeddings = np.asarray(vectors @ svd_components.T, dtype=np.float32)
+        return normalize(embeddings, norm='l2', copy=False)
+    
+    def _search_embeddings(
+        self,
+        snapshot: IndexSnapshot,
+        query_vectors: sp.spmatrix,
+        top_n: int,
+        min_similarity: Optional[float],
+        exclude: Optional[np.ndarray]
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Find the most similar articles in LSA space for a batch of queries.
+        
+        Args:
+            snapshot: Search state to score against
+            query_vectors: Sparse TF-IDF matrix of the queries
+            top_n: Number of top articles per query
+            min_similarity: Optional minimum similarity
+            exclude: Optional boolean mask of articles that must not be returned
+        
+        Returns:
+            List of (article indices, similarity scores) per query
+        """
+        query_embeddings = self._embed(query_vectors, snapshot.svd_components)
+        if snapshot.ann_index is not None:
+            return snapshot.ann_index.search(
+                snapshot.article_embeddings, query_embeddings, top_n, min_score=min_similarity, exclude=exclude
+            )
+        return exact_search(snapshot.article_embeddings, query_embeddings, top_n, min_similarity, exclude)
+    
+    def add_articles(self, new_articles: pd.DataFrame) -> None:
+        """
+        Add articles without refitting the vectorizer.
+        
+        New articles are vectorized with the fitted vocabulary and IDF weights
+        and appended to the article vectors, so only the new rows are
+        tokenized. Terms outside the vocabulary are ignored until the next
+        full rebuild. IDF weights are refreshed on compaction.
+        
+        Args:
+            new_articles: DataFrame of articles to add
+        """
+        new_articles = self._ensure_required_columns(new_articles.copy())
+        
+        if self.vectorizer is None or self._num_vectors() is None:
+            # Nothing fitted yet: build from scratch
+            frames = [df for df in (self.articles_df, new_articles) if df is not None]
+            self.articles_df = pd.concat(frames, ignore_index=True)
+            self.build_article_vectors()
+            return
+        
+        # Vectorize only the new articles
+        if self.bm25 is not None:
+            new_counts = self._article_counts(new_articles, self.vectorizer)
+            new_vectors = self.bm25.weight(new_counts)
+        else:
+            new_vectors = self._vectorize_articles(new_articles)
+        if self.minhash is not None:
+            new_signatures = self.minhash.compute_signatures(
+                self.text_preprocessor.preprocess_series(self._combine_text(new_articles))
+            )
+        
+        with self._lock:
+            self.articles_df = pd.concat([self.articles_df, new_articles], ignore_index=True)
+            if self.sharded_index is None:
+                self.article_vectors = sp.vstack([self.article_vectors, new_vectors], format='csr')
+            if self.bm25 is not None:
+                self.bm25.extend(new_counts)
+            self.removed_mask = np.concatenate([
+                self.removed_mask, np.zeros(len(new_articles), dtype=bool)
+            ])
+            # Indexes are extended as copies, so queries on the published
+            # snapshot keep a consistent view until the new one is published
+            if self.inverted_index is not None:
+                self.inverted_index = copy.copy(self.inverted_index)
+                self.inverted_index.append(new_vectors)
+            new_embeddings = None
+            if self.article_embeddings is not None:
+                new_embeddings = self._embed(new_vectors)
+                self.article_embeddings = np.vstack([self.article_embeddings, new_embeddings])
+                if self.ann_index is not None:
+                    self.ann_index = copy.copy(self.ann_index)
+                    self.ann_index.add(new_embeddings)
+            if self.sharded_index is not None:
+                # The shards hold the only copy of the vectors
+                self.sharded_index = copy.copy(self.sharded_index)
+                self.sharded_index.append(
+                    self._shard_ids(new_articles, self.sharded_index.num_shards), new_vectors
+                )
+            if self.minhash is not None:
+                self.minhash.add(new_signatures)
+                self._update_duplicates()
+            self._rows_changed += len(new_articles)
+            self._invalidate_results()
+        
+        print(f"Added {len(new_articles)} articles")
+        self._drop_duplicates()
+        self._maybe_compact()
+    
+    def remove_articles(self, article_ids: List[Any]) -> int:
+        """
+        Remove articles by marking their rows as deleted.
+        
+        Removed articles are excluded from results immediately and their rows
+        are dropped on the next compaction.
+        
+        Args:
+            article_ids: IDs of the articles to remove
+        
+        Returns:
+            Number of articles removed
+        """
+        if self._num_vectors() is None:
+            return 0
+        
+        with self._lock:
+            if self._metadata_columns is not None:
+                current_ids = np.asarray(self._metadata_columns['article_id'])
+            else:
+                current_ids = self.articles_df['article_id'].to_numpy()
+            matches = np.isin(current_ids, list(article_ids))
+            newly_removed = matches & ~self.removed_mask
+            self.removed_mask = self.removed_mask | matches
+            self._update_duplicates()
+            num_removed = int(newly_removed.sum())
+            self._rows_changed += num_removed
+            self._invalidate_results()
+        
+        print(f"Removed {num_removed} articles")
+        self._maybe_compact()
+        return num_removed
+    
+    def _exclusion_mask(self) -> Optional[np.ndarray]:
+        """
+        Get the mask of articles excluded from results, or None if none is excluded.
+        
+        Removed articles are excluded, and with dedup.diversify every
+        near-duplicate except its cluster's representative, so one cluster
+        takes at most one top-N slot.
+        
+        Returns:
+            Boolean mask over article rows or None
+        """
+        mask = self.removed_mask
+        if self._duplicate_mask is not None and self.dedup_config.get('diversify', True):
+            mask = self._duplicate_mask if mask is None else mask | self._duplicate_mask
+        if mask is None or not mask.any():
+            return None
+        return mask
+    
+    def _maybe_compact(self) -> None:
         """
-        Initialize the article recommender system.
+        Compact when the changes since the last IDF refresh exceed the threshold.
+        """
+        num_vectors = self._num_vectors()
+        if self.compaction_threshold is None or num_vectors is None:
+            return
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        if self._rows_changed > self.compaction_threshold * num_vectors:
+            self.compact(background=self.background_compaction)
+    
+    def compact(self, background: bool = False) -> None:
+        """
+        Drop removed rows and refresh IDF weights from the remaining articles.
+        
+        IDF weights are recomputed from document frequencies of the stored
+        vectors, so no article is tokenized again. The new state is computed
+        from a snapshot and swapped in only if no articles were added or
+        removed meanwhile.
         
         Args:
-            config_path: Optional path to configuration file
+            background: Run the compaction in a background thread
         """
-        self.config = {}
-        if config_path and os.path.exists(config_path):
-            self.config = load_config(config_path)
+        if background:
+            self._compaction_thread = threading.Thread(target=self.compact, daemon=True)
+            self._compaction_thread.start()
+            return
         
-        # Set default configurations
-        self.articles_path = self.config.get('articles_path', None)
-        self.model_path = self.config.get('model_path', None)
-        self.top_n = self.config.get('top_n', 5)
+        with self._lock:
+            articles_df = self.articles_df
+            article_vectors = self.article_vectors
+            bm25 = self.bm25
+            doc_lengths = bm25.doc_lengths if bm25 is not None else None
+            minhash = self.minhash
+            keep = ~self.removed_mask
+            rows_changed = self._rows_changed
         
-        # Initialize article data
-        self.articles_df = None
-        if self.articles_path and os.path.exists(self.articles_path):
-            self.load_articles(self.articles_path)
+        # Drop removed rows
+        articles_df = articles_df[keep].reset_index(drop=True)
+        article_vectors = article_vectors[keep]
+        if minhash is not None:
+            # Signatures are kept, so clusters are rebuilt without tokenizing
+            minhash = minhash.subset(keep)
         
-        # Initialize vectorizer and article vectors
-        self.vectorizer = None
-        self.article_vectors = None
+        # Recompute IDF from document frequencies (smooth IDF as in TfidfVectorizer)
+        num_docs = article_vectors.shape[0]
+        doc_freq = np.bincount(article_vectors.indices, minlength=article_vectors.shape[1])
+        if self.vectorizer.smooth_idf:
+            idf = np.log((1 + num_docs) / (1 + doc_freq)) + 1
+        else:
+            idf = np.log(num_docs / np.maximum(doc_freq, 1)) + 1
         
-        # Download NLTK resources if needed
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt')
+        if bm25 is not None:
+            # BM25 weights saturate with term frequency, so recover the counts
+            # from the weights and refit the statistics on the remaining articles
+            counts = bm25.counts_from_weights(article_vectors, doc_lengths[keep])
+            bm25 = self._create_bm25()
+            bm25.fit(counts)
+            article_vectors = bm25.weight(counts)
+            del counts
+        else:
+            # Rows are tf * old_idf up to scale, so rescaling by new_idf / old_idf and
+            # renormalizing gives the vectors a refit on the same texts would produce
+            article_vectors = normalize(
+                article_vectors @ sp.diags(idf / self.vectorizer.idf_), norm='l2', copy=False
+            ).tocsr()
         
-        try:
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('stopwords')
+        with self._lock:
+            if self._rows_changed != rows_changed:
+                print("Articles changed during compaction, skipping swap")
+                return
+            self.articles_df = articles_df
+            self.article_vectors = article_vectors
+            self.bm25 = bm25
+            # Queries on the published snapshot keep vectorizing with the old IDF
+            self.vectorizer = copy.deepcopy(self.vectorizer)
+            self.vectorizer.idf_ = idf
+            if isinstance(self.vectorizer, HashingTfidfVectorizer):
+                self.vectorizer.doc_freq = doc_freq
+                self.vectorizer.num_docs = num_docs
+            self.minhash = minhash
+            self.removed_mask = np.zeros(num_docs, dtype=bool)
+            self._rows_changed = 0
+            self._update_duplicates()
+            self.build_inverted_index()
+            if self.svd_components is not None:
+                # Keep the LSA components and IVF centroids, only re-embed and reassign
+                self.article_embeddings = self._embed(article_vectors)
+                if self.ann_index is not None:
+                    self.ann_index = copy.copy(self.ann_index)
+                    self.ann_index.set_assignments(self.ann_index.assign(self.article_embeddings))
+            self.build_sharded_index()
+            self._invalidate_results()
+        
+        print(f"Compacted article vectors to {num_docs} articles")
     
-    def load_articles(self, articles_path: str) -> None:
+    def _invalidate_results(self) -> None:
         """
-        Load articles from a CSV file.
+        Publish the current search state as a new snapshot.
         
-        Args:
-            articles_path: Path to the articles CSV file
+        The data version is bumped, so cached results of earlier snapshots
+        become stale. Queries pick up the snapshot in one reference read.
         """
-        try:
-            self.articles_df = pd.read_csv(articles_path)
-            print(f"Loaded {len(self.articles_df)} articles from {articles_path}")
-            
-            # Ensure required columns exist
-            required_cols = ['title', 'content', 'tags', 'category']
-            for col in required_cols:
-                if col not in self.articles_df.columns:
-                    self.articles_df[col] = ""
-                    print(f"Warning: '{col}' column not found, creating empty column")
-        except Exception as e:
-            print(f"Error loading articles: {e}")
-            # Create empty dataframe with required columns
-            self.articles_df = pd.DataFrame(columns=[
-                'article_id', 'title', 'content', 'tags', 'category', 'author', 'date'
-            ])
+        with self._lock:
+            self._data_version += 1
+            columns = self._metadata_columns if self._metadata_columns is not None else self._articles_df
+            previous = self._snapshot
+            self._snapshot = IndexSnapshot(
+                version=self._data_version,
+                vectorizer=self.vectorizer,
+                bm25=self.bm25,
+                svd_components=self.svd_components,
+                article_vectors=self._article_vectors,
+                article_embeddings=self.article_embeddings,
+                inverted_index=self.inverted_index,
+                ann_index=self.ann_index,
+                sharded_index=self.sharded_index,
+                exclude=self._exclusion_mask(),
+                columns=columns,
+                has_articles=self._has_articles(),
+                facet_index=previous.facet_index if previous.columns is columns else None
+            )
     
-    def preprocess_text(self, text: str) -> str:
+    def cache_stats(self) -> Dict[str, Any]:
         """
-        Preprocess text for feature extraction.
+        Get statistics of the recommendation result cache.
+        
+        Returns:
+            Dictionary with hits, misses, hit ratio, evictions, expirations,
+            size and estimated memory in bytes (empty if the cache is disabled)
+        """
+        if self.result_cache is None:
+            return {}
+        return self.result_cache.stats()
+    
+    def clear_result_cache(self) -> None:
+        """
+        Remove all cached recommendation results.
+        """
+        if self.result_cache is not None:
+            self.result_cache.clear()
+    
+    def _build_results(
+        self,
+        indices: np.ndarray,
+        scores: np.ndarray,
+        output: str = None,
+        snapshot: Optional[IndexSnapshot] = None
+    ) -> ArticleResults:
+        """
+        Render the selected articles in the requested result format.
         
         Args:
-            text: Input text
-            
+            indices: Row indices of the selected articles
+            scores: Similarity scores aligned with indices
+            output: One of RESULT_FORMATS (default from config)
+            snapshot: Search state the articles were ranked in (default the current one)
+        
         Returns:
-            Preprocessed text
+            Article id, title, category, tags and similarity of each article
         """
-        # Tokenize
-        tokens = nltk.word_tokenize(text.lower())
+        if output is None:
+            output = self.result_format
+        if output not in RESULT_FORMATS:
+            raise ValueError(f"Unknown result format: {output}. Options: {RESULT_FORMATS}")
+        
+        if snapshot is None:
+            snapshot = self._snapshot
+        arrays, dtype = snapshot.result_arrays
         
-        # Remove stopwords
-        stopwords = set(nltk.corpus.stopwords.words('english'))
-        tokens = [token for token in tokens if token not in stopwords]
+        if output == 'structured':
+            results = np.empty(len(indices), dtype=dtype)
+            for col, arr in arrays.items():
+                results[col] = arr[indices]
+            results['similarity'] = scores
+            return results
         
-        # Join tokens back into string
-        return ' '.join(tokens)
+        if output == 'frame':
+            results = pd.DataFrame(
+                {col: arr[indices] for col, arr in arrays.items()},
+                index=indices
+            )
+            results['similarity'] = scores
+            return results
+        
+        # Gather each column once and convert to Python values in bulk
+        rows = zip(*[arr[indices].tolist() for arr in arrays.values()], np.asarray(scores).tolist())
+        if output == 'tuples':
+            return list(rows)
+        
+        names = RESULT_COLUMNS + ('similarity',)
+        return [dict(zip(names, row)) for row in rows]
     
-    def build_article_vectors(self) -> None:
+    def _facet_rows(
+        self,
+        filters: Optional[Dict[str, Any]],
+        snapshot: Optional[IndexSnapshot] = None
+    ) -> Optional[np.ndarray]:
         """
-        Build TF-IDF vectors for all articles.
+        Resolve filters to candidate article rows with the facet index.
+        
+        Args:
+            filters: Filter dictionary with 'category', 'tags', 'date_from'
+                and 'date_to' keys, or None
+            snapshot: Search state to filter (default the current one)
+        
+        Returns:
+            Sorted candidate row indices, or None if no filter is set
         """
-        if self.articles_df is None or self.articles_df.empty:
-            print("No articles available. Please load articles first.")
-            return
+        if snapshot is None:
+            snapshot = self._snapshot
+        return snapshot.facet_rows(filters)
+    
+    def _rank_candidates(
+        self,
+        snapshot: IndexSnapshot,
+        query_vectors: sp.spmatrix,
+        candidates: np.ndarray,
+        top_n: int,
+        min_similarity: Optional[float],
+        exclude: Optional[np.ndarray]
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Rank only the candidate articles for a batch of query vectors.
         
-        # Combine article text fields
-        self.articles_df['combined_text'] = (
-            self.articles_df['title'] + ' ' + 
-            self.articles_df['content'] + ' ' + 
-            self.articles_df['tags'] + ' ' + 
-            self.articles_df['category']
-        )
+        Scoring works on the candidate rows, so its cost is proportional
+        to the number of candidates rather than the corpus size.
         
-        # Preprocess text
-        self.articles_df['processed_text'] = self.articles_df['combined_text'].apply(
-            self.preprocess_text
-        )
+        Args:
+            snapshot: Search state to score against
+            query_vectors: Vectorized queries
+            candidates: Sorted candidate article row indices
+            top_n: Number of top articles per query
+            min_similarity: Minimum similarity for an article to be returned
+            exclude: Optional boolean mask over all articles that must not be returned
         
-        # Initialize vectorizer
-        self.vectorizer = TfidfVectorizer(max_features=5000)
+        Returns:
+            List of (article row indices, similarity scores) tuples, one per query
+        """
+        if snapshot.article_embeddings is None and snapshot.article_vectors is None:
+            # The shards hold the only copy of the vectors: score them with
+            # every article outside the candidates excluded
+            mask = np.ones(snapshot.sharded_index.num_rows, dtype=bool)
+            mask[candidates] = False
+            if exclude is not None:
+                mask |= exclude
+            return snapshot.sharded_index.search(query_vectors, top_n, min_similarity, mask)
         
-        # Build article vectors
-        self.article_vectors = self.vectorizer.fit_transform(
-            self.articles_df['processed_text']
-        )
+        candidate_exclude = exclude[candidates] if exclude is not None else None
+        
+        if snapshot.article_embeddings is not None:
+            # Exact search over the candidate embeddings
+            ranked = exact_search(
+                snapshot.article_embeddings[candidates],
+                self._embed(query_vectors, snapshot.svd_components),
+                top_n,
+                min_similarity,
+                candidate_exclude
+            )
+        else:
+            ranked = select_top_n_rows(
+                query_vectors @ snapshot.article_vectors[candidates].T,
+                top_n,
+                min_similarity,
+                candidate_exclude
+            )
+        
+        # Map candidate positions back to article rows
+        return [(candidates[indices], scores) for indices, scores in ranked]
+    
+    def _rank_query(
+        self,
+        processed_query: str,
+        top_n: int,
+        min_similarity: Optional[float],
+        filters: Optional[Dict[str, Any]] = None,
+        snapshot: Optional[IndexSnapshot] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rank articles for a preprocessed query.
+        
+        Args:
+            processed_query: Preprocessed query text
+            top_n: Number of top articles to return
+            min_similarity: Minimum similarity for an article to be returned
+            filters: Optional facet filters applied before scoring
+            snapshot: Search state to score against (default the current one)
+        
+        Returns:
+            Tuple of (article row indices, similarity scores) sorted by descending score
+        """
+        if snapshot is None:
+            snapshot = self._snapshot
+            
+        # Transform query to TF-IDF vector (term counts for BM25)
+        query_vector = self._vectorize_queries(snapshot, [processed_query])
+        exclude = snapshot.exclude
+            
+        candidates = snapshot.facet_rows(filters)
+        if candidates is not None:
+            # Only score articles matching the filters
+            return self._rank_candidates(snapshot, query_vector, candidates, top_n, min_similarity, exclude)[0]
+            
+        if snapshot.sharded_index is not None:
+            # Score all shards and merge their top-N lists
+            return self._search_shards(snapshot, query_vector, top_n, min_similarity, exclude)[0]
+            
+        if snapshot.article_embeddings is not None:
+            # Dense LSA similarity, approximate if the ANN index is enabled
+            return self._search_embeddings(snapshot, query_vector, top_n, min_similarity, exclude)[0]
+            
+        if snapshot.inverted_index is not None:
+            # Only score articles sharing a term with the query
+            return snapshot.inverted_index.search(
+                query_vector, top_n, self.index_scoring_mode, min_similarity, exclude
+            )
+            
+        # Score all articles; TF-IDF rows are L2-normalized, so the
+        # dot product is the cosine similarity
+        similarities = (snapshot.article_vectors @ query_vector.T).toarray().ravel()
+        
+        # Get top similar articles without sorting the full corpus
+        return select_top_n(similarities, top_n, min_similarity, exclude)
+    
+    def _rank_queries_batch(
+        self,
+        queries: List[str],
+        top_n: int,
+        batch_size: int,
+        min_similarity: Optional[float],
+        filters: Optional[Dict[str, Any]] = None,
+        snapshot: Optional[IndexSnapshot] = None
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Rank articles for many queries with one matrix product per batch.
+        
+        Args:
+            queries: List of query texts
+            top_n: Number of top articles to return per query
+            batch_size: Number of queries scored per matrix product
+            min_similarity: Minimum similarity for an article to be returned
+            filters: Optional facet filters applied to all queries before scoring
+            snapshot: Search state to score against (default the current one)
         
-        print(f"Built TF-IDF vectors for {len(self.articles_df)} articles with {self.article_vectors.shape[1]} features")
+        Returns:
+            List of (article row indices, similarity scores) tuples, one per query
+        """
+        if snapshot is None:
+            snapshot = self._snapshot
+            
+        exclude = snapshot.exclude
+        candidates = snapshot.facet_rows(filters)
+        if candidates is None and snapshot.article_embeddings is None and snapshot.sharded_index is None:
+            article_vectors_t = snapshot.article_vectors.T.tocsc()
+                
+        ranked = []
+        for start in range(0, len(queries), batch_size):
+            batch = pd.Series(queries[start:start + batch_size], dtype=object)
+                
+            # Preprocess and vectorize the whole batch
+            processed = self.text_preprocessor.preprocess_series(batch)
+            query_vectors = self._vectorize_queries(snapshot, processed)
+            
+            if candidates is not None:
+                ranked.extend(self._rank_candidates(
+                    snapshot, query_vectors, candidates, top_n, min_similarity, exclude
+                ))
+            elif snapshot.sharded_index is not None:
+                ranked.extend(self._search_shards(snapshot, query_vectors, top_n, min_similarity, exclude))
+            elif snapshot.article_embeddings is not None:
+                ranked.extend(self._search_embeddings(snapshot, query_vectors, top_n, min_similarity, exclude))
+            else:
+                # One sparse product for all queries in the batch
+                ranked.extend(select_top_n_rows(
+                    query_vectors @ article_vectors_t, top_n, min_similarity, exclude
+                ))
+        
+        return ranked
     
-    def find_similar_articles(self, query: str, top_n: int = None) -> pd.DataFrame:
+    def find_similar_articles(
+        self,
+        query: str,
+        top_n: int = None,
+        min_similarity: float = None,
+        output: str = None,
+        filters: Dict[str, Any] = None
+    ) -> ArticleResults:
         """
         Find articles similar to a query.
         
         Args:
             query: Query text
             top_n: Number of top articles to return (default from config)
-            
+            min_similarity: Minimum similarity for an article to be returned
+                (default from config, no cutoff if unset)
+            output: Result format, one of 'records' (list of dicts), 'tuples',
+                'structured' (NumPy structured array) or 'frame' (DataFrame)
+                (default from config)
+            filters: Optional facet filters applied before scoring:
+                'category' and 'tags' (a value or list, matching any of them),
+                'date_from' and 'date_to' (inclusive date range)
+        
         Returns:
-            DataFrame with top matching articles
+            Top matching articles in the requested format
         """
-        if self.vectorizer is None or self.article_vectors is None:
+        if self.vectorizer is None or self._num_vectors() is None:
             self.build_article_vectors()
         
-        if self.articles_df is None or self.articles_df.empty:
+        # Scoring reads one published snapshot, so writers never block it
+        snapshot = self._snapshot
+        if not snapshot.has_articles:
             print("No articles available. Please load articles first.")
-            return pd.DataFrame()
+            return self._build_results(np.array([], dtype=np.intp), np.array([]), output, snapshot)
         
-        # Use config top_n if not specified
+        # Use config values if not specified
         if top_n is None:
             top_n = self.top_n
+        if min_similarity is None:
+            min_similarity = self.min_similarity
         
         # Preprocess query
         processed_query = self.preprocess_text(query)
         
-        # Transform query to TF-IDF vector
-        query_vector = self.vectorizer.transform([processed_query])
+        top_indices, top_scores = self._rank_query(processed_query, top_n, min_similarity, filters, snapshot)
+        return self._build_results(top_indices, top_scores, output, snapshot)
+    
+    def find_similar_articles_batch(
+        self,
+        queries: List[str],
+        top_n: int = None,
+        batch_size: int = None,
+        min_similarity: float = None,
+        output: str = None,
+        filters: Dict[str, Any] = None
+    ) -> List[ArticleResults]:
+        """
+        Find articles similar to many queries at once.
+        
+        All queries of a batch are vectorized together and scored with a single
+        sparse query x article matrix product. TF-IDF rows are L2-normalized,
+        so the dot product equals the cosine similarity.
+        
+        Args:
+            queries: List of query texts
+            top_n: Number of top articles to return per query (default from config)
+            batch_size: Number of queries scored per matrix product (default from config)
+            min_similarity: Minimum similarity for an article to be returned
+                (default from config, no cutoff if unset)
+            output: Result format, one of RESULT_FORMATS (default from config)
+            filters: Optional facet filters applied to all queries before scoring
         
-        # Calculate cosine similarity
-        similarities = cosine_similarity(query_vector, self.article_vectors).flatten()
+        Returns:
+            List of top matching articles in the requested format, one per query
+        """
+        if self.vectorizer is None or self._num_vectors() is None:
+            self.build_article_vectors()
         
-        # Get top similar articles
-        top_indices = similarities.argsort()[-top_n:][::-1]
+        snapshot = self._snapshot
+        if not snapshot.has_articles:
+            print("No articles available. Please load articles first.")
+            return [
+                self._build_results(np.array([], dtype=np.intp), np.array([]), output, snapshot)
+                for _ in queries
+            ]
         
-        # Create result dataframe
-        results = self.articles_df.iloc[top_indices].copy()
-        results['similarity'] = similarities[top_indices]
+        # Use config values if not specified
+        if top_n is None:
+            top_n = self.top_n
+        if batch_size is None:
+            batch_size = self.query_batch_size
+        if min_similarity is None:
+            min_similarity = self.min_similarity
         
-        return results[['article_id', 'title', 'category', 'tags', 'similarity']]
+        return [
+            self._build_results(top_indices, top_scores, output, snapshot)
+            for top_indices, top_scores in self._rank_queries_batch(
+                queries, top_n, batch_size, min_similarity, filters, snapshot
+            )
+        ]
     
-    def recommend_for_user(
-        self, 
+    def build_user_query(
+        self,
         user_profile: Dict[str, Any],
         food_items: List[str] = None,
-        health_status: Dict[str, Any] = None,
-        top_n: int = None
-    ) -> pd.DataFrame:
+        health_status: Dict[str, Any] = None
+    ) -> str:
         """
-        Recommend articles based on user profile, food items, and health status.
+        Build a search query from user profile, food items, and health status.
         
         Args:
             user_profile: User profile data (age, gender, etc.)
             food_items: List of food items user is interested in
             health_status: Health status metrics
-            top_n: Number of top articles to return
-            
+        
         Returns:
-            DataFrame with recommended articles
+            Combined query text
         """
-        if self.vectorizer is None or self.article_vectors is None:
-            self.build_article_vectors()
-        
-        # Use config top_n if not specified
-        if top_n is None:
-            top_n = self.top_n
-        
-        # Build query from user profile and interests
         query_parts = []
         
         # Add age-related terms
@@ -249,17 +1670,181 @@ class ArticleRecommender:
                 query_parts.append(f"nutrition for {conditions}")
         
         # Combine all query parts
-        combined_query = " ".join(query_parts)
+        return " ".join(query_parts)
+    
+    def canonical_user_query(
+        self,
+        user_profile: Dict[str, Any],
+        food_items: List[str] = None,
+        health_status: Dict[str, Any] = None
+    ) -> str:
+        """
+        Build the user query with food items and conditions in canonical order.
+        
+        Items are stripped, lowercased and sorted, so users listing the same
+        items in any order share one query. Article vectors are bag-of-words,
+        so the order does not change the results.
+        
+        Args:
+            user_profile: User profile data (age, gender, etc.)
+            food_items: List of food items user is interested in
+            health_status: Health status metrics
+        
+        Returns:
+            Combined query text
+        """
+        if food_items:
+            food_items = sorted(item.strip().lower() for item in food_items)
+        if health_status and health_status.get('conditions'):
+            health_status = dict(
+                health_status,
+                conditions=sorted(condition.strip().lower() for condition in health_status['conditions'])
+            )
+        return self.build_user_query(user_profile, food_items, health_status)
+    
+    def recommend_for_user(
+        self, 
+        user_profile: Dict[str, Any],
+        food_items: List[str] = None,
+        health_status: Dict[str, Any] = None,
+        top_n: int = None,
+        output: str = None,
+        filters: Dict[str, Any] = None
+    ) -> ArticleResults:
+        """
+        Recommend articles based on user profile, food items, and health status.
+        
+        Args:
+            user_profile: User profile data (age, gender, etc.)
+            food_items: List of food items user is interested in
+            health_status: Health status metrics
+            top_n: Number of top articles to return
+            output: Result format, one of RESULT_FORMATS (default from config)
+            filters: Optional facet filters applied before scoring (see find_similar_articles)
+        
+        Returns:
+            Recommended articles in the requested format
+        """
+        if self.vectorizer is None or self._num_vectors() is None:
+            self.build_article_vectors()
+        
+        # Use config top_n if not specified
+        if top_n is None:
+            top_n = self.top_n
+        
+        combined_query = self.canonical_user_query(user_profile, food_items, health_status)
+        
+        snapshot = self._snapshot
+        if self.result_cache is None or not snapshot.has_articles:
+            return self.find_similar_articles(combined_query, top_n, output=output, filters=filters)
+        
+        # Users in the same profile buckets share cached rankings; results are
+        # rendered per request, so callers never share a result object
+        key = (combined_query, top_n, self.min_similarity, canonical_filters(filters))
+        ranked = self.result_cache.get(key, snapshot.version)
+        if ranked is None:
+            # Find similar articles
+            ranked = self._rank_query(
+                self.preprocess_text(combined_query), top_n, self.min_similarity, filters, snapshot
+            )
+            self.result_cache.put(key, ranked, snapshot.version)
+        return self._build_results(*ranked, output, snapshot)
+    
+    def recommend_for_users(
+        self,
+        profiles: List[Dict[str, Any]],
+        top_n: int = None,
+        batch_size: int = None,
+        output: str = None,
+        filters: Dict[str, Any] = None
+    ) -> List[ArticleResults]:
+        """
+        Recommend articles for many users with batched similarity scoring.
+        
+        Users sharing a canonical query are scored once, and queries found
+        in the result cache are not scored at all.
+        
+        Args:
+            profiles: List of dictionaries with 'user_profile' and optional
+                'food_items' and 'health_status' keys
+            top_n: Number of top articles to return per user
+            batch_size: Number of queries scored per matrix product
+            output: Result format, one of RESULT_FORMATS (default from config)
+            filters: Optional facet filters applied to all users before scoring
+        
+        Returns:
+            List of recommended articles in the requested format, one per profile
+        """
+        if self.vectorizer is None or self._num_vectors() is None:
+            self.build_article_vectors()
+        
+        if top_n is None:
+            top_n = self.top_n
+        if batch_size is None:
+            batch_size = self.query_batch_size
+        
+        queries = [
+            self.canonical_user_query(
+                profile.get('user_profile', {}),
+                profile.get('food_items'),
+                profile.get('health_status')
+            )
+            for profile in profiles
+        ]
         
-        # Find similar articles
-        return self.find_similar_articles(combined_query, top_n)
+        snapshot = self._snapshot
+        if not snapshot.has_articles:
+            return self.find_similar_articles_batch(
+                queries, top_n, batch_size, output=output, filters=filters
+            )
+        
+        # Positions of each distinct query that still needs scoring
+        filter_key = canonical_filters(filters)
+        version = snapshot.version
+        ranked = [None] * len(queries)
+        pending = {}
+        for position, query in enumerate(queries):
+            if query in pending:
+                pending[query].append(position)
+                continue
+            cached = None
+            if self.result_cache is not None:
+                cached = self.result_cache.get((query, top_n, self.min_similarity, filter_key), version)
+            if cached is not None:
+                ranked[position] = cached
+            else:
+                pending[query] = [position]
+            
+        unique_queries = list(pending)
+        scored = self._rank_queries_batch(
+            unique_queries, top_n, batch_size, self.min_similarity, filters, snapshot
+        )
+        for query, query_ranked in zip(unique_queries, scored):
+            if self.result_cache is not None:
+                self.result_cache.put((query, top_n, self.min_similarity, filter_key), query_ranked, version)
+            for position in pending[query]:
+                ranked[position] = query_ranked
+            
+        return [self._build_results(indices, scores, output, snapshot) for indices, scores in ranked]
     
     def save(self, model_path: str = None) -> None:
         """
         Save the recommender model.
         
+        The model is written as a directory of plain arrays without pickle:
+        the CSR arrays of the article vectors, the vocabulary and IDF weights
+        as .npy files, the article metadata columns, and a versioned
+        manifest.json. Short text columns read by results and filters are
+        fixed-width unicode arrays, longer text such as the article content
+        is stored as UTF-8 bytes with row offsets. All arrays can be
+        memory-mapped on load.
+        
+        Files are written to a temporary sibling directory that then replaces
+        model_path, so saving over the directory the model was memory-mapped
+        from never truncates arrays that are still in use.
+        
         Args:
-            model_path: Path to save the model
+            model_path: Directory to save the model to
         """
         if model_path is None:
             model_path = self.model_path
@@ -267,29 +1852,140 @@ class ArticleRecommender:
         if model_path is None:
             raise ValueError("Model path not specified")
         
-        # Create model directory if it doesn't exist
-        create_directory(os.path.dirname(model_path))
+        if self.vectorizer is None or self._num_vectors() is None:
+            raise ValueError("No article vectors to save. Please build article vectors first.")
         
-        # Save model components
-        model_data = {
-            'vectorizer': self.vectorizer,
-            'article_vectors': self.article_vectors,
-            'articles_df': self.articles_df
-        }
+        model_path = os.path.abspath(model_path.rstrip(os.sep))
+        sibling = os.path.join(os.path.dirname(model_path), f'.{os.path.basename(model_path)}.{uuid.uuid4().hex}')
+        save_dir = sibling + '.tmp'
+        try:
+            self._write_model(save_dir)
+        except BaseException:
+            shutil.rmtree(save_dir, ignore_errors=True)
+            raise
         
-        # Save using pickle
-        import pickle
-        with open(model_path, 'wb') as f:
-            pickle.dump(model_data, f)
+        # Swap the new directory in; open memory maps keep reading the old files
+        if os.path.exists(model_path):
+            os.replace(model_path, sibling + '.old')
+            os.replace(save_dir, model_path)
+            shutil.rmtree(sibling + '.old', ignore_errors=True)
+        else:
+            os.replace(save_dir, model_path)
         
         print(f"Recommender model saved to {model_path}")
     
-    def load(self, model_path: str = None) -> None:
+    def _write_model(self, model_path: str) -> None:
+        """
+        Write all model files into an empty directory.
+        
+        Args:
+            model_path: Directory to write the model files to
+        """
+        metadata_dir = os.path.join(model_path, 'metadata')
+        create_directory(metadata_dir)
+        
+        # Save sparse article vectors as separate CSR arrays
+        article_vectors = sp.csr_matrix(self.article_vectors)
+        np.save(os.path.join(model_path, 'vectors_data.npy'), article_vectors.data)
+        np.save(os.path.join(model_path, 'vectors_indices.npy'), article_vectors.indices)
+        np.save(os.path.join(model_path, 'vectors_indptr.npy'), article_vectors.indptr)
+        np.save(os.path.join(model_path, 'removed_mask.npy'), self.removed_mask)
+        
+        # Save vocabulary ordered by feature index together with IDF weights
+        if isinstance(self.vectorizer, HashingTfidfVectorizer):
+            vectorizer_type = 'hashing'
+            vectorizer_params = self.vectorizer.get_params()
+            vectorizer_params['num_docs'] = int(self.vectorizer.num_docs)
+            np.save(os.path.join(model_path, 'doc_freq.npy'), self.vectorizer.doc_freq)
+        else:
+            vectorizer_type = 'tfidf'
+            vectorizer_params = {
+                key: (list(value) if isinstance(value, tuple) else value)
+                for key, value in self.vectorizer.get_params().items()
+                if key in VECTORIZER_PARAMS
+            }
+            vocabulary = np.array(self.vectorizer.get_feature_names_out(), dtype=str)
+            np.save(os.path.join(model_path, 'vocabulary.npy'), vocabulary)
+        np.save(os.path.join(model_path, 'idf.npy'), self.vectorizer.idf_)
+        
+        # Save BM25 statistics used to weight new articles and refit on compaction
+        bm25_params = None
+        if self.bm25 is not None:
+            bm25_params = self.bm25.get_params()
+            bm25_params['num_docs'] = int(self.bm25.num_docs)
+            bm25_params['avg_doc_length'] = self.bm25.avg_doc_length
+            np.save(os.path.join(model_path, 'bm25_idf.npy'), self.bm25.idf_)
+            np.save(os.path.join(model_path, 'bm25_doc_lengths.npy'), self.bm25.doc_lengths)
+        
+        # Save MinHash signatures so new articles can be matched against the clusters
+        dedup_params = None
+        if self.minhash is not None:
+            dedup_params = self.minhash.get_params()
+            np.save(os.path.join(model_path, 'minhash_signatures.npy'), self.minhash.signatures)
+            np.save(os.path.join(model_path, 'duplicate_clusters.npy'), self.minhash.clusters)
+        
+        # Save LSA components, embeddings and IVF clustering for dense models
+        if self.svd_components is not None:
+            np.save(os.path.join(model_path, 'svd_components.npy'), self.svd_components)
+            np.save(os.path.join(model_path, 'embeddings.npy'), self.article_embeddings)
+            if self.ann_index is not None:
+                np.save(os.path.join(model_path, 'ann_centroids.npy'), self.ann_index.centroids)
+                np.save(os.path.join(model_path, 'ann_assignments.npy'), self.ann_index.assignments)
+        
+        # Save article metadata column by column, dropping derived text columns
+        metadata_columns = []
+        utf8_columns = []
+        for col in self.articles_df.columns:
+            if col in DERIVED_TEXT_COLUMNS:
+                continue
+            values = self.articles_df[col]
+            if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+                np.save(os.path.join(metadata_dir, f'{col}.npy'), values.to_numpy(), allow_pickle=False)
+            elif col in FIXED_WIDTH_COLUMNS:
+                # Fixed-width unicode arrays can be memory-mapped, object arrays cannot
+                values = values.fillna('').astype(str).to_numpy(dtype=str)
+                np.save(os.path.join(metadata_dir, f'{col}.npy'), values, allow_pickle=False)
+            else:
+                # Padding long text to the longest row would multiply its size
+                data, offsets = encode_utf8(values)
+                np.save(os.path.join(metadata_dir, f'{col}.utf8.npy'), data, allow_pickle=False)
+                np.save(os.path.join(metadata_dir, f'{col}.offsets.npy'), offsets, allow_pickle=False)
+                utf8_columns.append(col)
+            metadata_columns.append(col)
+        
+        manifest = {
+            'format_version': MODEL_FORMAT_VERSION,
+            'model_type': self.model_type,
+            'num_articles': int(article_vectors.shape[0]),
+            'num_features': int(article_vectors.shape[1]),
+            'vectorizer_type': vectorizer_type,
+            'vectorizer': vectorizer_params,
+            'field_weights': self.field_weights,
+            'bm25': bm25_params,
+            'dedup': dedup_params,
+            'tokenizer': self.text_preprocessor.backend,
+            'metadata_columns': metadata_columns,
+            'utf8_columns': utf8_columns
+        }
+        with open(os.path.join(model_path, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+    
+    def load(self, model_path: str = None, mmap: bool = True) -> None:
         """
         Load the recommender model.
         
+        Arrays are memory-mapped read-only by default, so loading does not
+        copy the model into process memory and worker processes on one
+        machine share the same pages. Legacy single-file pickle models are
+        not loaded, since unpickling can run arbitrary code; convert trusted
+        ones with migrate_legacy_pickle.
+        
+        Queries are tokenized with the tokenizer the model was built with,
+        which raises a LookupError if it was NLTK and NLTK is unavailable.
+        
         Args:
-            model_path: Path to the saved model
+            model_path: Directory of the saved model
+            mmap: Memory-map the arrays instead of reading them into memory
         """
         if model_path is None:
             model_path = self.model_path
@@ -297,42 +1993,226 @@ class ArticleRecommender:
         if model_path is None or not os.path.exists(model_path):
             raise ValueError(f"Model path not specified or doesn't exist: {model_path}")
         
-        # Load model components
+        if os.path.isfile(model_path):
+            raise ValueError(
+                f"{model_path} is a legacy pickle model; convert it with "
+                f"ArticleRecommender.migrate_legacy_pickle if it comes from a trusted source"
+            )
+        
+        with open(os.path.join(model_path, 'manifest.json'), 'r') as f:
+            manifest = json.load(f)
+        
+        if manifest.get('format_version', 0) > MODEL_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported model format version {manifest.get('format_version')}, "
+                f"expected at most {MODEL_FORMAT_VERSION}"
+            )
+        
+        # Queries must be tokenized like the saved articles, so the recorded
+        # tokenizer is resolved before any state changes; a missing NLTK
+        # install raises a LookupError instead of silently switching to regex
+        text_preprocessor = self.text_preprocessor
+        tokenizer = manifest.get('tokenizer')
+        if tokenizer and tokenizer != text_preprocessor.tokenizer:
+            if text_preprocessor.tokenizer != 'auto':
+                print(
+                    f"Warning: model was built with the '{tokenizer}' tokenizer, "
+                    f"using it instead of the configured '{text_preprocessor.tokenizer}'"
+                )
+            text_preprocessor = self._create_text_preprocessor(tokenizer)
+            text_preprocessor.resolve()
+        
+        mmap_mode = 'r' if mmap else None
+        
+        def load_array(*parts):
+            return np.load(os.path.join(model_path, *parts), mmap_mode=mmap_mode, allow_pickle=False)
+        
+        # Rebuild the sparse matrix on top of the (memory-mapped) CSR arrays
+        self.article_vectors = sp.csr_matrix(
+            (load_array('vectors_data.npy'), load_array('vectors_indices.npy'), load_array('vectors_indptr.npy')),
+            shape=(manifest['num_articles'], manifest['num_features']),
+            copy=False
+        )
+        self.removed_mask = np.load(os.path.join(model_path, 'removed_mask.npy'), allow_pickle=False)
+        
+        # Rebuild the vectorizer from its parameters, vocabulary and IDF weights
+        vectorizer_params = manifest['vectorizer']
+        if manifest.get('vectorizer_type', 'tfidf') == 'hashing':
+            num_docs = vectorizer_params.pop('num_docs')
+            vectorizer_params['dtype'] = np.dtype(vectorizer_params['dtype']).type
+            self.vectorizer = HashingTfidfVectorizer(**vectorizer_params)
+            self.vectorizer.doc_freq = np.load(os.path.join(model_path, 'doc_freq.npy'))
+            self.vectorizer.num_docs = num_docs
+        else:
+            if 'ngram_range' in vectorizer_params:
+                vectorizer_params['ngram_range'] = tuple(vectorizer_params['ngram_range'])
+            vocabulary = load_array('vocabulary.npy')
+            self.vectorizer = TfidfVectorizer(
+                vocabulary={term: i for i, term in enumerate(vocabulary.tolist())},
+                **vectorizer_params
+            )
+        self.vectorizer.idf_ = np.array(load_array('idf.npy'))
+        # New articles must be vectorized with the field weights of the saved model
+        self.field_weights = manifest.get('field_weights')
+        
+        self.text_preprocessor = text_preprocessor
+        
+        # Restore BM25 statistics without recounting
+        self.bm25 = None
+        bm25_params = manifest.get('bm25')
+        if bm25_params:
+            num_docs = bm25_params.pop('num_docs')
+            avg_doc_length = bm25_params.pop('avg_doc_length')
+            self.bm25 = BM25Weighter(**bm25_params)
+            self.bm25.num_docs = num_docs
+            self.bm25.avg_doc_length = avg_doc_length
+            self.bm25.idf_ = np.array(load_array('bm25_idf.npy'))
+            self.bm25.doc_lengths = np.array(load_array('bm25_doc_lengths.npy'))
+        
+        # Restore near-duplicate clusters without clustering again
+        self.minhash = None
+        if manifest.get('dedup'):
+            self.minhash = MinHashLSH(**manifest['dedup'])
+            self.minhash.set_state(
+                np.array(load_array('minhash_signatures.npy')), load_array('duplicate_clusters.npy')
+            )
+        self._update_duplicates()
+        
+        # Article metadata is only materialized as a DataFrame on first access
+        utf8_columns = set(manifest.get('utf8_columns', []))
+        self._metadata_columns = {
+            col: (
+                Utf8Column(load_array('metadata', f'{col}.utf8.npy'), load_array('metadata', f'{col}.offsets.npy'))
+                if col in utf8_columns else load_array('metadata', f'{col}.npy')
+            )
+            for col in manifest['metadata_columns']
+        }
+        self._articles_df = None
+        self._rows_changed = 0
+        self.build_inverted_index()
+        
+        # Restore dense embeddings and the IVF index without refitting
+        self.model_type = manifest.get('model_type', 'tfidf')
+        self.svd_components = None
+        self.article_embeddings = None
+        self.ann_index = None
+        if os.path.exists(os.path.join(model_path, 'svd_components.npy')):
+            self.svd_components = np.array(load_array('svd_components.npy'))
+            self.article_embeddings = load_array('embeddings.npy')
+            if os.path.exists(os.path.join(model_path, 'ann_centroids.npy')):
+                self.ann_index = IVFIndex(
+                    nlist=self.ann_config.get('nlist', 0),
+                    nprobe=self.ann_config.get('nprobe', 8),
+                    n_iter=self.ann_config.get('n_iter', 20)
+                )
+                self.ann_index.centroids = np.array(load_array('ann_centroids.npy'))
+                self.ann_index.set_assignments(load_array('ann_assignments.npy'))
+        self.build_sharded_index()
+        self._invalidate_results()
+        
+        print(f"Recommender model loaded from {model_path}")
+    
+    @classmethod
+    def migrate_legacy_pickle(
+        cls,
+        src: str,
+        dst: str,
+        config_path: Optional[str] = None
+    ) -> 'ArticleRecommender':
+        """
+        Convert a legacy single-file pickle model to the directory format.
+        
+        Unpickling can run arbitrary code, so only migrate trusted files.
+        
+        Args:
+            src: Path to the legacy pickle file
+            dst: Directory to save the converted model to
+            config_path: Optional path to configuration file
+            
+        Returns:
+            Recommender loaded from the pickle file
+        """
+        recommender = cls(config_path)
+        recommender._load_legacy_pickle(src)
+        recommender.save(dst)
+        return recommender
+    
+    def _load_legacy_pickle(self, model_path: str) -> None:
+        """
+        Load a model saved in the legacy single-file pickle format.
+        
+        Args:
+            model_path: Path to the pickle file
+        """
+        print(f"Warning: unpickling legacy model {model_path}, only do this for trusted files")
+        
         import pickle
         with open(model_path, 'rb') as f:
             model_data = pickle.load(f)
         
         self.vectorizer = model_data['vectorizer']
         self.article_vectors = model_data['article_vectors']
+        self.bm25 = None
+        self.minhash = None
         self.articles_df = model_data['articles_df']
+        self.removed_mask = model_data.get('removed_mask')
+        if self.removed_mask is None:
+            self.removed_mask = np.zeros(self.article_vectors.shape[0], dtype=bool)
+        self._rows_changed = 0
+        self._update_duplicates()
+        self._build_indexes()
+        self._invalidate_results()
         
         print(f"Recommender model loaded from {model_path}")
 
-def create_sample_article_dataset(output_path: str, num_articles: int = 100) -> None:
+def create_sample_article_dataset(
+    output_path: str,
+    num_articles: int = 100,
+    seed: Optional[int] = None,
+    chunk_size: int = 100000,
+    vocabulary_size: int = 0,
+    zipf_exponent: float = 1.1,
+    mean_content_words: int = 120
+) -> None:
     """
     Create a sample dataset of nutrition articles for testing.
     
+    Columns are drawn in bulk per chunk from one seeded generator and each
+    chunk is appended to the output file, so memory stays bounded for
+    million-article corpora. Files ending in '.parquet' are written as
+    Parquet (requires pyarrow), others as CSV.
+    
+    By default content is made of 4 to 8 topic snippets. With a
+    vocabulary_size, content is a topic snippet followed by words drawn
+    from a Zipfian distribution over a vocabulary of that size, with
+    log-normally distributed lengths, to mimic realistic term statistics.
+    
     Args:
         output_path: Path to save the sample dataset
         num_articles: Number of sample articles to generate
+        seed: Random seed (None for a random dataset)
+        chunk_size: Number of articles generated and written at a time
+        vocabulary_size: Size of the Zipfian content vocabulary (0 uses snippet content)
+        zipf_exponent: Exponent s of the word rank distribution p(rank) ~ 1 / rank^s
+        mean_content_words: Mean number of Zipfian words per article
     """
     # Define sample categories and tags
-    categories = [
+    categories = np.array([
         'Nutrition Basics', 'Weight Management', 'Healthy Recipes',
         'Dietary Supplements', 'Disease Prevention', 'Sports Nutrition',
         'Age-specific Nutrition', 'Food Science'
-    ]
+    ], dtype=object)
     
-    tags = [
+    tags = np.array([
         'protein', 'carbohydrates', 'fats', 'vitamins', 'minerals',
         'weight loss', 'weight gain', 'muscle building', 'diabetes',
         'heart health', 'gut health', 'immune system', 'energy',
         'metabolism', 'vegetarian', 'vegan', 'keto', 'paleo',
         'mediterranean', 'children', 'teenagers', 'adults', 'seniors'
-    ]
+    ], dtype=object)
     
     # Sample titles and content snippets
-    titles = [
+    titles = np.array([
         "The Role of Protein in Muscle Development",
         "Understanding Carbohydrates: Good vs. Bad",
         "Healthy Fats for Heart Health",
@@ -351,9 +2231,9 @@ def create_sample_article_dataset(output_path: str, num_articles: int = 100) ->
         "Teenage Nutrition: Supporting Growth and Development",
         "Adult Nutrition: Maintaining Health Through Middle Age",
         "Senior Nutrition: Dietary Needs for Aging Well"
-    ]
+    ], dtype=object)
     
-    content_snippets = [
+    content_snippets = np.array([
         "Protein is an essential macronutrient that plays a crucial role in muscle development and repair.",
         "Carbohydrates are the body's main source of energy, but choosing the right types is important.",
         "Not all fats are created equal. Healthy fats are essential for hormone production and cell health.",
@@ -372,57 +2252,97 @@ def create_sample_article_dataset(output_path: str, num_articles: int = 100) ->
         "Teenage years are characterized by rapid growth and development, requiring increased caloric and nutrient intake.",
         "Adult nutrition focuses on maintaining health and preventing chronic diseases.",
         "As we age, our nutritional needs change, often requiring increased protein and certain vitamins."
-    ]
-    
-    # Generate sample articles
-    articles = []
-    for i in range(num_articles):
-        # Select random title and content
-        title_idx = np.random.randint(0, len(titles))
-        content_idx = np.random.randint(0, len(content_snippets))
-        
-        # Add some randomization to titles
-        title = titles[title_idx]
-        if np.random.random() > 0.5:
-            title += f": Part {np.random.randint(1, 5)}"
-        
-        # Generate longer content
-        content = content_snippets[content_idx]
-        for _ in range(np.random.randint(3, 8)):
-            content += " " + content_snippets[np.random.randint(0, len(content_snippets))]
-        
-        # Select random category and tags
-        category = np.random.choice(categories)
-        num_tags = np.random.randint(2, 6)
-        article_tags = ", ".join(np.random.choice(tags, size=num_tags, replace=False))
-        
-        # Generate random date in the last 2 years
-        year = np.random.randint(2022, 2024)
-        month = np.random.randint(1, 13)
-        day = np.random.randint(1, 29)
-        date = f"{year}-{month:02d}-{day:02d}"
-        
-        # Create article object
-        article = {
-            'article_id': i + 1,
-            'title': title,
-            'content': content,
-            'category': category,
-            'tags': article_tags,
-            'author': f"Author {np.random.randint(1, 10)}",
-            'date': date
-        }
-        
-        articles.append(article)
+    ], dtype=object)
+    
+    title_suffixes = np.array(['', ': Part 1', ': Part 2', ': Part 3', ': Part 4'], dtype=object)
+    authors = np.array([f"Author {i}" for i in range(1, 10)], dtype=object)
     
-    # Create DataFrame and save to CSV
-    articles_df = pd.DataFrame(articles)
+    rng = np.random.default_rng(seed)
+    
+    if vocabulary_size > 0:
+        # Topic words are the most frequent ranks, synthetic words fill the long tail
+        topic_words = list(dict.fromkeys(
+            ' '.join(list(titles) + list(content_snippets) + list(tags)).lower()
+            .replace(',', ' ').replace('.', ' ').replace(':', ' ').split()
+        ))
+        syllables = np.array(['ka', 'lo', 'mi', 'nu', 'ra', 'se', 'ti', 'vo', 'ze', 'pa'], dtype=object)
+        num_synthetic = max(0, vocabulary_size - len(topic_words))
+        synthetic = syllables[rng.integers(0, len(syllables), size=(num_synthetic, 4))].sum(axis=1)
+        vocabulary = np.array(
+            (topic_words + [f"{word}{i}" for i, word in enumerate(synthetic)])[:vocabulary_size],
+            dtype=object
+        )
+        word_probabilities = 1.0 / np.arange(1, len(vocabulary) + 1) ** zipf_exponent
+        word_probabilities /= word_probabilities.sum()
     
     # Create directory if it doesn't exist
     create_directory(os.path.dirname(output_path))
     
-    # Save to CSV
-    articles_df.to_csv(output_path, index=False)
+    parquet_writer = None
+    is_parquet = output_path.endswith('.parquet')
+    if is_parquet:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    
+    try:
+        for start in range(0, num_articles, chunk_size):
+            n = min(chunk_size, num_articles - start)
+            
+            # Titles with an optional part number
+            title = titles[rng.integers(0, len(titles), size=n)] + np.where(
+                rng.random(n) > 0.5, title_suffixes[rng.integers(1, 5, size=n)], ''
+            )
+            
+            # 4 to 8 snippets per article, or one snippet followed by Zipfian words
+            snippet_ids = rng.integers(0, len(content_snippets), size=(n, 8))
+            content = content_snippets[snippet_ids[:, 0]]
+            if vocabulary_size > 0:
+                # Log-normal lengths; mu is shifted by sigma^2 / 2 so the mean is mean_content_words
+                lengths = np.maximum(
+                    1, rng.lognormal(np.log(mean_content_words) - 0.125, 0.5, size=n).astype(np.int64)
+                )
+                words = vocabulary[rng.choice(len(vocabulary), size=int(lengths.sum()), p=word_probabilities)]
+                content = content + ' ' + np.array(
+                    [' '.join(row) for row in np.split(words, np.cumsum(lengths)[:-1])], dtype=object
+                )
+            else:
+                num_snippets = rng.integers(4, 9, size=n)
+                for j in range(1, 8):
+                    content = content + np.where(
+                        j < num_snippets, ' ' + content_snippets[snippet_ids[:, j]], ''
+                    )
+            
+            # 2 to 5 distinct tags: the first columns of a random permutation per row
+            tag_ids = np.argsort(rng.random((n, len(tags))), axis=1)[:, :5]
+            num_tags = rng.integers(2, 6, size=n)
+            article_tags = tags[tag_ids[:, 0]]
+            for j in range(1, 5):
+                article_tags = article_tags + np.where(j < num_tags, ', ' + tags[tag_ids[:, j]], '')
+            
+            # Random dates in the last 2 years
+            dates = np.datetime64('2022-01-01') + rng.integers(0, 730, size=n).astype('timedelta64[D]')
+            
+            chunk = pd.DataFrame({
+                'article_id': np.arange(start + 1, start + n + 1),
+                'title': title,
+                'content': content,
+                'category': categories[rng.integers(0, len(categories), size=n)],
+                'tags': article_tags,
+                'author': authors[rng.integers(0, len(authors), size=n)],
+                'date': np.datetime_as_string(dates, unit='D')
+            })
+            
+            if is_parquet:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if parquet_writer is None:
+                    parquet_writer = pq.ParquetWriter(output_path, table.schema)
+                parquet_writer.write_table(table)
+            else:
+                chunk.to_csv(output_path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
+    
     print(f"Sample article dataset with {num_articles} articles saved to {output_path}")
 
 # Sample usage demonstration
@@ -8,9 +8,11 @@ using deep learning models trained on the UTKFace dataset.
 import os
 import cv2
 import numpy as np
+import pandas as pd
 import tensorflow as tf
 from tensorflow.keras import layers, models
-from typing import Dict, List, Tuple, Union, Optional
+from sklearn.model_selection import train_test_split
+from typing import Any, Callable, Dict, List, Tuple, Union, Optional
 
 # Import common utilities
 from utils.common import (
@@ -19,8 +21,14 @@ from utils.common import (
     save_model, 
     load_model, 
     plot_training_history,
-    convert_to_tflite
+    convert_to_tflite,
+    get_tflite_quantization
 )
+from utils.data_processing import create_age_gender_dataset, create_representative_dataset
+from utils.tflite_inference import TFLiteModel
+
+# Age/gender inference backends: Keras models or converted TFLite models
+INFERENCE_BACKENDS = ('keras', 'tflite')
 
 class FaceDetector:
     """Face detector and age/gender classifier for nutritional recommendations."""
@@ -38,8 +46,20 @@ class FaceDetector:
         
         # Set default configurations if not provided
         self.face_detection_model = self.config.get('face_detection_model', 'haarcascade')
-        self.age_model_path = self.config.get('age_model_path', None)
-        self.gender_model_path = self.config.get('gender_model_path', None)
+        self.inference_backend = self.config.get('inference_backend', 'keras')
+        if self.inference_backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"Unknown inference backend: {self.inference_backend}. Options: {INFERENCE_BACKENDS}")
+        self.tflite_num_threads = self.config.get('tflite_num_threads', None)
+        
+        # The TFLite backend loads the converted models from the tflite_* paths
+        prefix = 'tflite_' if self.inference_backend == 'tflite' else ''
+        self.age_model_path = self.config.get(f'{prefix}age_model_path', None)
+        self.gender_model_path = self.config.get(f'{prefix}gender_model_path', None)
+        self.age_gender_model_path = self.config.get(f'{prefix}age_gender_model_path', None)
+        self.inference_batch_size = self.config.get('inference_batch_size', 32)
+        
+        # Traced inference functions per model, keyed by id(model)
+        self._inference_functions = {}
         
         # Initialize face detector
         self._init_face_detector()
@@ -49,10 +69,39 @@ class FaceDetector:
         self.gender_model = None
         
         if self.age_model_path and os.path.exists(self.age_model_path):
-            self.age_model = load_model(self.age_model_path)
+            self.age_model = self._load_model(self.age_model_path)
         
         if self.gender_model_path and os.path.exists(self.gender_model_path):
-            self.gender_model = load_model(self.gender_model_path)
+            self.gender_model = self._load_model(self.gender_model_path)
+        
+        # A fused model from build_age_gender_model predicts both in one pass
+        # and takes precedence over the separate models
+        self.age_gender_model = None
+        if self.age_gender_model_path and os.path.exists(self.age_gender_model_path):
+            self.age_gender_model = self._load_model(self.age_gender_model_path)
+        
+        # Trace the inference functions now so the first image is not slow
+        if self.config.get('warmup', True):
+            self.warmup()
+    
+    def _load_model(self, model_path: str) -> Union[tf.keras.Model, TFLiteModel]:
+        """
+        Load an age/gender model for the configured inference backend.
+        
+        Args:
+            model_path: Path to a saved Keras model or a .tflite file
+            
+        Returns:
+            Keras model, or TFLite model with tensors preallocated for
+            inference_batch_size faces
+        """
+        if self.inference_backend == 'tflite':
+            return TFLiteModel(
+                model_path,
+                num_threads=self.tflite_num_threads,
+                batch_size=self.inference_batch_size
+            )
+        return load_model(model_path)
     
     def _init_face_detector(self) -> None:
         """Initialize the face detection model based on configuration."""
@@ -97,6 +146,28 @@ class FaceDetector:
         
         return face_images
     
+    def preprocess_faces(self, faces: List[np.ndarray], target_size: Tuple[int, int] = (200, 200)) -> np.ndarray:
+        """
+        Preprocess face images into one batch for age/gender prediction.
+        
+        Each face is resized once into a shared uint8 buffer, then the whole
+        batch is converted to RGB and normalized in single array operations.
+        
+        Args:
+            faces: Face images (BGR format)
+            target_size: Target size for resizing (width, height)
+            
+        Returns:
+            Batch of preprocessed faces with shape (len(faces), height, width, 3)
+        """
+        width, height = target_size
+        batch = np.empty((len(faces), height, width, 3), dtype=np.uint8)
+        for i, face in enumerate(faces):
+            cv2.resize(face, target_size, dst=batch[i])
+        
+        # Convert BGR to RGB and normalize pixel values to [0, 1]
+        return batch[..., ::-1].astype(np.float32) / 255.0
+    
     def preprocess_face(self, face: np.ndarray, target_size: Tuple[int, int] = (200, 200)) -> np.ndarray:
         """
         Preprocess a face image for age/gender prediction.
@@ -106,45 +177,152 @@ class FaceDetector:
             target_size: Target size for resizing
             
         Returns:
-            Preprocessed face image
+            Preprocessed face image with a batch dimension
         """
-        # Resize to target size
-        face_resized = cv2.resize(face, target_size)
+        return self.preprocess_faces([face], target_size)
+    
+    def _inference_function(self, model: Union[tf.keras.Model, TFLiteModel]) -> Callable:
+        """
+        Get the traced inference function of a model.
         
-        # Convert to RGB (if model was trained on RGB)
-        face_rgb = cv2.cvtColor(face_resized, cv2.COLOR_BGR2RGB)
+        The model is wrapped in a tf.function with a fixed input signature
+        and called directly with training=False, which skips the data
+        adapter and callback setup that predict and predict_on_batch run on
+        every call. The batch dimension is left unspecified, so one trace
+        serves every batch size. TFLite models are called as they are.
         
-        # Normalize pixel values to [0, 1]
-        face_normalized = face_rgb / 255.0
+        Args:
+            model: Age, gender or fused age/gender model
+            
+        Returns:
+            Function mapping a float32 batch to the model outputs
+        """
+        if isinstance(model, TFLiteModel):
+            return model
         
-        # Add batch dimension
-        face_batch = np.expand_dims(face_normalized, axis=0)
+        cached = self._inference_functions.get(id(model))
+        if cached is not None and cached[0] is model:
+            return cached[1]
         
-        return face_batch
+        function = tf.function(
+            lambda batch: model(batch, training=False),
+            input_signature=[tf.TensorSpec(shape=(None,) + tuple(model.input_shape[1:]), dtype=tf.float32)]
+        )
+        self._inference_functions[id(model)] = (model, function)
+        return function
     
-    def predict_age(self, face: np.ndarray) -> int:
+    def warmup(self) -> None:
+        """Trace the inference function of every loaded model with a single image."""
+        for model in (self.age_model, self.gender_model, self.age_gender_model):
+            if model is not None:
+                self._inference_function(model)(
+                    np.zeros((1,) + tuple(model.input_shape[1:]), dtype=np.float32)
+                )
+    
+    def _predict_batch(
+        self,
+        model: Union[tf.keras.Model, TFLiteModel],
+        batch: np.ndarray
+    ) -> Union[np.ndarray, Dict[str, np.ndarray]]:
         """
-        Predict age from a face image.
+        Run a model on a batch of preprocessed faces.
+        
+        The model runs through its traced inference function, and batches
+        larger than inference_batch_size are split to bound memory.
         
         Args:
-            face: Face image
+            model: Age, gender or fused age/gender model
+            batch: Batch of preprocessed faces
             
         Returns:
-            Predicted age
+            First model output per face, or a dictionary of them per output
+            name for the fused model
+        """
+        function = self._inference_function(model)
+        outputs = [
+            function(batch[start:start + self.inference_batch_size])
+            for start in range(0, len(batch), self.inference_batch_size)
+        ]
+        if isinstance(outputs[0], dict):
+            return {
+                name: np.concatenate([np.asarray(output[name]) for output in outputs])[:, 0]
+                for name in outputs[0]
+            }
+        return np.concatenate([np.asarray(output) for output in outputs])[:, 0]
+    
+    @staticmethod
+    def _to_ages(predictions: np.ndarray) -> List[int]:
+        """
+        Convert age model outputs to ages, rounded to the nearest integer.
+        
+        Args:
+            predictions: Age model output per face
+            
+        Returns:
+            Predicted age per face
+        """
+        return [int(round(age)) for age in predictions]
+    
+    @staticmethod
+    def _to_genders(predictions: np.ndarray) -> List[str]:
+        """
+        Convert gender model outputs to labels.
+        
+        Args:
+            predictions: Gender model output per face
+            
+        Returns:
+            Predicted gender per face ("male" or "female")
+        """
+        return ["male" if gender > 0.5 else "female" for gender in predictions]
+    
+    def predict_ages(self, batch: np.ndarray) -> List[int]:
         """
+        Predict ages for a batch of preprocessed faces.
+        
+        Args:
+            batch: Batch from preprocess_faces
+            
+        Returns:
+            Predicted age per face
+        """
+        if self.age_gender_model is not None:
+            return self._to_ages(self._predict_batch(self.age_gender_model, batch)['age'])
+        
         if self.age_model is None:
             raise ValueError("Age model not loaded. Please provide a valid model path.")
         
-        # Preprocess face
-        face_processed = self.preprocess_face(face)
+        return self._to_ages(self._predict_batch(self.age_model, batch))
+    
+    def predict_genders(self, batch: np.ndarray) -> List[str]:
+        """
+        Predict genders for a batch of preprocessed faces.
         
-        # Predict age
-        age_pred = self.age_model.predict(face_processed)[0][0]
+        Args:
+            batch: Batch from preprocess_faces
+            
+        Returns:
+            Predicted gender per face ("male" or "female")
+        """
+        if self.age_gender_model is not None:
+            return self._to_genders(self._predict_batch(self.age_gender_model, batch)['gender'])
         
-        # Round to nearest integer
-        age = int(round(age_pred))
+        if self.gender_model is None:
+            raise ValueError("Gender model not loaded. Please provide a valid model path.")
         
-        return age
+        return self._to_genders(self._predict_batch(self.gender_model, batch))
+    
+    def predict_age(self, face: np.ndarray) -> int:
+        """
+        Predict age from a face image.
+        
+        Args:
+            face: Face image
+            
+        Returns:
+            Predicted age
+        """
+        return self.predict_ages(self.preprocess_face(face))[0]
     
     def predict_gender(self, face: np.ndarray) -> str:
         """
@@ -156,19 +334,50 @@ class FaceDetector:
         Returns:
             Predicted gender ("male" or "female")
         """
-        if self.gender_model is None:
-            raise ValueError("Gender model not loaded. Please provide a valid model path.")
+        return self.predict_genders(self.preprocess_face(face))[0]
+    
+    def analyze_faces(self, faces: List[np.ndarray]) -> List[Dict[str, Union[int, str]]]:
+        """
+        Analyze face images to determine age and gender.
+        
+        All faces are preprocessed once into a single batch shared by both
+        models, and each model runs one forward pass over the batch. With a
+        fused age/gender model, one forward pass predicts both.
         
-        # Preprocess face
-        face_processed = self.preprocess_face(face)
+        Args:
+            faces: Face images
+            
+        Returns:
+            Dictionary with age and gender predictions per face
+        """
+        results = [{} for _ in faces]
+        if not faces or (
+            self.age_gender_model is None and self.age_model is None and self.gender_model is None
+        ):
+            return results
+        
+        batch = self.preprocess_faces(faces)
+        
+        if self.age_gender_model is not None:
+            predictions = self._predict_batch(self.age_gender_model, batch)
+            for result, age, gender in zip(
+                results, self._to_ages(predictions['age']), self._to_genders(predictions['gender'])
+            ):
+                result['age'] = age
+                result['gender'] = gender
+            return results
         
-        # Predict gender
-        gender_pred = self.gender_model.predict(face_processed)[0][0]
+        # Predict age if model is available
+        if self.age_model is not None:
+            for result, age in zip(results, self.predict_ages(batch)):
+                result['age'] = age
         
-        # Convert to label
-        gender = "male" if gender_pred > 0.5 else "female"
+        # Predict gender if model is available
+        if self.gender_model is not None:
+            for result, gender in zip(results, self.predict_genders(batch)):
+                result['gender'] = gender
         
-        return gender
+        return results
     
     def analyze_face(self, face: np.ndarray) -> Dict[str, Union[int, str]]:
         """
@@ -180,17 +389,7 @@ class FaceDetector:
         Returns:
             Dictionary with age and gender predictions
         """
-        result = {}
-        
-        # Predict age if model is available
-        if self.age_model is not None:
-            result['age'] = self.predict_age(face)
-        
-        # Predict gender if model is available
-        if self.gender_model is not None:
-            result['gender'] = self.predict_gender(face)
-        
-        return result
+        return self.analyze_faces([face])[0]
     
     def process_image(self, image: np.ndarray) -> List[Dict[str, Union[int, str, np.ndarray]]]:
         """
@@ -205,12 +404,10 @@ class FaceDetector:
         # Detect faces
         faces = self.detect_faces(image)
         
-        # Analyze each face
-        results = []
-        for face in faces:
-            result = self.analyze_face(face)
+        # Analyze all faces in one batch
+        results = self.analyze_faces(faces)
+        for result, face in zip(results, faces):
             result['face_image'] = face
-            results.append(result)
         
         return results
 
@@ -329,6 +526,145 @@ def build_gender_model(input_shape: Tuple[int, int, int] = (200, 200, 3)) -> tf.
     
     return model
 
+def build_age_gender_model(
+    input_shape: Tuple[int, int, int] = (200, 200, 3),
+    learning_rate: float = 0.001,
+    age_loss_weight: float = 0.01
+) -> tf.keras.Model:
+    """
+    Build a multi-task CNN predicting age and gender from a shared backbone.
+    
+    The convolutional blocks of build_age_model are computed once per face
+    and feed an age regression head and a gender classification head with
+    the dense layers of the separate models, so a face is convolved once
+    instead of twice.
+    
+    Args:
+        input_shape: Input image shape
+        learning_rate: Adam learning rate
+        age_loss_weight: Weight of the age MSE, which is measured in squared
+            years and would otherwise dominate the gender cross-entropy
+            
+    Returns:
+        Model with 'age' and 'gender' outputs
+    """
+    inputs = layers.Input(shape=input_shape)
+    
+    # Shared convolutional backbone
+    x = inputs
+    for filters in (32, 64, 128, 256):
+        x = layers.Conv2D(filters, (3, 3), activation='relu', padding='same')(x)
+        x = layers.BatchNormalization()(x)
+        x = layers.MaxPooling2D((2, 2))(x)
+        x = layers.Dropout(0.25)(x)
+    features = layers.Flatten()(x)
+    
+    # Age head (regression)
+    age = features
+    for units in (256, 128, 64):
+        age = layers.Dense(units, activation='relu')(age)
+        age = layers.BatchNormalization()(age)
+        age = layers.Dropout(0.5)(age)
+    age = layers.Dense(1, name='age')(age)
+    
+    # Gender head (binary classification)
+    gender = features
+    for units in (128, 64):
+        gender = layers.Dense(units, activation='relu')(gender)
+        gender = layers.BatchNormalization()(gender)
+        gender = layers.Dropout(0.5)(gender)
+    gender = layers.Dense(1, activation='sigmoid', name='gender')(gender)
+    
+    model = models.Model(inputs=inputs, outputs={'age': age, 'gender': gender})
+    
+    # Compile model
+    model.compile(
+        optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate),
+        loss={'age': 'mse', 'gender': 'binary_crossentropy'},
+        loss_weights={'age': age_loss_weight, 'gender': 1.0},
+        metrics={'age': ['mae'], 'gender': ['accuracy']}
+    )
+    
+    return model
+
+def train_age_gender_model(
+    metadata: pd.DataFrame,
+    input_shape: Tuple[int, int, int] = (200, 200, 3),
+    epochs: int = 50,
+    batch_size: int = 32,
+    learning_rate: float = 0.001,
+    age_loss_weight: float = 0.01,
+    validation_split: float = 0.2,
+    early_stopping_patience: int = 10,
+    save_path: Optional[str] = None,
+    tflite_save_path: Optional[str] = None,
+    tflite_config: Optional[Dict[str, Any]] = None,
+    seed: int = 42
+) -> Tuple[tf.keras.Model, tf.keras.callbacks.History]:
+    """
+    Train the multi-task age/gender model on UTKFace metadata.
+    
+    Args:
+        metadata: DataFrame from process_utk_face_dataset with path, age and gender columns
+        input_shape: Input image shape
+        epochs: Maximum number of epochs
+        batch_size: Batch size
+        learning_rate: Adam learning rate
+        age_loss_weight: Weight of the age loss relative to the gender loss
+        validation_split: Fraction of images used for validation
+        early_stopping_patience: Epochs without validation improvement before stopping
+        save_path: Optional path to save the trained model
+        tflite_save_path: Optional path to save the model converted to TFLite
+        tflite_config: tflite_conversion section of the model configuration
+            selecting the quantization of the TFLite model; int8 models are
+            calibrated on representative_samples training images
+        seed: Random seed for the split and shuffling
+        
+    Returns:
+        Tuple of (trained model, training history)
+    """
+    metadata = metadata[metadata['gender'].isin(['male', 'female'])]
+    train_df, val_df = train_test_split(
+        metadata, test_size=validation_split, random_state=seed, stratify=metadata['gender']
+    )
+    
+    target_size = (input_shape[1], input_shape[0])
+    train_dataset = create_age_gender_dataset(train_df, target_size, batch_size, shuffle=True, seed=seed)
+    val_dataset = create_age_gender_dataset(val_df, target_size, batch_size, shuffle=False)
+    
+    model = build_age_gender_model(input_shape, learning_rate, age_loss_weight)
+    history = model.fit(
+        train_dataset,
+        validation_data=val_dataset,
+        epochs=epochs,
+        callbacks=[
+            tf.keras.callbacks.EarlyStopping(
+                monitor='val_loss',
+                patience=early_stopping_patience,
+                restore_best_weights=True
+            )
+        ]
+    )
+    
+    if save_path:
+        save_model(model, save_path)
+    
+    if tflite_save_path:
+        tflite_config = tflite_config or {}
+        quantization = get_tflite_quantization(tflite_config)
+        representative_dataset = None
+        if quantization == 'int8':
+            representative_dataset = create_representative_dataset(
+                train_dataset, tflite_config.get('representative_samples', 100)
+            )
+        convert_to_tflite(
+            model, tflite_save_path,
+            quantization=quantization,
+            representative_dataset=representative_dataset
+        )
+    
+    return model, history
+
 # Sample usage demonstration
 if __name__ == "__main__":
     # Example of how to use the face detection module
@@ -343,6 +679,10 @@ if __name__ == "__main__":
     gender_model = build_gender_model()
     print(gender_model.summary())
     
+    print("\nBuilding sample multi-task age/gender model...")
+    age_gender_model = build_age_gender_model()
+    print(age_gender_model.summary())
+    
     # Note: Training would require the UTKFace dataset
     print("\nTo train these models, you'll need the UTKFace dataset.")
     print("See README.md for instructions on dataset preparation.") 
\ No newline at end of file
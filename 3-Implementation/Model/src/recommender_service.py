@@ -0,0 +1,458 @@
+"""
+Asynchronous recommendation service for NutriGenius.
+
+This module serves ArticleRecommender over HTTP with the asyncio standard
+library only. The model is loaded once per process, and concurrent requests
+that arrive within a short window are micro-batched into one batched
+similarity computation, so the event loop never blocks on scoring.
+
+Endpoints:
+    POST /recommend  JSON body with 'user_profile' and optional 'food_items',
+                     'health_status', 'top_n' and 'filters'
+    GET  /metrics    Request and batch counts, p50/p99 latency and queue depth
+    GET  /health     Liveness check
+
+Usage:
+    python recommender_service.py --model-path ../models/article_recommender --port 8080
+"""
+
+import json
+import time
+import asyncio
+import argparse
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from article_recommender import ArticleRecommender, ArticleResults
+from utils.facets import canonical_filters
+
+# Default largest request body accepted by the HTTP handler
+MAX_BODY_BYTES = 1024 * 1024
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+                500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+class ServiceMetrics:
+    """Request latencies over a sliding window and batch and queue counters."""
+
+    def __init__(self, latency_window: int = 10000):
+        """
+        Initialize the metrics.
+
+        Args:
+            latency_window: Number of most recent request latencies kept for percentiles
+        """
+        self.latencies = deque(maxlen=latency_window)
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.max_queue_depth = 0
+
+    def record_batch(self, size: int) -> None:
+        """
+        Record a scored batch.
+
+        Args:
+            size: Number of requests in the batch
+        """
+        self.batches += 1
+        self.batched_requests += size
+
+    def record_request(self, latency: float, failed: bool = False) -> None:
+        """
+        Record a finished request.
+
+        Args:
+            latency: Seconds from arrival to result, including queueing
+            failed: Whether the request ended with an error
+        """
+        self.requests += 1
+        if failed:
+            self.errors += 1
+        self.latencies.append(latency)
+
+    def snapshot(self, queue_depth: int) -> Dict[str, Any]:
+        """
+        Get the current metrics.
+
+        Args:
+            queue_depth: Requests currently waiting to be batched
+
+        Returns:
+            Dictionary of JSON-serializable metrics
+        """
+        self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+        p50, p99 = (
+            np.percentile(self.latencies, [50, 99]) * 1000 if self.latencies else (0.0, 0.0)
+        )
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'rejected': self.rejected,
+            'batches': self.batches,
+            'avg_batch_size': self.batched_requests / self.batches if self.batches else 0.0,
+            'latency_p50_ms': float(p50),
+            'latency_p99_ms': float(p99),
+            'queue_depth': queue_depth,
+            'max_queue_depth': self.max_queue_depth
+        }
+
+class RecommendationService:
+    """Micro-batching asyncio front end for a loaded ArticleRecommender."""
+
+    def __init__(
+        self,
+        recommender: ArticleRecommender,
+        batch_window_ms: float = 5.0,
+        max_batch_size: int = 64,
+        max_queue_size: int = 1024,
+        latency_window: int = 10000,
+        max_body_bytes: int = MAX_BODY_BYTES
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            recommender: Recommender with articles loaded and vectors built
+            batch_window_ms: Time to wait for more requests after the first one of a batch
+            max_batch_size: Maximum number of requests scored together
+            max_queue_size: Waiting requests beyond which new requests are rejected
+            latency_window: Number of most recent request latencies kept for percentiles
+            max_body_bytes: Largest request body accepted, larger ones get HTTP 413
+        """
+        self.recommender = recommender
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.max_queue_size = max_queue_size
+        self.max_body_bytes = max_body_bytes
+        self.metrics = ServiceMetrics(latency_window)
+
+        self._queue = None
+        self._batch_task = None
+        # Batches are scored one at a time off the event loop
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    async def start(self) -> None:
+        """Start the batching loop. Must be called from the running event loop."""
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._batch_task = asyncio.create_task(self._batch_loop())
+
+    async def stop(self) -> None:
+        """Stop the batching loop and the scoring thread."""
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            try:
+                await self._batch_task
+            except asyncio.CancelledError:
+                pass
+            self._batch_task = None
+        self._executor.shutdown(wait=True)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting to be batched."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def recommend(
+        self,
+        profile: Dict[str, Any],
+        top_n: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> ArticleResults:
+        """
+        Queue a recommendation request and wait for its batch to be scored.
+
+        Args:
+            profile: Dictionary with 'user_profile' and optional 'food_items'
+                and 'health_status' keys
+            top_n: Number of top articles to return (default from the recommender)
+            filters: Optional facet filters applied before scoring
+
+        Returns:
+            Recommended articles as records
+        """
+        if top_n is None:
+            top_n = self.recommender.top_n
+        # Invalid filters and profiles fail here instead of failing the whole batch
+        filter_key = canonical_filters(filters)
+        self.recommender.canonical_user_query(
+            profile.get('user_profile', {}), profile.get('food_items'), profile.get('health_status')
+        )
+
+        future = asyncio.get_running_loop().create_future()
+        arrival = time.perf_counter()
+        try:
+            self._queue.put_nowait((profile, top_n, filters, filter_key, future))
+        except asyncio.QueueFull:
+            self.metrics.rejected += 1
+            raise
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self._queue.qsize())
+
+        try:
+            result = await future
+        except Exception:
+            self.metrics.record_request(time.perf_counter() - arrival, failed=True)
+            raise
+        self.metrics.record_request(time.perf_counter() - arrival)
+        return result
+
+    async def _batch_loop(self) -> None:
+        """Collect queued requests into batches and score them off the event loop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self.metrics.record_batch(len(batch))
+            results = await loop.run_in_executor(self._executor, self._score_batch, batch)
+            for (_, _, _, _, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _score_batch(self, batch: List[Tuple]) -> List[Any]:
+        """
+        Score a batch, one recommend_for_users call per distinct top_n and filters.
+
+        If a group fails, its requests are retried one at a time, so only the
+        requests that fail on their own get the error.
+
+        Args:
+            batch: Queued (profile, top_n, filters, filter key, future) tuples
+
+        Returns:
+            Result records or the raised exception per request, in batch order
+        """
+        groups = {}
+        for position, (_, top_n, _, filter_key, _) in enumerate(batch):
+            groups.setdefault((top_n, filter_key), []).append(position)
+
+        results = [None] * len(batch)
+        for (top_n, _), positions in groups.items():
+            try:
+                group_results = self.recommender.recommend_for_users(
+                    [batch[position][0] for position in positions],
+                    top_n=top_n,
+                    output='records',
+                    filters=batch[positions[0]][2]
+                )
+            except Exception:
+                group_results = [self._score_one(batch[position]) for position in positions]
+            for position, result in zip(positions, group_results):
+                results[position] = result
+        return results
+
+    def _score_one(self, request: Tuple) -> Any:
+        """
+        Score a single queued request.
+
+        Args:
+            request: Queued (profile, top_n, filters, filter key, future) tuple
+
+        Returns:
+            Result records or the raised exception
+        """
+        profile, top_n, filters, _, _ = request
+        try:
+            return self.recommender.recommend_for_users(
+                [profile], top_n=top_n, output='records', filters=filters
+            )[0]
+        except Exception as e:
+            return e
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serve HTTP/1.1 requests on one connection, keeping it alive between requests.
+
+        Args:
+            reader: Connection reader
+            writer: Connection writer
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                parts = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                # The body cannot be skipped without a valid length, so errors close the connection
+                try:
+                    length = int(headers.get('content-length', 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {'error': 'Invalid Content-Length'}, keep_alive=False)
+                    break
+                if length > self.max_body_bytes:
+                    await self._respond(writer, 413, {'error': 'Request body too large'}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                if len(parts) < 2:
+                    status, payload = 400, {'error': 'Malformed request line'}
+                else:
+                    status, payload = await self._route(parts[0], parts[1], body)
+
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """
+        Dispatch a request to its endpoint.
+
+        Args:
+            method: HTTP method
+            path: Request path
+            body: Request body
+
+        Returns:
+            Tuple of (HTTP status, JSON payload)
+        """
+        path = path.split('?', 1)[0]
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok'}
+        if method == 'GET' and path == '/metrics':
+            return 200, self.metrics.snapshot(self.queue_depth)
+        if method != 'POST' or path != '/recommend':
+            return 404, {'error': f'No endpoint {method} {path}'}
+
+        try:
+            request = json.loads(body or b'{}')
+            profile = {
+                'user_profile': request.get('user_profile', {}),
+                'food_items': request.get('food_items'),
+                'health_status': request.get('health_status')
+            }
+            articles = await self.recommend(profile, request.get('top_n'), request.get('filters'))
+        except (ValueError, TypeError, AttributeError) as e:
+            return 400, {'error': str(e)}
+        except asyncio.QueueFull:
+            return 503, {'error': 'Too many queued requests'}
+        except Exception as e:
+            return 500, {'error': str(e)}
+        return 200, {'articles': articles}
+
+    @staticmethod
+    async def _respond(
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Dict[str, Any],
+        keep_alive: bool = True
+    ) -> None:
+        """
+        Write a JSON response.
+
+        Args:
+            writer: Connection writer
+            status: HTTP status code
+            payload: JSON-serializable response body
+            keep_alive: Whether the connection stays open
+        """
+        # NumPy scalars in result records are converted to Python numbers
+        body = json.dumps(payload, default=lambda value: value.item() if hasattr(value, 'item') else str(value))
+        body = body.encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+async def serve(service: RecommendationService, host: str = '127.0.0.1', port: int = 8080) -> None:
+    """
+    Run the HTTP server until cancelled.
+
+    Args:
+        service: Recommendation service
+        host: Interface to listen on
+        port: Port to listen on
+    """
+    await service.start()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"Recommendation service listening on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+def create_service(recommender: ArticleRecommender) -> RecommendationService:
+    """
+    Create a service with the settings of the recommender's 'service' config section.
+
+    Args:
+        recommender: Recommender with articles loaded and vectors built
+
+    Returns:
+        Recommendation service
+    """
+    service_config = recommender.config.get('service', {})
+    return RecommendationService(
+        recommender,
+        batch_window_ms=service_config.get('batch_window_ms', 5.0),
+        max_batch_size=service_config.get('max_batch_size', 64),
+        max_queue_size=service_config.get('max_queue_size', 1024),
+        latency_window=service_config.get('latency_window', 10000),
+        max_body_bytes=service_config.get('max_body_bytes', MAX_BODY_BYTES)
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve article recommendations over HTTP')
+    parser.add_argument('--config', default=None, help='Project or recommender config file')
+    parser.add_argument('--model-path', default=None, help='Saved recommender model directory')
+    parser.add_argument('--articles-path', default=None, help='Articles CSV, used if no model is given')
+    parser.add_argument('--host', default=None)
+    parser.add_argument('--port', type=int, default=None)
+    args = parser.parse_args()
+
+    # The model is loaded once and shared by all requests
+    recommender = ArticleRecommender(args.config)
+    model_path = args.model_path or recommender.model_path
+    if model_path:
+        recommender.load(model_path)
+    else:
+        recommender.load_articles(args.articles_path or recommender.articles_path)
+        recommender.build_article_vectors()
+
+    service_config = recommender.config.get('service', {})
+    host = args.host or service_config.get('host', '127.0.0.1')
+    port = args.port or service_config.get('port', 8080)
+
+    try:
+        asyncio.run(serve(create_service(recommender), host, port))
+    except KeyboardInterrupt:
+        print("Recommendation service stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Approximate nearest neighbor utilities for the NutriGenius project.
+
+This module provides an inverted file (IVF) index over dense, L2-normalized
+embeddings implemented with NumPy only. Vectors are clustered with k-means
+and a query is only compared with the vectors of its nprobe closest
+clusters, trading recall for latency. The index stores only centroids
+and the cluster of each vector; the embeddings stay with the caller and
+are passed to search.
+"""
+
+import numpy as np
+from typing import List, Optional, Tuple
+
+from .ranking import select_top_n
+
+class IVFIndex:
+    """Inverted file index for maximum inner product search over normalized embeddings."""
+
+    def __init__(self, nlist: int = 100, nprobe: int = 8, n_iter: int = 20, seed: int = 42):
+        """
+        Initialize the index.
+
+        Args:
+            nlist: Number of k-means clusters (inverted lists)
+            nprobe: Number of closest clusters scanned per query, the recall/latency knob
+            n_iter: Number of k-means iterations
+            seed: Random seed for centroid initialization
+        """
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.n_iter = n_iter
+        self.seed = seed
+
+        self.centroids = None
+        self.assignments = None
+        self.list_order = None
+        self.list_offsets = None
+
+    def fit(self, embeddings: np.ndarray, sample_size: int = 100000) -> None:
+        """
+        Cluster the embeddings and build the inverted lists.
+
+        Args:
+            embeddings: Array of shape (num_vectors, dim) with L2-normalized rows
+            sample_size: Maximum number of vectors used to train the centroids
+        """
+        rng = np.random.default_rng(self.seed)
+        nlist = max(1, min(self.nlist, len(embeddings)))
+
+        sample = embeddings
+        if len(embeddings) > sample_size:
+            sample = embeddings[rng.choice(len(embeddings), size=sample_size, replace=False)]
+
+        # Spherical k-means: centroids are kept normalized, assignment by inner product
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(self.n_iter):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            centroids[~empty] = sums[~empty] / norms[~empty]
+
+        self.centroids = centroids
+        self.set_assignments(self.assign(embeddings))
+
+    def assign(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Find the closest cluster of each vector.
+
+        Args:
+            embeddings: Array of shape (num_vectors, dim) with L2-normalized rows
+
+        Returns:
+            Cluster index of each vector
+        """
+        if len(embeddings) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.argmax(embeddings @ self.centroids.T, axis=1)
+
+    def add(self, embeddings: np.ndarray) -> None:
+        """
+        Add vectors to their closest clusters without retraining centroids.
+
+        The new vectors get ids following the indexed vectors, so they must
+        be appended to the embeddings passed to search in the same order.
+
+        Args:
+            embeddings: Array of shape (num_vectors, dim) with L2-normalized rows
+        """
+        self.set_assignments(np.concatenate([self.assignments, self.assign(embeddings)]))
+
+    def set_assignments(self, assignments: np.ndarray) -> None:
+        """
+        Set the cluster of each indexed vector and rebuild the lists.
+
+        Args:
+            assignments: Cluster index of each vector
+        """
+        self.assignments = np.asarray(assignments, dtype=np.int64)
+        self.list_order = np.argsort(self.assignments, kind='stable')
+        self.list_offsets = np.searchsorted(
+            self.assignments[self.list_order], np.arange(len(self.centroids) + 1)
+        )
+
+    def search(
+        self,
+        embeddings: np.ndarray,
+        queries: np.ndarray,
+        top_n: int,
+        nprobe: Optional[int] = None,
+        min_score: Optional[float] = None,
+        exclude: Optional[np.ndarray] = None
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Find the approximate top-N vectors by inner product for each query.
+
+        Args:
+            embeddings: Array of shape (num_vectors, dim) of the indexed vectors
+            queries: Array of shape (num_queries, dim) with L2-normalized rows
+            top_n: Number of vectors to return per query
+            nprobe: Number of clusters to scan (default from the index)
+            min_score: Optional minimum score a vector needs to be returned
+            exclude: Optional boolean mask of vectors that must not be returned
+
+        Returns:
+            List of (vector indices, scores) per query, sorted by descending score
+        """
+        if nprobe is None:
+            nprobe = self.nprobe
+        nprobe = max(1, min(nprobe, len(self.centroids)))
+
+        # Closest clusters of all queries at once
+        centroid_scores = queries @ self.centroids.T
+        probes = np.argpartition(-centroid_scores, nprobe - 1, axis=1)[:, :nprobe]
+
+        results = []
+        for query, clusters in zip(queries, probes):
+            candidates = np.concatenate([
+                self.list_order[self.list_offsets[c]:self.list_offsets[c + 1]] for c in clusters
+            ])
+            if exclude is not None:
+                candidates = candidates[~exclude[candidates]]
+            candidates.sort()
+
+            scores = embeddings[candidates] @ query
+            selected, top_scores = select_top_n(scores, top_n, min_score)
+            results.append((candidates[selected], top_scores))
+
+        return results
+
+def exact_search(
+    embeddings: np.ndarray,
+    queries: np.ndarray,
+    top_n: int,
+    min_score: Optional[float] = None,
+    exclude: Optional[np.ndarray] = None
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Find the exact top-N vectors by inner product for each query.
+
+    Args:
+        embeddings: Array of shape (num_vectors, dim)
+        queries: Array of shape (num_queries, dim)
+        top_n: Number of vectors to return per query
+        min_score: Optional minimum score a vector needs to be returned
+        exclude: Optional boolean mask of vectors that must not be returned
+
+    Returns:
+        List of (vector indices, scores) per query, sorted by descending score
+    """
+    scores = queries @ embeddings.T
+    return [select_top_n(row, top_n, min_score, exclude) for row in scores]
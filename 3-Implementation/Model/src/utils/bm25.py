@@ -0,0 +1,140 @@
+"""
+BM25 scoring utilities for the NutriGenius project.
+
+This module precomputes Okapi BM25 (and BM25+) term weights for a sparse
+document-term count matrix. Document length normalization and term
+saturation are folded into the stored weights, so scoring a query is a
+sparse dot product between its term counts and the weight matrix.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from typing import Any, Dict, Optional
+
+class BM25Weighter:
+    """Document term weights for BM25 (delta = 0) or BM25+ (delta > 0) scoring."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, delta: float = 0.0):
+        """
+        Initialize the weighter.
+
+        Args:
+            k1: Term frequency saturation, must be positive
+            b: Strength of document length normalization in [0, 1]
+            delta: BM25+ lower bound added to the weight of every matching term
+        """
+        if k1 <= 0:
+            raise ValueError(f"k1 must be positive, got {k1}")
+        if not 0 <= b <= 1:
+            raise ValueError(f"b must be in [0, 1], got {b}")
+
+        self.k1 = k1
+        self.b = b
+        self.delta = delta
+
+        self.num_docs = 0
+        self.avg_doc_length = 0.0
+        self.doc_freq = None
+        self.idf_ = None
+        self.doc_lengths = None
+
+    def fit(self, counts: sp.csr_matrix) -> None:
+        """
+        Compute IDF weights and the average document length from term counts.
+
+        Args:
+            counts: Sparse document x term counts with no stored zeros
+        """
+        counts = sp.csr_matrix(counts)
+        self.num_docs = counts.shape[0]
+        self.doc_lengths = np.asarray(counts.sum(axis=1), dtype=np.float64).ravel()
+        self.avg_doc_length = float(self.doc_lengths.mean()) if self.num_docs else 0.0
+        self.doc_freq = np.bincount(counts.indices, minlength=counts.shape[1])
+        # Non-negative IDF variant, so common terms never lower a score
+        self.idf_ = np.log1p((self.num_docs - self.doc_freq + 0.5) / (self.doc_freq + 0.5))
+
+    def _length_norms(self, doc_lengths: np.ndarray) -> np.ndarray:
+        """
+        Get the saturation constant k1 * (1 - b + b * length / average length) per document.
+
+        Args:
+            doc_lengths: Document lengths
+
+        Returns:
+            Saturation constant per document
+        """
+        avg_doc_length = self.avg_doc_length if self.avg_doc_length > 0 else 1.0
+        return self.k1 * (1 - self.b + self.b * doc_lengths / avg_doc_length)
+
+    def weight(self, counts: sp.csr_matrix, doc_lengths: Optional[np.ndarray] = None) -> sp.csr_matrix:
+        """
+        Turn term counts into BM25 document term weights.
+
+        Args:
+            counts: Sparse document x term counts
+            doc_lengths: Length of each document (default: row sums of counts)
+
+        Returns:
+            Sparse matrix of BM25 weights with the sparsity pattern of counts
+        """
+        if self.idf_ is None:
+            raise ValueError("IDF weights not computed. Please call fit first.")
+
+        counts = sp.csr_matrix(counts, dtype=np.float64)
+        if doc_lengths is None:
+            doc_lengths = np.asarray(counts.sum(axis=1)).ravel()
+
+        # Length normalization of each stored entry's document
+        norms = np.repeat(self._length_norms(doc_lengths), np.diff(counts.indptr))
+        tf = counts.data
+        data = self.idf_[counts.indices] * (tf * (self.k1 + 1) / (tf + norms) + self.delta)
+        return sp.csr_matrix((data, counts.indices, counts.indptr), shape=counts.shape)
+
+    def extend(self, counts: sp.csr_matrix) -> None:
+        """
+        Record the lengths of documents appended after fitting.
+
+        New documents are weighted with the fitted IDF weights and average
+        length until the next refit.
+
+        Args:
+            counts: Sparse document x term counts of the new documents
+        """
+        doc_lengths = np.asarray(counts.sum(axis=1), dtype=np.float64).ravel()
+        self.doc_lengths = np.concatenate([self.doc_lengths, doc_lengths])
+
+    def counts_from_weights(
+        self,
+        weights: sp.csr_matrix,
+        doc_lengths: Optional[np.ndarray] = None
+    ) -> sp.csr_matrix:
+        """
+        Recover term counts from weights produced by this weighter.
+
+        Inverts the saturation function per entry, so documents can be
+        reweighted after a refit without tokenizing them again.
+
+        Args:
+            weights: Sparse matrix of BM25 weights
+            doc_lengths: Length of each document (default: the recorded lengths)
+
+        Returns:
+            Sparse matrix of term counts
+        """
+        if doc_lengths is None:
+            doc_lengths = self.doc_lengths
+
+        weights = sp.csr_matrix(weights)
+        norms = np.repeat(self._length_norms(doc_lengths), np.diff(weights.indptr))
+        saturation = weights.data / self.idf_[weights.indices] - self.delta
+        tf = saturation * norms / (self.k1 + 1 - saturation)
+        return sp.csr_matrix((tf, weights.indices.copy(), weights.indptr.copy()), shape=weights.shape)
+
+    def get_params(self) -> Dict[str, Any]:
+        """
+        Get the parameters needed to recreate the weighter.
+
+        Returns:
+            Dictionary of JSON-serializable parameters
+        """
+        return {'k1': self.k1, 'b': self.b, 'delta': self.delta}
@@ -0,0 +1,159 @@
+"""
+Result caching utilities for the NutriGenius project.
+
+This module provides a thread-safe LRU cache with per-entry expiry used to
+reuse recommendation results for users that map to the same query.
+Entries are tagged with the version of the data they were computed from,
+so results computed before the data changed are never returned.
+"""
+
+import sys
+import time
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory footprint of a cached value in bytes.
+
+    Args:
+        value: Cached value (DataFrame, array, container or scalar)
+
+    Returns:
+        Approximate size in bytes
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return value.nbytes + sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(key) + estimate_size(item) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+class ResultCache:
+    """Bounded LRU cache with a time-to-live and data version per entry."""
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: Optional[float] = 300):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries, least recently used are evicted first
+            ttl_seconds: Seconds an entry stays valid (None for no expiry)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        # key -> (data version, expiry time, value, size in bytes)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._memory_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, version: int = 0) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+            version: Current version of the data the value depends on
+
+        Returns:
+            Cached value, or None if missing, expired or computed from older data
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            entry_version, expires_at, value, _ = entry
+            if entry_version != version or (expires_at is not None and time.monotonic() >= expires_at):
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, version: int = 0) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            version: Version of the data the value was computed from
+        """
+        if self.max_size <= 0:
+            return
+
+        expires_at = None
+        if self.ttl_seconds is not None:
+            expires_at = time.monotonic() + self.ttl_seconds
+        size = estimate_size(value)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (version, expires_at, value, size)
+            self._memory_bytes += size
+
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        """
+        Remove an entry and release its accounted memory. The lock must be held.
+
+        Args:
+            key: Cache key
+        """
+        _, _, _, size = self._entries.pop(key)
+        self._memory_bytes -= size
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit ratio, evictions, expirations
+            (entries dropped as expired or stale), current size, maximum size
+            and estimated memory in bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'memory_bytes': self._memory_bytes
+            }
@@ -8,10 +8,13 @@ import os
 import yaml
 import logging
 import numpy as np
-import matplotlib.pyplot as plt
-from typing import Dict, List, Union, Any, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Union, Any, Tuple
 from datetime import datetime
-import tensorflow as tf
+
+# TensorFlow and matplotlib are imported inside the functions that need
+# them, so modules using only the file and config helpers start quickly
+if TYPE_CHECKING:
+    import tensorflow as tf
 
 # Configure logging
 logging.basicConfig(
@@ -20,6 +23,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Supported TFLite quantization modes
+TFLITE_QUANTIZATIONS = ('none', 'dynamic', 'float16', 'int8')
+
 def get_project_root():
     """
     Get the absolute path to the project root directory.
@@ -65,7 +71,7 @@ def create_directory(directory: str) -> None:
         os.makedirs(directory)
         logger.info(f"Created directory: {directory}")
 
-def save_model(model: tf.keras.Model, save_path: str) -> None:
+def save_model(model: 'tf.keras.Model', save_path: str) -> None:
     """
     Save a TensorFlow model to the specified path.
     
@@ -81,7 +87,7 @@ def save_model(model: tf.keras.Model, save_path: str) -> None:
         logger.error(f"Error saving model: {e}")
         raise
 
-def load_model(model_path: str) -> tf.keras.Model:
+def load_model(model_path: str) -> 'tf.keras.Model':
     """
     Load a TensorFlow model from the specified path.
     
@@ -91,6 +97,8 @@ def load_model(model_path: str) -> tf.keras.Model:
     Returns:
         Loaded TensorFlow model
     """
+    import tensorflow as tf
+    
     try:
         model = tf.keras.models.load_model(model_path)
         logger.info(f"Model loaded from {model_path}")
@@ -107,6 +115,8 @@ def plot_training_history(history: Dict[str, List[float]], save_path: str = None
         history: Dictionary containing training history
         save_path: Optional path to save the plot
     """
+    import matplotlib.pyplot as plt
+    
     plt.figure(figsize=(12, 5))
     
     # Plot training & validation accuracy values
@@ -149,16 +159,44 @@ def get_timestamp() -> str:
     """
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
-def convert_to_tflite(model: tf.keras.Model, save_path: str) -> None:
+def convert_to_tflite(
+    model: 'tf.keras.Model',
+    save_path: str,
+    quantization: str = 'none',
+    representative_dataset: Optional[Callable[[], Iterable[List[np.ndarray]]]] = None
+) -> None:
     """
     Convert TensorFlow model to TFLite format for mobile deployment.
     
     Args:
         model: TensorFlow model to convert
         save_path: Path to save the TFLite model
+        quantization: Quantization, one of TFLITE_QUANTIZATIONS: 'dynamic'
+            stores weights as int8 with float activations, 'float16' stores them
+            as float16 and 'int8' quantizes weights, activations, inputs and
+            outputs to int8
+        representative_dataset: Generator function yielding single-image
+            input lists used to calibrate activation ranges, required for
+            'int8' (see create_representative_dataset)
     """
+    import tensorflow as tf
+    
+    if quantization not in TFLITE_QUANTIZATIONS:
+        raise ValueError(f"Unknown quantization: {quantization}. Options: {TFLITE_QUANTIZATIONS}")
+    if quantization == 'int8' and representative_dataset is None:
+        raise ValueError("int8 quantization requires a representative dataset")
+    
     try:
         converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        if quantization != 'none':
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        if quantization == 'float16':
+            converter.target_spec.supported_types = [tf.float16]
+        if quantization == 'int8':
+            converter.representative_dataset = representative_dataset
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+            converter.inference_input_type = tf.int8
+            converter.inference_output_type = tf.int8
         tflite_model = converter.convert()
         
         create_directory(os.path.dirname(save_path))
@@ -170,6 +208,33 @@ def convert_to_tflite(model: tf.keras.Model, save_path: str) -> None:
         logger.error(f"Error converting to TFLite: {e}")
         raise
 
+def get_tflite_quantization(tflite_config: Dict[str, Any]) -> str:
+    """
+    Get the TFLite quantization mode from the tflite_conversion settings.
+    
+    quantization_mode takes precedence; if it is unset, the boolean
+    quantization flag selects dynamic-range quantization.
+    
+    Args:
+        tflite_config: tflite_conversion section of the model configuration
+        
+    Returns:
+        Quantization mode, one of TFLITE_QUANTIZATIONS
+        
+    Raises:
+        ValueError: If the mode is unknown, or quantization is enabled while
+            quantization_mode is 'none'
+    """
+    quantize = tflite_config.get('quantization', False)
+    mode = tflite_config.get('quantization_mode')
+    if mode is None:
+        mode = 'dynamic' if quantize else 'none'
+    if mode not in TFLITE_QUANTIZATIONS:
+        raise ValueError(f"Unknown quantization: {mode}. Options: {TFLITE_QUANTIZATIONS}")
+    if quantize and mode == 'none':
+        raise ValueError("quantization is enabled but quantization_mode is 'none'; set quantization_mode to a quantized mode")
+    return mode
+
 def preprocess_image(image_path: str, target_size: Tuple[int, int] = (224, 224)) -> np.ndarray:
     """
     Load and preprocess an image for model inference.
@@ -181,6 +246,8 @@ def preprocess_image(image_path: str, target_size: Tuple[int, int] = (224, 224))
     Returns:
         Preprocessed image as numpy array
     """
+    import tensorflow as tf
+    
     try:
         img = tf.keras.preprocessing.image.load_img(
             image_path, target_size=target_size
@@ -10,7 +10,7 @@ import numpy as np
 import pandas as pd
 import cv2
 import tensorflow as tf
-from typing import Dict, List, Tuple, Union, Optional, Any, Callable
+from typing import Dict, Iterator, List, Tuple, Union, Optional, Any, Callable
 from sklearn.model_selection import train_test_split
 
 # Import common utilities
@@ -326,6 +326,85 @@ def create_tf_dataset_from_dataframe(
     
     return dataset
 
+def create_age_gender_dataset(
+    df: pd.DataFrame,
+    target_size: Tuple[int, int] = (200, 200),
+    batch_size: int = 32,
+    shuffle: bool = True,
+    seed: int = 42
+) -> tf.data.Dataset:
+    """
+    Create a dataset with both age and gender labels from UTKFace metadata.
+    
+    Images are decoded as RGB, resized and normalized to [0, 1] like
+    FaceDetector.preprocess_faces. Gender is encoded as 1.0 for "male" and
+    0.0 for "female", matching the 0.5 threshold used at inference.
+    
+    Args:
+        df: Metadata DataFrame from process_utk_face_dataset with path, age and gender columns
+        target_size: Size to resize images to (width, height)
+        batch_size: Batch size
+        shuffle: Whether to shuffle the data
+        seed: Random seed for shuffling
+        
+    Returns:
+        TensorFlow dataset of (image, {'age': age, 'gender': gender}) batches
+    """
+    df = df[df['gender'].isin(['male', 'female'])]
+    ages = df['age'].to_numpy(dtype=np.float32)
+    genders = (df['gender'] == 'male').to_numpy(dtype=np.float32)
+    
+    dataset = tf.data.Dataset.from_tensor_slices(
+        (df['path'].tolist(), {'age': ages, 'gender': genders})
+    )
+    
+    def load_and_preprocess(path, labels):
+        img = tf.io.read_file(path)
+        img = tf.image.decode_image(img, channels=3, expand_animations=False)
+        img = tf.image.resize(img, (target_size[1], target_size[0]))
+        return img / 255.0, labels
+    
+    # Shuffle paths before decoding so the buffer holds strings, not images
+    if shuffle:
+        dataset = dataset.shuffle(buffer_size=len(df), seed=seed)
+    
+    dataset = dataset.map(load_and_preprocess, num_parallel_calls=tf.data.AUTOTUNE)
+    dataset = dataset.batch(batch_size)
+    dataset = dataset.prefetch(buffer_size=tf.data.AUTOTUNE)
+    
+    return dataset
+
+def create_representative_dataset(
+    dataset: tf.data.Dataset,
+    num_samples: int = 100
+) -> Callable[[], Iterator[List[np.ndarray]]]:
+    """
+    Create a representative dataset for int8 TFLite calibration.
+    
+    The dataset must yield images preprocessed exactly as at inference, e.g.
+    from create_tf_dataset_from_dataframe or create_age_gender_dataset over
+    the UTKFace or food metadata.
+    
+    Args:
+        dataset: Batched dataset of (image, label) or image batches
+        num_samples: Number of images used for calibration
+        
+    Returns:
+        Generator function yielding one single-image input list per sample,
+        as expected by convert_to_tflite
+    """
+    def generator():
+        count = 0
+        for batch in dataset:
+            images = batch[0] if isinstance(batch, tuple) else batch
+            for image in images:
+                if count >= num_samples:
+                    return
+                yield [np.expand_dims(np.asarray(image, dtype=np.float32), axis=0)]
+                count += 1
+    
+    return generator
+
 # Example preprocessing function for article text data
 def preprocess_text_data(
     df: pd.DataFrame,
@@ -0,0 +1,372 @@
+"""
+Near-duplicate detection utilities for the NutriGenius project.
+
+This module computes MinHash signatures of word shingles and groups
+near-duplicate documents with LSH banding: documents only become
+candidates if one band of their signatures is identical, so detection
+takes sub-quadratic time. Candidate pairs are verified with the estimated
+Jaccard similarity and merged into clusters with connected components.
+"""
+
+import zlib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Signature value of documents without any shingle; such documents never match
+EMPTY_SIGNATURE = np.iinfo(np.uint32).max
+
+# Shingles hashed per MinHash block, bounds the (num_perm, shingles) work array
+_MAX_BLOCK_SHINGLES = 1 << 16
+
+# Candidate pairs verified at a time
+_MAX_BLOCK_PAIRS = 1 << 20
+
+# Following rows of the same bucket each row is paired with, besides the bucket's first row
+_BUCKET_WINDOW = 8
+
+class MinHashLSH:
+    """MinHash signatures with LSH banding and near-duplicate clusters."""
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 3,
+        threshold: float = 0.8,
+        seed: int = 42
+    ):
+        """
+        Initialize the detector.
+
+        Args:
+            num_perm: Number of hash functions per signature
+            bands: Number of LSH bands, must divide num_perm. More bands find
+                pairs of lower similarity at the cost of more candidates
+            shingle_size: Number of consecutive words per shingle
+            threshold: Minimum estimated Jaccard similarity of near-duplicates
+            seed: Random seed of the hash functions
+        """
+        if num_perm % bands != 0:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.seed = seed
+
+        # Multiply-shift hash functions h(x) = (a * x + b) >> 32 with odd a
+        rng = np.random.default_rng(seed)
+        self._hash_a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._hash_b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._band_mix = rng.integers(1, 2 ** 63, size=self.rows_per_band, dtype=np.uint64) | np.uint64(1)
+
+        self.signatures = None
+        self.clusters = None
+
+        # Band keys sorted per band, built on first add
+        self._sorted_keys = None
+        self._sorted_rows = None
+
+    def _shingle_hashes(self, texts: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Hash the word shingles of each text.
+
+        Words are hashed once per distinct word with CRC32, so hashes are
+        stable across processes.
+
+        Args:
+            texts: Preprocessed texts
+
+        Returns:
+            Tuple of (shingle hashes of all texts, number of shingles per text)
+        """
+        texts = pd.Series(list(texts), dtype=object).fillna('')
+        words = texts.str.split().explode().dropna()
+        doc_ids = words.index.to_numpy(dtype=np.int64)
+
+        codes, uniques = pd.factorize(words.to_numpy())
+        word_hashes = np.array(
+            [zlib.crc32(word.encode('utf-8')) for word in uniques], dtype=np.uint64
+        )[codes]
+
+        # Shingle i covers words i .. i + k - 1 and must not cross a document
+        # boundary; texts shorter than k words form a single shorter shingle
+        k = self.shingle_size
+        lengths = np.bincount(doc_ids, minlength=len(texts))
+        doc_lengths = np.repeat(lengths, lengths)
+        positions = np.arange(len(word_hashes)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        valid = (positions + k <= doc_lengths) | ((positions == 0) & (doc_lengths < k))
+
+        hashes = np.zeros(len(word_hashes), dtype=np.uint64)
+        for offset in range(k):
+            shifted = np.zeros(len(word_hashes), dtype=np.uint64)
+            shifted[:len(word_hashes) - offset] = word_hashes[offset:]
+            in_doc = positions + offset < doc_lengths
+            hashes = hashes * np.uint64(0x100000001B3) + np.where(in_doc, shifted, np.uint64(0))
+        return hashes[valid] & np.uint64(0xFFFFFFFF), np.bincount(doc_ids[valid], minlength=len(texts))
+
+    def compute_signatures(self, texts: Iterable[str]) -> np.ndarray:
+        """
+        Compute the MinHash signature of each text.
+
+        Args:
+            texts: Preprocessed texts
+
+        Returns:
+            Array of shape (num_texts, num_perm) with uint32 signatures
+        """
+        texts = list(texts)
+        hashes, counts = self._shingle_hashes(texts)
+
+        signatures = np.full((len(texts), self.num_perm), EMPTY_SIGNATURE, dtype=np.uint32)
+        docs = np.flatnonzero(counts)
+        offsets = np.concatenate([[0], np.cumsum(counts[docs])])
+
+        # Blocks of whole documents with a bounded number of shingles
+        start = 0
+        while start < len(docs):
+            end = max(start + 1, int(np.searchsorted(offsets, offsets[start] + _MAX_BLOCK_SHINGLES, 'right')) - 1)
+            end = min(end, len(docs))
+            block = hashes[offsets[start]:offsets[end]]
+            permuted = (self._hash_a[:, None] * block[None, :] + self._hash_b[:, None]) >> np.uint64(32)
+            signatures[docs[start:end]] = np.minimum.reduceat(
+                permuted, offsets[start:end] - offsets[start], axis=1
+            ).T.astype(np.uint32)
+            start = end
+        return signatures
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """
+        Hash each band of the signatures into one key.
+
+        Args:
+            signatures: Array of shape (num_docs, num_perm)
+
+        Returns:
+            Array of shape (num_docs, bands) with uint64 band keys
+        """
+        bands = signatures.reshape(len(signatures), self.bands, self.rows_per_band).astype(np.uint64)
+        return (bands * self._band_mix).sum(axis=2, dtype=np.uint64)
+
+    def _verify(self, signatures: np.ndarray, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """
+        Keep the candidate pairs whose estimated Jaccard similarity reaches the threshold.
+
+        Args:
+            signatures: Signatures of all documents
+            left: First document of each pair
+            right: Second document of each pair
+
+        Returns:
+            Boolean mask over the pairs
+        """
+        keep = np.zeros(len(left), dtype=bool)
+        for start in range(0, len(left), _MAX_BLOCK_PAIRS):
+            a = signatures[left[start:start + _MAX_BLOCK_PAIRS]]
+            b = signatures[right[start:start + _MAX_BLOCK_PAIRS]]
+            similarity = (a == b).mean(axis=1)
+            keep[start:start + _MAX_BLOCK_PAIRS] = (similarity >= self.threshold) & (a[:, 0] != EMPTY_SIGNATURE)
+        return keep
+
+    @staticmethod
+    def _bucket_pairs(keys: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pair rows that share a band key.
+
+        Each row is paired with the first row of its bucket and with the
+        next _BUCKET_WINDOW rows of the bucket instead of all of them, which
+        keeps the number of candidates linear in the number of documents.
+
+        Args:
+            keys: Band key of each row
+            rows: Row ids
+
+        Returns:
+            Tuple of (rows, paired rows)
+        """
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        new_bucket = np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]])
+        first = order[np.maximum.accumulate(np.where(new_bucket, np.arange(len(order)), 0))]
+        members = ~new_bucket
+        left, right = [order[members]], [first[members]]
+        for offset in range(1, _BUCKET_WINDOW + 1):
+            same = sorted_keys[offset:] == sorted_keys[:-offset]
+            left.append(order[:-offset][same])
+            right.append(order[offset:][same])
+        return rows[np.concatenate(left)], rows[np.concatenate(right)]
+
+    def _cluster(self, num_rows: int, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """
+        Merge linked rows into clusters labelled by their smallest row.
+
+        Args:
+            num_rows: Number of rows
+            left: First row of each link
+            right: Second row of each link
+
+        Returns:
+            Representative (smallest) row of each row's cluster
+        """
+        graph = sp.coo_matrix(
+            (np.ones(len(left), dtype=np.int8), (left, right)), shape=(num_rows, num_rows)
+        )
+        _, labels = connected_components(graph, directed=False)
+        representatives = np.full(labels.max() + 1 if num_rows else 0, num_rows, dtype=np.int64)
+        np.minimum.at(representatives, labels, np.arange(num_rows))
+        return representatives[labels]
+
+    def fit(self, signatures: np.ndarray) -> None:
+        """
+        Cluster documents by their signatures.
+
+        Args:
+            signatures: Array of shape (num_docs, num_perm)
+        """
+        self.signatures = np.asarray(signatures, dtype=np.uint32)
+        keys = self._band_keys(self.signatures)
+        rows = np.arange(len(self.signatures))
+
+        pairs = [self._bucket_pairs(keys[:, band], rows) for band in range(self.bands)]
+        left = np.concatenate([pair[0] for pair in pairs]) if pairs else np.array([], dtype=np.int64)
+        right = np.concatenate([pair[1] for pair in pairs]) if pairs else np.array([], dtype=np.int64)
+
+        # Identical pairs found in several bands are verified once
+        unique = np.unique(left * len(rows) + right)
+        left, right = unique // max(len(rows), 1), unique % max(len(rows), 1)
+        keep = self._verify(self.signatures, left, right)
+        self.clusters = self._cluster(len(rows), left[keep], right[keep])
+
+        self._sorted_keys = None
+        self._sorted_rows = None
+
+    def set_state(self, signatures: np.ndarray, clusters: np.ndarray) -> None:
+        """
+        Restore fitted signatures and clusters without clustering again.
+
+        Args:
+            signatures: Array of shape (num_docs, num_perm)
+            clusters: Representative row of each document's cluster
+        """
+        self.signatures = signatures
+        self.clusters = np.asarray(clusters, dtype=np.int64)
+        self._sorted_keys = None
+        self._sorted_rows = None
+
+    def _build_band_index(self) -> None:
+        """Sort the band keys of the fitted documents for lookups of new documents."""
+        keys = self._band_keys(self.signatures)
+        self._sorted_keys = []
+        self._sorted_rows = []
+        for band in range(self.bands):
+            order = np.argsort(keys[:, band], kind='stable')
+            self._sorted_keys.append(keys[order, band])
+            self._sorted_rows.append(order.astype(np.int64))
+
+    def add(self, signatures: np.ndarray) -> None:
+        """
+        Add documents and assign them to clusters without clustering the existing ones again.
+
+        New documents are matched against the sorted band keys of the
+        existing documents and of each other. Clusters that a new document
+        links together are merged.
+
+        Args:
+            signatures: Array of shape (num_new_docs, num_perm)
+        """
+        if self._sorted_keys is None:
+            self._build_band_index()
+
+        num_existing = len(self.signatures)
+        signatures = np.asarray(signatures, dtype=np.uint32)
+        all_signatures = np.vstack([self.signatures, signatures])
+        new_keys = self._band_keys(signatures)
+        new_rows = np.arange(num_existing, len(all_signatures))
+
+        left, right = [], []
+        for band in range(self.bands):
+            # Links among the new documents
+            members, firsts = self._bucket_pairs(new_keys[:, band], new_rows)
+            left.append(members)
+            right.append(firsts)
+
+            # Links to the first existing documents with the same band key
+            sorted_keys = self._sorted_keys[band]
+            order = np.argsort(new_keys[:, band], kind='stable')
+            band_keys = new_keys[order, band]
+            positions = np.searchsorted(sorted_keys, band_keys)
+            for offset in range(_BUCKET_WINDOW):
+                found = positions + offset < len(sorted_keys)
+                found[found] = sorted_keys[positions[found] + offset] == band_keys[found]
+                left.append(new_rows[order[found]])
+                right.append(self._sorted_rows[band][positions[found] + offset])
+
+            # Keep the band index sorted with the new keys
+            insert_at = np.searchsorted(sorted_keys, band_keys, side='right')
+            self._sorted_keys[band] = np.insert(sorted_keys, insert_at, band_keys)
+            self._sorted_rows[band] = np.insert(self._sorted_rows[band], insert_at, new_rows[order])
+
+        left = np.concatenate(left)
+        right = np.concatenate(right)
+        keep = self._verify(all_signatures, left, right)
+
+        # Existing clusters are kept as links to their representatives
+        existing = np.arange(num_existing)
+        self.clusters = self._cluster(
+            len(all_signatures),
+            np.concatenate([existing, left[keep]]),
+            np.concatenate([self.clusters, right[keep]])
+        )
+        self.signatures = all_signatures
+
+    def subset(self, keep: np.ndarray) -> 'MinHashLSH':
+        """
+        Get a detector fitted on the kept documents only.
+
+        Args:
+            keep: Boolean mask of documents to keep
+
+        Returns:
+            New detector with the same parameters
+        """
+        detector = MinHashLSH(**self.get_params())
+        detector.fit(self.signatures[keep])
+        return detector
+
+    def representatives(self, removed: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get the representative of each document's cluster, skipping removed documents.
+
+        Args:
+            removed: Optional boolean mask of removed documents
+
+        Returns:
+            Smallest non-removed row of each document's cluster (the number
+            of documents if all members of the cluster are removed)
+        """
+        num_rows = len(self.clusters)
+        rows = np.arange(num_rows)
+        alive = rows if removed is None else rows[~removed]
+        representatives = np.full(num_rows, num_rows, dtype=np.int64)
+        np.minimum.at(representatives, self.clusters[alive], alive)
+        return representatives[self.clusters]
+
+    def get_params(self) -> Dict[str, Any]:
+        """
+        Get the parameters needed to recreate the detector.
+
+        Returns:
+            Dictionary of JSON-serializable parameters
+        """
+        return {
+            'num_perm': self.num_perm,
+            'bands': self.bands,
+            'shingle_size': self.shingle_size,
+            'threshold': self.threshold,
+            'seed': self.seed
+        }
@@ -0,0 +1,170 @@
+"""
+Faceted filtering utilities for the NutriGenius project.
+
+This module precomputes sorted row index arrays per category and tag and a
+date-sorted row order, so a filter such as "category X published after
+date Y" resolves to its candidate rows without scanning the corpus.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Supported filter keys: categories and tags match any of the given values,
+# dates are an inclusive range
+FILTER_KEYS = ('category', 'tags', 'date_from', 'date_to')
+
+def _normalize_values(values: Any) -> Tuple[str, ...]:
+    """
+    Normalize a facet value or list of values for matching.
+
+    Args:
+        values: String or iterable of strings
+
+    Returns:
+        Sorted tuple of unique stripped, lowercased values
+    """
+    if isinstance(values, str):
+        values = [values]
+    return tuple(sorted({str(value).strip().lower() for value in values}))
+
+def canonical_filters(filters: Optional[Dict[str, Any]]) -> Tuple:
+    """
+    Get a hashable, order-insensitive representation of filters for cache keys.
+
+    Args:
+        filters: Filter dictionary with keys from FILTER_KEYS, or None
+
+    Returns:
+        Tuple of (key, normalized value) pairs, empty without filters
+    """
+    if not filters:
+        return ()
+
+    unknown = set(filters) - set(FILTER_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown filters: {sorted(unknown)}. Options: {FILTER_KEYS}")
+
+    canonical = []
+    for key in FILTER_KEYS:
+        value = filters.get(key)
+        if value is None:
+            continue
+        if key in ('date_from', 'date_to'):
+            canonical.append((key, pd.Timestamp(value).isoformat()))
+        else:
+            canonical.append((key, _normalize_values(value)))
+    return tuple(canonical)
+
+class FacetIndex:
+    """Sorted article row ids per category and tag, and rows ordered by date."""
+
+    def __init__(
+        self,
+        categories: Iterable[str],
+        tags: Iterable[str],
+        dates: Optional[Iterable[Any]] = None
+    ):
+        """
+        Build the facet index.
+
+        Args:
+            categories: Category of each article row
+            tags: Comma-separated tags of each article row
+            dates: Publication date of each article row, or None if unknown
+        """
+        categories = pd.Series(np.asarray(categories, dtype=object)).fillna('').astype(str)
+        self.num_rows = len(categories)
+        self.category_rows = self._group(
+            categories.str.strip().str.lower().to_numpy(), np.arange(self.num_rows)
+        )
+
+        # One (row, tag) pair per tag; explode keeps the row position as index
+        tag_pairs = (
+            pd.Series(np.asarray(tags, dtype=object)).fillna('').astype(str)
+            .str.lower().str.split(',').explode().str.strip()
+        )
+        tag_pairs = tag_pairs[tag_pairs != '']
+        self.tag_rows = self._group(tag_pairs.to_numpy(), tag_pairs.index.to_numpy())
+
+        # Rows with a valid date, ordered by date, for range lookups by binary search
+        self.sorted_dates = None
+        self.date_order = None
+        if dates is not None:
+            parsed = pd.to_datetime(pd.Series(np.asarray(dates, dtype=object)), errors='coerce')
+            valid = parsed.notna().to_numpy()
+            values = parsed[valid].to_numpy(dtype='datetime64[ns]')
+            order = np.argsort(values, kind='stable')
+            self.sorted_dates = values[order]
+            self.date_order = np.flatnonzero(valid)[order]
+
+    @staticmethod
+    def _group(keys: np.ndarray, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Group ascending row ids by key.
+
+        Args:
+            keys: Key of each entry
+            rows: Ascending row id of each entry
+
+        Returns:
+            Dictionary of key -> sorted row ids
+        """
+        codes, uniques = pd.factorize(keys)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        return {
+            key: rows[order[bounds[i]:bounds[i + 1]]]
+            for i, key in enumerate(uniques)
+        }
+
+    @staticmethod
+    def _union(groups: Dict[str, np.ndarray], values: Any) -> np.ndarray:
+        """
+        Get the rows matching any of the values.
+
+        Args:
+            groups: Dictionary of key -> sorted row ids
+            values: String or iterable of strings
+
+        Returns:
+            Sorted row ids
+        """
+        arrays = [groups.get(value, np.array([], dtype=np.int64)) for value in _normalize_values(values)]
+        if len(arrays) == 1:
+            return arrays[0]
+        return np.unique(np.concatenate(arrays)) if arrays else np.array([], dtype=np.int64)
+
+    def candidates(self, filters: Dict[str, Any]) -> Optional[np.ndarray]:
+        """
+        Resolve filters to the rows matching all of them.
+
+        Args:
+            filters: Filter dictionary with keys from FILTER_KEYS
+
+        Returns:
+            Sorted row ids, or None if no filter is set
+        """
+        canonical = dict(canonical_filters(filters))
+        if not canonical:
+            return None
+
+        rows = None
+        if 'category' in canonical:
+            rows = self._union(self.category_rows, canonical['category'])
+        if 'tags' in canonical:
+            tag_rows = self._union(self.tag_rows, canonical['tags'])
+            rows = tag_rows if rows is None else np.intersect1d(rows, tag_rows, assume_unique=True)
+
+        if 'date_from' in canonical or 'date_to' in canonical:
+            if self.sorted_dates is None:
+                raise ValueError("Date filters require a 'date' column in the articles")
+            start, end = 0, len(self.sorted_dates)
+            if 'date_from' in canonical:
+                start = np.searchsorted(self.sorted_dates, np.datetime64(canonical['date_from'], 'ns'), side='left')
+            if 'date_to' in canonical:
+                end = np.searchsorted(self.sorted_dates, np.datetime64(canonical['date_to'], 'ns'), side='right')
+            date_rows = np.sort(self.date_order[start:max(start, end)])
+            rows = date_rows if rows is None else np.intersect1d(rows, date_rows, assume_unique=True)
+
+        return rows
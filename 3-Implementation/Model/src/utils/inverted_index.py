@@ -0,0 +1,260 @@
+"""
+Inverted index utilities for the NutriGenius project.
+
+This module provides a term -> posting list index over sparse document
+vectors. Scoring a query only visits the postings of its terms, and an
+optional max-score mode stops admitting new candidates as soon as the
+remaining terms can no longer change the top-N. Appended documents go to
+new posting segments that are merged like a binary counter, so the number
+of segments a query visits stays logarithmic in the number of appends.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from typing import Optional, Tuple
+
+from .ranking import select_top_n, select_top_n_sparse
+
+SCORING_MODES = ('exhaustive', 'maxscore')
+
+class InvertedIndex:
+    """Posting lists of (document id, weight) per term built from a document-term matrix."""
+
+    def __init__(self, doc_vectors: sp.spmatrix, max_segments: int = 8):
+        """
+        Build the inverted index.
+
+        Args:
+            doc_vectors: Sparse document x term weight matrix
+            max_segments: Number of segments above which all segments are merged
+        """
+        self.num_docs = 0
+        self.num_terms = doc_vectors.shape[1]
+        self.max_weights = np.zeros(self.num_terms)
+        self.max_segments = max_segments
+
+        # Each segment holds (document offset, indptr, document ids, weights)
+        self.segments = []
+        self.append(doc_vectors)
+
+    def append(self, doc_vectors: sp.spmatrix) -> None:
+        """
+        Append documents as a new segment.
+
+        The new documents get ids following the current documents. The last
+        two segments are merged while the newer one holds at least as many
+        documents as the older one, and all segments are merged once there
+        are more than max_segments, so many small appends do not slow down
+        queries. The segment list and term bounds are replaced rather than
+        modified, so a shallow copy of the index taken before the append
+        keeps searching the old documents.
+
+        Args:
+            doc_vectors: Sparse document x term weight matrix of the new documents
+        """
+        # A CSC matrix stores exactly one posting list per term column
+        postings = sp.csc_matrix(doc_vectors)
+        postings.sort_indices()
+
+        self.segments = self.segments + [(self.num_docs, postings.indptr, postings.indices, postings.data)]
+        self.num_docs += postings.shape[0]
+
+        while len(self.segments) > 1 and self._segment_size(-1) >= self._segment_size(-2):
+            self._merge_segments(len(self.segments) - 2)
+        if len(self.segments) > self.max_segments:
+            self._merge_segments(0)
+
+        # Upper bound of each term's weight, used by max-score pruning
+        non_empty = np.diff(postings.indptr) > 0
+        if non_empty.any():
+            segment_max = np.maximum.reduceat(postings.data, postings.indptr[:-1][non_empty])
+            max_weights = self.max_weights.copy()
+            max_weights[non_empty] = np.maximum(max_weights[non_empty], segment_max)
+            self.max_weights = max_weights
+
+    def _segment_size(self, position: int) -> int:
+        """
+        Get the number of documents in a segment.
+
+        Args:
+            position: Segment position (negative positions count from the end)
+
+        Returns:
+            Number of documents
+        """
+        position = position % len(self.segments)
+        end = self.segments[position + 1][0] if position + 1 < len(self.segments) else self.num_docs
+        return end - self.segments[position][0]
+
+    def _merge_segments(self, first: int) -> None:
+        """
+        Merge the segments from a position to the end into one segment.
+
+        Args:
+            first: Position of the first segment to merge
+        """
+        parts = [
+            sp.csc_matrix((weights, doc_ids, indptr), shape=(self._segment_size(position), self.num_terms))
+            for position, (_, indptr, doc_ids, weights) in enumerate(self.segments[first:], first)
+        ]
+        merged = sp.vstack(parts, format='csc')
+        merged.sort_indices()
+        offset = self.segments[first][0]
+        self.segments = self.segments[:first] + [(offset, merged.indptr, merged.indices, merged.data)]
+
+    def postings(self, term: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the posting list of a term across all segments.
+
+        Args:
+            term: Term (column) index
+
+        Returns:
+            Tuple of (sorted document ids, weights)
+        """
+        if len(self.segments) == 1:
+            _, indptr, doc_ids, weights = self.segments[0]
+            start, end = indptr[term], indptr[term + 1]
+            return doc_ids[start:end], weights[start:end]
+
+        doc_parts, weight_parts = [], []
+        for offset, indptr, doc_ids, weights in self.segments:
+            start, end = indptr[term], indptr[term + 1]
+            doc_parts.append(doc_ids[start:end] + offset)
+            weight_parts.append(weights[start:end])
+        return np.concatenate(doc_parts), np.concatenate(weight_parts)
+
+    def search(
+        self,
+        query_vector: sp.spmatrix,
+        top_n: int,
+        mode: str = 'exhaustive',
+        min_score: Optional[float] = None,
+        exclude: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the top-N documents for a query by dot-product score.
+
+        Args:
+            query_vector: Sparse 1 x term query vector
+            top_n: Number of documents to return
+            mode: 'exhaustive' scores every posting of the query terms,
+                'maxscore' prunes candidates that cannot reach the top-N
+            min_score: Optional minimum score a document needs to be returned
+            exclude: Optional boolean mask of documents that must not be returned
+
+        Returns:
+            Tuple of (document ids, scores) sorted by descending score
+        """
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode: {mode}. Options: {SCORING_MODES}")
+
+        query_vector = sp.csr_matrix(query_vector)
+        terms = query_vector.indices
+        query_weights = query_vector.data
+
+        if mode == 'maxscore':
+            doc_ids, scores = self._search_maxscore(terms, query_weights, top_n, exclude)
+        else:
+            doc_ids, scores = self._accumulate(terms, query_weights)
+
+        return select_top_n_sparse(doc_ids, scores, top_n, self.num_docs, min_score, exclude)
+
+    def _accumulate(
+        self,
+        terms: np.ndarray,
+        query_weights: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sum query-weighted postings of the given terms per document.
+
+        Args:
+            terms: Query term indices
+            query_weights: Query weights aligned with terms
+
+        Returns:
+            Tuple of (sorted unique document ids, accumulated scores)
+        """
+        if len(terms) == 0:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+
+        doc_parts, score_parts = [], []
+        for term, query_weight in zip(terms, query_weights):
+            docs, weights = self.postings(term)
+            doc_parts.append(docs)
+            score_parts.append(weights * query_weight)
+
+        docs = np.concatenate(doc_parts)
+        unique_docs, inverse = np.unique(docs, return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(score_parts), minlength=len(unique_docs))
+        return unique_docs, scores
+
+    def _search_maxscore(
+        self,
+        terms: np.ndarray,
+        query_weights: np.ndarray,
+        top_n: int,
+        exclude: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Accumulate scores with max-score early termination.
+
+        Terms are processed by decreasing score upper bound. Once the N-th
+        best partial score exceeds the upper bound of all remaining terms,
+        no unseen document can enter the top-N: remaining posting lists are
+        only probed for existing candidates, and candidates that cannot
+        reach the threshold are dropped.
+
+        Args:
+            terms: Query term indices
+            query_weights: Query weights aligned with terms
+            top_n: Number of documents to return
+            exclude: Optional boolean mask of documents that must not be returned
+
+        Returns:
+            Tuple of (sorted candidate document ids, scores)
+        """
+        upper_bounds = query_weights * self.max_weights[terms]
+        order = np.argsort(-upper_bounds, kind='stable')
+        terms, query_weights, upper_bounds = terms[order], query_weights[order], upper_bounds[order]
+
+        # Upper bound of the score still obtainable after each term
+        remaining_bounds = np.concatenate([np.cumsum(upper_bounds[::-1])[::-1][1:], [0.0]])
+        # Slack keeps pruning safe against floating point rounding
+        remaining_bounds = remaining_bounds * (1 + 1e-9) + 1e-12
+
+        cand_docs = np.array([], dtype=np.int64)
+        cand_scores = np.array([], dtype=np.float64)
+        admitting = True
+
+        for i, (term, query_weight) in enumerate(zip(terms, query_weights)):
+            docs, weights = self.postings(term)
+
+            if admitting:
+                # Union of the candidates with this posting list
+                merged_docs = np.concatenate([cand_docs, docs])
+                merged_scores = np.concatenate([cand_scores, weights * query_weight])
+                cand_docs, inverse = np.unique(merged_docs, return_inverse=True)
+                cand_scores = np.bincount(inverse, weights=merged_scores, minlength=len(cand_docs))
+                if exclude is not None:
+                    # Excluded documents must not set the pruning threshold
+                    keep = ~exclude[cand_docs]
+                    cand_docs, cand_scores = cand_docs[keep], cand_scores[keep]
+            elif len(cand_docs) > 0 and len(docs) > 0:
+                # Probe the posting list for existing candidates only
+                positions = np.searchsorted(docs, cand_docs)
+                positions[positions == len(docs)] = 0
+                found = docs[positions] == cand_docs
+                cand_scores[found] += weights[positions[found]] * query_weight
+
+            if top_n <= 0 or len(cand_docs) < top_n:
+                continue
+
+            _, top_scores = select_top_n(cand_scores, top_n)
+            threshold = top_scores[-1]
+            if remaining_bounds[i] < threshold:
+                admitting = False
+                keep = cand_scores + remaining_bounds[i] >= threshold
+                cand_docs, cand_scores = cand_docs[keep], cand_scores[keep]
+
+        return cand_docs, cand_scores
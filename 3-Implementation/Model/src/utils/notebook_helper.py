@@ -64,8 +64,10 @@ def get_paths_from_config(config, model_type):
         paths['metadata_file'] = config['dataset']['face']['metadata_file']
         paths['age_model_path'] = config['model_paths']['face_detection']['age_model']
         paths['gender_model_path'] = config['model_paths']['face_detection']['gender_model']
+        paths['age_gender_model_path'] = config['model_paths']['face_detection']['age_gender_model']
         paths['tflite_age_path'] = config['model_paths']['face_detection']['tflite_age_model']
         paths['tflite_gender_path'] = config['model_paths']['face_detection']['tflite_gender_model']
+        paths['tflite_age_gender_path'] = config['model_paths']['face_detection']['tflite_age_gender_model']
     
     elif model_type == 'food_detection':
         paths['raw_data_dir'] = config['dataset']['food']['train_dir']
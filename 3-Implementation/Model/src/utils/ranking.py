@@ -0,0 +1,160 @@
+"""
+Ranking utilities for the NutriGenius project.
+
+This module provides linear-time top-N selection over score vectors,
+shared by the single-query and batched recommendation paths.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from typing import List, Optional, Tuple
+
+def _order_by_score(indices: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    """
+    Get the ordering of candidates by descending score, ties by ascending index.
+
+    Args:
+        indices: Candidate item indices
+        scores: Candidate scores aligned with indices
+
+    Returns:
+        Permutation that sorts the candidates
+    """
+    return np.lexsort((indices, -scores))
+
+def select_top_n(
+    scores: np.ndarray,
+    top_n: int,
+    min_score: Optional[float] = None,
+    exclude: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select the top-N items of a dense score vector in O(n).
+
+    Uses np.argpartition to find the N-th largest score instead of sorting
+    the full vector. Only the selected items are sorted. Ties are broken
+    by ascending index, so the result is deterministic.
+
+    Args:
+        scores: 1-D array of item scores
+        top_n: Number of items to select
+        min_score: Optional minimum score an item needs to be selected
+        exclude: Optional boolean mask of items that must not be selected
+
+    Returns:
+        Tuple of (item indices, scores) sorted by descending score
+    """
+    scores = np.asarray(scores).ravel()
+
+    if min_score is not None or exclude is not None:
+        keep = np.ones(len(scores), dtype=bool) if exclude is None else ~exclude
+        if min_score is not None:
+            keep &= scores >= min_score
+        indices = np.flatnonzero(keep)
+        candidate_scores = scores[indices]
+    else:
+        indices = np.arange(len(scores))
+        candidate_scores = scores
+
+    top_n = min(top_n, len(candidate_scores))
+    if top_n <= 0:
+        return np.array([], dtype=np.intp), np.array([], dtype=scores.dtype)
+
+    if top_n < len(candidate_scores):
+        # The N-th largest score is the selection threshold
+        kth = len(candidate_scores) - top_n
+        threshold = candidate_scores[np.argpartition(candidate_scores, kth)[kth]]
+
+        # Keep everything above the threshold and fill up with the
+        # lowest-index items tied at the threshold
+        above = np.flatnonzero(candidate_scores > threshold)
+        tied = np.flatnonzero(candidate_scores == threshold)[:top_n - len(above)]
+        selected = np.concatenate([above, tied])
+        indices = indices[selected]
+        candidate_scores = candidate_scores[selected]
+
+    order = _order_by_score(indices, candidate_scores)
+    return indices[order], candidate_scores[order]
+
+def select_top_n_sparse(
+    indices: np.ndarray,
+    scores: np.ndarray,
+    top_n: int,
+    num_items: int,
+    min_score: Optional[float] = None,
+    exclude: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select the top-N items of a sparse score vector.
+
+    Items not listed in indices have an implicit score of zero. They are
+    used to pad the result, lowest index first, when fewer than top_n
+    stored items qualify and min_score allows zero scores. Ties are broken
+    on storage position, which matches item order for sparse rows with
+    sorted indices.
+
+    Args:
+        indices: Indices of the items with stored scores
+        scores: Stored scores aligned with indices
+        top_n: Number of items to select
+        num_items: Total number of items
+        min_score: Optional minimum score an item needs to be selected
+        exclude: Optional boolean mask over all items that must not be selected
+
+    Returns:
+        Tuple of (item indices, scores) sorted by descending score
+    """
+    indices = np.asarray(indices)
+    top_n = min(top_n, num_items)
+    selected, top_scores = select_top_n(
+        scores, top_n, min_score, None if exclude is None else exclude[indices]
+    )
+    top_indices = indices[selected]
+
+    missing = top_n - len(top_indices)
+    if missing > 0 and (min_score is None or min_score <= 0):
+        # Excluded items may be skipped, so the search range is only bounded without a mask
+        limit = num_items if exclude is not None else min(num_items, top_n + len(indices))
+        padding = np.setdiff1d(np.arange(limit), indices)
+        if exclude is not None:
+            padding = padding[~exclude[padding]]
+        padding = padding[:missing]
+        top_indices = np.concatenate([top_indices, padding])
+        top_scores = np.concatenate([top_scores, np.zeros(len(padding), dtype=top_scores.dtype)])
+
+    return top_indices, top_scores
+
+def select_top_n_rows(
+    similarities: sp.spmatrix,
+    top_n: int,
+    min_score: Optional[float] = None,
+    exclude: Optional[np.ndarray] = None
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Select the top-N items of each row of a sparse query x item score matrix.
+
+    Args:
+        similarities: Sparse query x item scores
+        top_n: Number of items to select per row
+        min_score: Optional minimum score an item needs to be selected
+        exclude: Optional boolean mask over all items that must not be selected
+
+    Returns:
+        List of (item indices, scores) tuples, one per row
+    """
+    similarities = sp.csr_matrix(similarities)
+    similarities.sort_indices()
+    num_items = similarities.shape[1]
+
+    selected = []
+    for row in range(similarities.shape[0]):
+        start, end = similarities.indptr[row], similarities.indptr[row + 1]
+        selected.append(select_top_n_sparse(
+            similarities.indices[start:end],
+            similarities.data[start:end],
+            top_n,
+            num_items,
+            min_score,
+            exclude
+        ))
+    return selected
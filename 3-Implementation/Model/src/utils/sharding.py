@@ -0,0 +1,212 @@
+"""
+Sharded search utilities for the NutriGenius project.
+
+This module partitions article vectors into shards, scores each shard and
+merges the per-shard top-N lists. Shards hold row slices of globally
+weighted vectors, so IDF statistics stay consistent across shards. Each
+shard keeps its vectors pre-transposed (terms x rows), which makes the
+query product cheaper than against the row-major article matrix; this,
+not the optional thread pool, is where most of the speedup comes from.
+The shards are the only copy of the vectors, and vectors() reassembles
+the row-major matrix when it is needed. Dense embeddings are not copied:
+shards score their rows of the caller's embedding matrix.
+"""
+
+import heapq
+import zlib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, List, Optional, Tuple
+
+from .ranking import select_top_n, select_top_n_rows
+
+# Supported shard assignment strategies: by article id hash or by category
+SHARDING_STRATEGIES = ('hash', 'category')
+
+def assign_shards(keys: Iterable, num_shards: int) -> np.ndarray:
+    """
+    Map shard keys to shards with a stable hash.
+
+    CRC32 of the key's string form is used instead of hash(), so the
+    assignment does not change between processes.
+
+    Args:
+        keys: Shard key of each row (article id or category)
+        num_shards: Number of shards
+
+    Returns:
+        Shard index of each row
+    """
+    codes, uniques = pd.factorize(pd.Series(np.asarray(keys, dtype=object)).astype(str))
+    unique_shards = np.array(
+        [zlib.crc32(key.encode('utf-8')) % num_shards for key in uniques], dtype=np.int64
+    )
+    return unique_shards[codes]
+
+class ShardedIndex:
+    """Article vectors (and optional embeddings) partitioned into shards and searched shard by shard."""
+
+    def __init__(self, num_shards: int, num_features: int, executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Initialize an empty sharded index.
+
+        Args:
+            num_shards: Number of shards
+            num_features: Number of vector columns (terms)
+            executor: Optional thread pool scoring shards concurrently; without
+                one shards are scored one after another in the calling thread.
+                The pool is owned by the caller, so indexes rebuilt from the
+                same data can share it.
+        """
+        self.num_shards = num_shards
+        self.num_features = num_features
+        self.num_rows = 0
+
+        # Per shard: sorted global row ids and transposed vectors
+        self.shard_rows = [np.array([], dtype=np.int64) for _ in range(num_shards)]
+        self.shard_vectors_t = [None] * num_shards
+
+        self._executor = executor
+
+    def append(self, shard_ids: np.ndarray, vectors: sp.spmatrix) -> None:
+        """
+        Append rows to their shards. New rows get ids following the current rows.
+
+        The shard lists are replaced rather than modified, so a shallow copy
+        of the index taken before the append keeps searching the old rows.
+
+        Args:
+            shard_ids: Shard index of each new row
+            vectors: Sparse vectors of the new rows
+        """
+        vectors = sp.csr_matrix(vectors)
+        self.shard_vectors_t = list(self.shard_vectors_t)
+        self.shard_rows = list(self.shard_rows)
+        for shard in range(self.num_shards):
+            local = np.flatnonzero(shard_ids == shard)
+            if len(local) == 0:
+                continue
+
+            # Scoring multiplies queries with the term x row matrix of the shard
+            new_vectors_t = vectors[local].T.tocsr()
+            if self.shard_vectors_t[shard] is None:
+                self.shard_vectors_t[shard] = new_vectors_t
+            else:
+                self.shard_vectors_t[shard] = sp.hstack(
+                    [self.shard_vectors_t[shard], new_vectors_t], format='csr'
+                )
+
+            self.shard_rows[shard] = np.concatenate([self.shard_rows[shard], local + self.num_rows])
+
+        self.num_rows += vectors.shape[0]
+
+    def vectors(self) -> sp.csr_matrix:
+        """
+        Reassemble the row-major vectors of all rows.
+
+        Returns:
+            Sparse matrix of shape (num_rows, num_features) in global row order
+        """
+        shards = [shard for shard in range(self.num_shards) if len(self.shard_rows[shard]) > 0]
+        if not shards:
+            return sp.csr_matrix((0, self.num_features))
+
+        # Transposing a CSR matrix gives a CSC view, so only the stacking copies
+        stacked = sp.vstack([self.shard_vectors_t[shard].T for shard in shards], format='csr')
+        order = np.concatenate([self.shard_rows[shard] for shard in shards])
+        return stacked[np.argsort(order)]
+
+    def _search_shard(
+        self,
+        shard: int,
+        query_vectors: sp.spmatrix,
+        embedding_scores: Optional[np.ndarray],
+        top_n: int,
+        min_score: Optional[float],
+        exclude: Optional[np.ndarray]
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Find the top-N rows of one shard for each query.
+
+        Args:
+            shard: Shard index
+            query_vectors: Sparse query vectors
+            embedding_scores: Dense query x row scores to rank instead of the vectors
+            top_n: Number of rows to return per query
+            min_score: Optional minimum score
+            exclude: Optional boolean mask over all rows
+
+        Returns:
+            List of (global row ids, scores) per query
+        """
+        rows = self.shard_rows[shard]
+        shard_exclude = exclude[rows] if exclude is not None else None
+
+        if embedding_scores is not None:
+            ranked = [
+                select_top_n(row, top_n, min_score, shard_exclude)
+                for row in embedding_scores[:, rows]
+            ]
+        else:
+            ranked = select_top_n_rows(
+                query_vectors @ self.shard_vectors_t[shard], top_n, min_score, shard_exclude
+            )
+
+        return [(rows[indices], scores) for indices, scores in ranked]
+
+    def search(
+        self,
+        query_vectors: sp.spmatrix,
+        top_n: int,
+        min_score: Optional[float] = None,
+        exclude: Optional[np.ndarray] = None,
+        query_embeddings: Optional[np.ndarray] = None,
+        embeddings: Optional[np.ndarray] = None
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Scatter queries to all shards and gather the global top-N per query.
+
+        Each shard returns its top-N sorted by descending score and ascending
+        row id, and the lists are merged lazily with a heap, so only the
+        first top_n entries of the merge are ever produced.
+
+        Args:
+            query_vectors: Sparse query vectors
+            top_n: Number of rows to return per query
+            min_score: Optional minimum score
+            exclude: Optional boolean mask of rows that must not be returned
+            query_embeddings: Dense query embeddings to search embeddings instead
+            embeddings: Dense embeddings of all rows, required with query_embeddings
+
+        Returns:
+            List of (global row ids, scores) per query, sorted by descending score
+        """
+        # Dense scores are one product over all rows; shards only select from them
+        embedding_scores = None
+        if query_embeddings is not None:
+            embedding_scores = query_embeddings @ embeddings.T
+
+        shards = [shard for shard in range(self.num_shards) if len(self.shard_rows[shard]) > 0]
+        args = (query_vectors, embedding_scores, top_n, min_score, exclude)
+        if self._executor is None:
+            shard_results = [self._search_shard(shard, *args) for shard in shards]
+        else:
+            futures = [self._executor.submit(self._search_shard, shard, *args) for shard in shards]
+            shard_results = [future.result() for future in futures]
+
+        results = []
+        for query in range(query_vectors.shape[0]):
+            merged = list(islice(
+                heapq.merge(*[
+                    zip((-shard[query][1]).tolist(), shard[query][0].tolist())
+                    for shard in shard_results
+                ]),
+                top_n
+            ))
+            rows = np.array([row for _, row in merged], dtype=np.int64)
+            scores = np.array([-score for score, _ in merged], dtype=np.float64)
+            results.append((rows, scores))
+        return results
@@ -0,0 +1,61 @@
+"""
+Variable-length text column utilities for the NutriGenius project.
+
+This module stores a column of strings as one UTF-8 byte array and an
+array of row offsets. Both are plain NumPy arrays, so they can be saved
+without pickle and memory-mapped on load, and unlike fixed-width unicode
+arrays their size does not depend on the longest string.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Iterable, Optional, Tuple
+
+def encode_utf8(values: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode strings as concatenated UTF-8 bytes and row offsets.
+
+    Args:
+        values: Strings to encode (missing values become empty strings)
+
+    Returns:
+        Tuple of (uint8 byte array, int64 offsets with one more entry than rows)
+    """
+    encoded = pd.Series(values, dtype=object).fillna('').astype(str).str.encode('utf-8').tolist()
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+class Utf8Column:
+    """Strings stored as UTF-8 bytes and row offsets, decoded only when converted to an array."""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        """
+        Wrap encoded column arrays, which may be memory-mapped.
+
+        Args:
+            data: Concatenated UTF-8 bytes
+            offsets: Start offset of each row followed by the end of the last row
+        """
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __array__(self, dtype: Optional[np.dtype] = None, copy: Optional[bool] = None) -> np.ndarray:
+        """
+        Decode all rows.
+
+        Args:
+            dtype: Optional dtype of the result (object by default)
+            copy: Ignored, the result is always a new array
+
+        Returns:
+            Array of decoded strings
+        """
+        buffer = np.asarray(self.data).tobytes()
+        bounds = np.asarray(self.offsets).tolist()
+        values = np.empty(len(self), dtype=object)
+        values[:] = [buffer[start:end].decode('utf-8') for start, end in zip(bounds[:-1], bounds[1:])]
+        return values if dtype is None else values.astype(dtype)
@@ -0,0 +1,333 @@
+"""
+Text preprocessing utilities for the NutriGenius project.
+
+This module provides a cached tokenization and stopword filtering engine
+used by the article recommender to prepare article and query text.
+NLTK is imported and its resources are resolved on first use only. If
+they are not installed, a bundled regex tokenizer and stopword list are
+used instead, so preprocessing never needs network access.
+"""
+
+import os
+import re
+import logging
+import functools
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Supported tokenizer backends: 'auto' uses NLTK if its resources are
+# installed and falls back to the bundled regex tokenizer otherwise
+TOKENIZERS = ('auto', 'nltk', 'regex')
+
+# NLTK packages fetched when downloads are explicitly allowed
+NLTK_PACKAGES = ('punkt', 'punkt_tab', 'stopwords')
+
+# Words and single punctuation characters, close to NLTK's word_tokenize for plain text
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# NLTK's English stopword list, bundled for the offline fallback
+BUNDLED_STOPWORDS = {
+    'english': frozenset("""
+        i me my myself we our ours ourselves you you're you've you'll you'd
+        your yours yourself yourselves he him his himself she she's her hers
+        herself it it's its itself they them their theirs themselves what
+        which who whom this that that'll these those am is are was were be
+        been being have has had having do does did doing a an the and but if
+        or because as until while of at by for with about against between
+        into through during before after above below to from up down in out
+        on off over under again further then once here there when where why
+        how all any both each few more most other some such no nor not only
+        own same so than too very s t can will just don don't should
+        should've now d ll m o re ve y ain aren aren't couldn couldn't didn
+        didn't doesn doesn't hadn hadn't hasn hasn't haven haven't isn isn't
+        ma mightn mightn't mustn mustn't needn needn't shan shan't shouldn
+        shouldn't wasn wasn't weren weren't won won't wouldn wouldn't
+    """.split())
+}
+
+# Resolved (tokenize function, stopwords, backend name) per process and settings
+_BACKEND_CACHE: Dict[Tuple[str, str, bool], Tuple[Callable[[str], List[str]], FrozenSet[str], str]] = {}
+
+def regex_tokenize(text: str) -> List[str]:
+    """
+    Split text into words and single punctuation characters.
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of tokens
+    """
+    return _TOKEN_PATTERN.findall(text)
+
+def _load_nltk(
+    language: str,
+    download: bool
+) -> Optional[Tuple[Callable[[str], List[str]], FrozenSet[str], str]]:
+    """
+    Import NLTK and check that its tokenizer and stopword resources are installed.
+
+    Args:
+        language: Stopword corpus language
+        download: Download missing resources once instead of giving up
+
+    Returns:
+        NLTK backend, or None if NLTK or its resources are unavailable
+    """
+    try:
+        import nltk
+    except ImportError:
+        return None
+
+    for attempt in range(2 if download else 1):
+        try:
+            stopwords = frozenset(nltk.corpus.stopwords.words(language))
+            nltk.word_tokenize('probe')
+            return nltk.word_tokenize, stopwords, 'nltk'
+        except LookupError:
+            if attempt == 0 and download:
+                for package in NLTK_PACKAGES:
+                    nltk.download(package, quiet=True)
+    return None
+
+def resolve_backend(
+    tokenizer: str = 'auto',
+    language: str = 'english',
+    download: bool = False
+) -> Tuple[Callable[[str], List[str]], FrozenSet[str], str]:
+    """
+    Get the tokenizer and stopwords to use, resolving them only once per process.
+
+    Args:
+        tokenizer: Tokenizer backend from TOKENIZERS
+        language: Language used for tokenization and stopword removal
+        download: Allow downloading missing NLTK resources
+
+    Returns:
+        Tuple of (tokenize function, stopword set, backend name)
+    """
+    if tokenizer not in TOKENIZERS:
+        raise ValueError(f"Unknown tokenizer: {tokenizer}. Options: {TOKENIZERS}")
+
+    key = (tokenizer, language, download)
+    backend = _BACKEND_CACHE.get(key)
+    if backend is not None:
+        return backend
+
+    if tokenizer in ('auto', 'nltk'):
+        backend = _load_nltk(language, download)
+        if backend is None and tokenizer == 'nltk':
+            raise LookupError(
+                f"NLTK tokenizer or '{language}' stopwords not available. "
+                f"Install the NLTK packages {NLTK_PACKAGES} or use tokenizer 'regex'"
+            )
+
+    if backend is None:
+        if language not in BUNDLED_STOPWORDS:
+            raise ValueError(
+                f"No bundled stopwords for language '{language}'. "
+                f"Options: {sorted(BUNDLED_STOPWORDS)}"
+            )
+        if tokenizer == 'auto':
+            logger.info("NLTK resources not available, using the bundled regex tokenizer")
+        backend = (regex_tokenize, BUNDLED_STOPWORDS[language], 'regex')
+
+    _BACKEND_CACHE[key] = backend
+    return backend
+
+def get_stopwords(language: str = 'english', tokenizer: str = 'auto') -> FrozenSet[str]:
+    """
+    Get the stopword set for a language, loading it only once per process.
+
+    Args:
+        language: Stopword corpus language
+        tokenizer: Tokenizer backend from TOKENIZERS
+
+    Returns:
+        Frozen set of stopwords
+    """
+    return resolve_backend(tokenizer, language)[1]
+
+def _preprocess_chunk(texts: List[str], language: str, tokenizer: str, download: bool) -> List[str]:
+    """
+    Preprocess a chunk of lowercased texts in a worker process.
+
+    Args:
+        texts: Lowercased input texts
+        language: Language used for tokenization and stopword removal
+        tokenizer: Tokenizer backend from TOKENIZERS
+        download: Allow downloading missing NLTK resources
+
+    Returns:
+        Preprocessed texts in input order
+    """
+    preprocessor = TextPreprocessor(
+        language=language, cache_size=0, tokenizer=tokenizer, download=download
+    )
+    return [' '.join(preprocessor._tokenize(text)) for text in texts]
+
+class TextPreprocessor:
+    """Tokenizer and stopword filter with a bounded LRU cache of processed text."""
+
+    def __init__(
+        self,
+        language: str = 'english',
+        cache_size: int = 10000,
+        n_workers: int = 1,
+        chunk_size: int = 5000,
+        tokenizer: str = 'auto',
+        download: bool = False
+    ):
+        """
+        Initialize the text preprocessor.
+
+        Args:
+            language: Language used for tokenization and stopword removal
+            cache_size: Maximum number of processed texts kept in the LRU cache
+            n_workers: Worker processes for batch preprocessing (None or 0 uses all CPU cores)
+            chunk_size: Number of texts sent to a worker at a time
+            tokenizer: Tokenizer backend from TOKENIZERS, resolved on first use
+            download: Allow downloading missing NLTK resources (off so startup never uses the network)
+        """
+        if tokenizer not in TOKENIZERS:
+            raise ValueError(f"Unknown tokenizer: {tokenizer}. Options: {TOKENIZERS}")
+
+        self.language = language
+        self.tokenizer = tokenizer
+        self.download = download
+        self.cache_size = cache_size
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._cached_preprocess = functools.lru_cache(maxsize=cache_size)(
+            self._preprocess_uncached
+        )
+        self._backend = None
+
+    def resolve(self) -> Tuple[Callable[[str], List[str]], FrozenSet[str], str]:
+        """
+        Resolve the tokenizer backend, once per preprocessor.
+
+        Returns:
+            Tuple of (tokenize function, stopword set, backend name)
+
+        Raises:
+            LookupError: If the 'nltk' tokenizer was requested but NLTK or
+                its data is not available
+        """
+        if self._backend is None:
+            self._backend = resolve_backend(self.tokenizer, self.language, self.download)
+        return self._backend
+
+    @property
+    def backend(self) -> str:
+        """Name of the tokenizer backend in use ('nltk' or 'regex'), resolving it if needed."""
+        return self.resolve()[2]
+
+    def _tokenize(self, text: str) -> List[str]:
+        """
+        Tokenize lowercased text and drop stopwords.
+
+        Args:
+            text: Lowercased input text
+
+        Returns:
+            List of remaining tokens
+        """
+        tokenize, stopwords, _ = self.resolve()
+        return [token for token in tokenize(text) if token not in stopwords]
+
+    def _preprocess_uncached(self, text: str) -> str:
+        """
+        Preprocess text without consulting the cache.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Preprocessed text
+        """
+        return ' '.join(self._tokenize(text.lower()))
+
+    def preprocess(self, text: str) -> str:
+        """
+        Preprocess a single text, reusing the cached result for repeated inputs.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Preprocessed text
+        """
+        return self._cached_preprocess(text)
+
+    def preprocess_series(self, texts: pd.Series, n_workers: Optional[int] = None) -> pd.Series:
+        """
+        Preprocess a whole Series of texts in one batch.
+
+        Lowercasing is vectorized over the Series and each distinct text is
+        tokenized only once, so duplicated texts do not pay for tokenization
+        again. With more than one worker, distinct texts are split into
+        chunks and tokenized in a process pool, keeping the input order.
+        Batch inputs bypass the LRU cache to avoid evicting queries.
+
+        Args:
+            texts: Series of input texts
+            n_workers: Worker processes to use (default from the preprocessor)
+
+        Returns:
+            Series of preprocessed texts aligned with the input index
+        """
+        if n_workers is None:
+            n_workers = self.n_workers
+
+        lowered = texts.fillna('').astype(str).str.lower()
+        codes, uniques = pd.factorize(lowered)
+
+        if n_workers > 1 and len(uniques) > self.chunk_size:
+            chunks = [
+                list(uniques[start:start + self.chunk_size])
+                for start in range(0, len(uniques), self.chunk_size)
+            ]
+            # Executor.map yields chunk results in submission order
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                processed = [
+                    text
+                    for chunk in executor.map(
+                        _preprocess_chunk, chunks, repeat(self.language),
+                        repeat(self.tokenizer), repeat(self.download)
+                    )
+                    for text in chunk
+                ]
+        else:
+            processed = [' '.join(self._tokenize(text)) for text in uniques]
+
+        if len(processed) == 0:
+            return pd.Series([], index=texts.index, dtype=object)
+
+        return pd.Series(
+            pd.Index(processed, dtype=object).take(codes),
+            index=texts.index
+        )
+
+    def cache_info(self) -> Dict[str, int]:
+        """
+        Get LRU cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, current size and maximum size
+        """
+        info = self._cached_preprocess.cache_info()
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'max_size': info.maxsize
+        }
+
+    def clear_cache(self) -> None:
+        """Clear the processed text cache and reset its counters."""
+        self._cached_preprocess.cache_clear()
@@ -0,0 +1,140 @@
+"""
+TFLite inference utilities for the NutriGenius project.
+
+This module runs models converted with convert_to_tflite in the TFLite
+interpreter, the runtime used by the Android app, so server-side
+predictions match mobile outputs. Inputs are run in chunks of at most the
+configured batch size and written directly into the input tensor, which is
+only resized and reallocated when the chunk size changes.
+Full-integer models take and return float values too: inputs are quantized
+and outputs dequantized with the scales stored in the model.
+"""
+
+import numpy as np
+from typing import Dict, Optional, Tuple, Union
+
+def _interpreter_class() -> type:
+    """
+    Get the TFLite interpreter class.
+
+    The standalone LiteRT runtime is used when installed, since it does not
+    need TensorFlow; otherwise the interpreter bundled with TensorFlow.
+
+    Returns:
+        Interpreter class
+    """
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+class TFLiteModel:
+    """TFLite model with preallocated tensors, callable on batches like a Keras model."""
+
+    def __init__(self, model_path: str, num_threads: Optional[int] = None, batch_size: int = 1):
+        """
+        Load a TFLite model and allocate its tensors.
+
+        Args:
+            model_path: Path to the .tflite file
+            num_threads: Interpreter threads (None uses the runtime default)
+            batch_size: Maximum images per invocation; larger batches are run in chunks
+        """
+        self.model_path = model_path
+        self.batch_size = batch_size
+        self.interpreter = _interpreter_class()(model_path=model_path, num_threads=num_threads)
+
+        # Named outputs (e.g. 'age' and 'gender' of the fused model) come from the
+        # serving signature; models without one fall back to the tensor names
+        if self.interpreter.get_signature_list():
+            runner = self.interpreter.get_signature_runner()
+            input_details = list(runner.get_input_details().values())
+            output_details = runner.get_output_details()
+            # The runner references interpreter internals, which would block resizing
+            del runner
+        else:
+            input_details = self.interpreter.get_input_details()
+            output_details = {details['name']: details for details in self.interpreter.get_output_details()}
+        if len(input_details) != 1:
+            raise ValueError(f"Expected a model with one input, got {len(input_details)}")
+
+        self._input_index = input_details[0]['index']
+        self.input_dtype = input_details[0]['dtype']
+        self.input_shape = (None,) + tuple(int(dim) for dim in input_details[0]['shape'][1:])
+        self._output_indices = {name: details['index'] for name, details in output_details.items()}
+
+        # (scale, zero point) of integer inputs and outputs, None for float tensors
+        self._input_quantization = self._quantization(input_details[0])
+        self._output_quantization = {
+            name: self._quantization(details) for name, details in output_details.items()
+        }
+
+        self._allocated_batch_size = None
+        self._allocate(batch_size)
+
+    def _allocate(self, batch_size: int) -> None:
+        """
+        Resize the input tensor to a batch size and allocate the tensors.
+
+        Args:
+            batch_size: Images per invocation
+        """
+        if batch_size == self._allocated_batch_size:
+            return
+        self.interpreter.resize_tensor_input(self._input_index, (batch_size,) + self.input_shape[1:])
+        self.interpreter.allocate_tensors()
+        self._allocated_batch_size = batch_size
+
+    @staticmethod
+    def _quantization(details: Dict) -> Optional[Tuple[float, int]]:
+        """
+        Get the quantization parameters of a tensor.
+
+        Args:
+            details: Tensor details from the interpreter
+
+        Returns:
+            Tuple of (scale, zero point) for integer tensors, otherwise None
+        """
+        if not np.issubdtype(details['dtype'], np.integer):
+            return None
+        scale, zero_point = details['quantization']
+        return float(scale), int(zero_point)
+
+    def __call__(self, batch: np.ndarray) -> Union[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Run the model on a batch of images.
+
+        Args:
+            batch: Input images with the model's input shape
+
+        Returns:
+            Output array, or a dictionary of output arrays by name for
+            models with several outputs
+        """
+        outputs = {name: [] for name in self._output_indices}
+        for start in range(0, len(batch), self.batch_size):
+            chunk = batch[start:start + self.batch_size]
+            if self._input_quantization is not None:
+                scale, zero_point = self._input_quantization
+                limits = np.iinfo(self.input_dtype)
+                chunk = np.clip(np.round(chunk / scale + zero_point), limits.min, limits.max)
+
+            # Smaller batches would otherwise pay for a full batch_size invocation
+            self._allocate(len(chunk))
+            self.interpreter.tensor(self._input_index)()[:] = chunk
+            self.interpreter.invoke()
+
+            for name, index in self._output_indices.items():
+                output = self.interpreter.get_tensor(index)
+                if self._output_quantization[name] is not None:
+                    scale, zero_point = self._output_quantization[name]
+                    output = (output.astype(np.float32) - zero_point) * scale
+                outputs[name].append(output)
+
+        results = {name: np.concatenate(chunks) for name, chunks in outputs.items()}
+        if len(results) == 1:
+            return next(iter(results.values()))
+        return results
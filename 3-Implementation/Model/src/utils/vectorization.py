@@ -0,0 +1,130 @@
+"""
+Text vectorization utilities for the NutriGenius project.
+
+This module provides a TF-IDF vectorizer over a hashed vocabulary that can
+be fitted chunk by chunk, so article corpora larger than memory can be
+vectorized without keeping the raw text around.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from typing import Any, Dict, Iterable
+
+class HashingTfidfVectorizer:
+    """TF-IDF vectorizer with a stateless hashed vocabulary and incremental document frequencies."""
+
+    def __init__(self, n_features: int = 2 ** 18, smooth_idf: bool = True, dtype: type = np.float32):
+        """
+        Initialize the vectorizer.
+
+        Args:
+            n_features: Number of hash buckets (feature columns)
+            smooth_idf: Add one to document frequencies as in TfidfVectorizer
+            dtype: Data type of the produced matrices
+        """
+        self.n_features = n_features
+        self.smooth_idf = smooth_idf
+        self.dtype = dtype
+        self._hasher = HashingVectorizer(
+            n_features=n_features,
+            alternate_sign=False,
+            norm=None,
+            dtype=dtype
+        )
+
+        self.num_docs = 0
+        self.doc_freq = np.zeros(n_features, dtype=np.int64)
+        self.idf_ = None
+
+    def count(self, texts: Iterable[str]) -> sp.csr_matrix:
+        """
+        Count hashed terms of documents without updating document frequencies.
+
+        Args:
+            texts: Preprocessed documents
+
+        Returns:
+            Sparse matrix of raw term counts
+        """
+        return self._hasher.transform(texts).tocsr()
+
+    def partial_fit_counts(self, counts: sp.csr_matrix) -> sp.csr_matrix:
+        """
+        Update document frequencies from a chunk of (possibly weighted) term counts.
+
+        Args:
+            counts: Sparse document x feature term counts with no stored zeros
+
+        Returns:
+            The counts, unchanged
+        """
+        self.doc_freq += np.bincount(counts.indices, minlength=self.n_features)
+        self.num_docs += counts.shape[0]
+        return counts
+
+    def partial_fit(self, texts: Iterable[str]) -> sp.csr_matrix:
+        """
+        Count terms of a chunk of documents and update document frequencies.
+
+        Args:
+            texts: Preprocessed documents
+
+        Returns:
+            Sparse matrix of raw term counts for the chunk
+        """
+        return self.partial_fit_counts(self.count(texts))
+
+    def finalize(self) -> np.ndarray:
+        """
+        Compute IDF weights from the accumulated document frequencies.
+
+        Returns:
+            IDF weight per feature
+        """
+        if self.smooth_idf:
+            self.idf_ = np.log((1 + self.num_docs) / (1 + self.doc_freq)) + 1
+        else:
+            self.idf_ = np.log(self.num_docs / np.maximum(self.doc_freq, 1)) + 1
+        return self.idf_
+
+    def weight(self, counts: sp.csr_matrix) -> sp.csr_matrix:
+        """
+        Apply IDF weights and L2 normalization to term counts in place.
+
+        Args:
+            counts: Sparse matrix of raw term counts
+
+        Returns:
+            TF-IDF matrix with L2-normalized rows
+        """
+        if self.idf_ is None:
+            raise ValueError("IDF weights not computed. Please call finalize first.")
+        counts.data *= self.idf_[counts.indices].astype(counts.dtype)
+        return normalize(counts, norm='l2', copy=False)
+
+    def transform(self, texts: Iterable[str]) -> sp.csr_matrix:
+        """
+        Transform documents to TF-IDF vectors.
+
+        Args:
+            texts: Preprocessed documents
+
+        Returns:
+            TF-IDF matrix with L2-normalized rows
+        """
+        return self.weight(self.count(texts))
+
+    def get_params(self) -> Dict[str, Any]:
+        """
+        Get the parameters needed to recreate the vectorizer.
+
+        Returns:
+            Dictionary of JSON-serializable parameters
+        """
+        return {
+            'n_features': self.n_features,
+            'smooth_idf': self.smooth_idf,
+            'dtype': np.dtype(self.dtype).name
+        }
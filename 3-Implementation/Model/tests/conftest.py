@@ -0,0 +1,27 @@
+"""
+Shared pytest fixtures for the NutriGenius model tests.
+"""
+
+import os
+import sys
+import pytest
+
+# Make the src package importable when run from the Model directory
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from article_recommender import ArticleRecommender, create_sample_article_dataset
+
+@pytest.fixture(scope='session')
+def articles_path(tmp_path_factory) -> str:
+    """Path of a small generated article CSV."""
+    path = str(tmp_path_factory.mktemp('articles') / 'articles.csv')
+    create_sample_article_dataset(path, num_articles=300, seed=7)
+    return path
+
+@pytest.fixture
+def recommender(articles_path) -> ArticleRecommender:
+    """Recommender with article vectors built from the generated articles."""
+    recommender = ArticleRecommender()
+    recommender.load_articles(articles_path)
+    recommender.build_article_vectors()
+    return recommender
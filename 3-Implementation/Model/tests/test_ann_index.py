@@ -0,0 +1,32 @@
+"""
+Tests for the IVF approximate nearest neighbor index.
+"""
+
+import numpy as np
+
+from utils.ann_index import IVFIndex, exact_search
+
+def normalized(rng, num_vectors, dim=16):
+    vectors = rng.normal(size=(num_vectors, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def test_full_probe_matches_exact_search_after_adds():
+    rng = np.random.default_rng(0)
+    embeddings = normalized(rng, 500)
+    queries = normalized(rng, 20)
+
+    index = IVFIndex(nlist=16)
+    index.fit(embeddings[:400])
+    index.add(embeddings[400:])
+
+    # The index keeps only cluster lists over the caller's embeddings
+    assert not any(isinstance(value, np.ndarray) and value.ndim == 2 and len(value) == len(embeddings)
+                   for value in vars(index).values())
+
+    exclude = np.zeros(len(embeddings), dtype=bool)
+    exclude[::7] = True
+    approx = index.search(embeddings, queries, 10, nprobe=16, exclude=exclude)
+    exact = exact_search(embeddings, queries, 10, exclude=exclude)
+    for (indices, scores), (exact_indices, exact_scores) in zip(approx, exact):
+        assert indices.tolist() == exact_indices.tolist()
+        np.testing.assert_allclose(scores, exact_scores, rtol=1e-6)
@@ -0,0 +1,110 @@
+"""
+Tests for saving and loading ArticleRecommender models.
+"""
+
+import os
+import json
+import pickle
+import threading
+import pytest
+
+from article_recommender import ArticleRecommender
+from utils.text_processing import resolve_backend
+
+QUERY = 'protein muscle building'
+
+def test_load_then_save_to_same_path(recommender, tmp_path):
+    model_path = str(tmp_path / 'model')
+    recommender.save(model_path)
+    expected = recommender.find_similar_articles(QUERY, top_n=5)
+
+    # The loaded arrays are memory-mapped from the directory being overwritten
+    loaded = ArticleRecommender()
+    loaded.load(model_path)
+    loaded.save(model_path)
+    assert loaded.find_similar_articles(QUERY, top_n=5) == expected
+
+    reloaded = ArticleRecommender()
+    reloaded.load(model_path)
+    assert reloaded.find_similar_articles(QUERY, top_n=5) == expected
+    assert [p.name for p in tmp_path.iterdir()] == ['model']
+
+def test_content_saved_as_variable_length_text(recommender, articles_path, tmp_path):
+    model_path = tmp_path / 'model'
+    recommender.save(str(model_path))
+
+    # Long text is stored at its encoded size, not padded to the longest article
+    content_size = sum(f.stat().st_size for f in (model_path / 'metadata').glob('content.*'))
+    assert content_size < os.path.getsize(articles_path)
+
+    loaded = ArticleRecommender()
+    loaded.load(str(model_path))
+    assert loaded.articles_df['content'].tolist() == recommender.articles_df['content'].tolist()
+
+def test_legacy_pickle_needs_explicit_migration(recommender, tmp_path):
+    legacy_path = str(tmp_path / 'model.pkl')
+    with open(legacy_path, 'wb') as f:
+        pickle.dump({
+            'vectorizer': recommender.vectorizer,
+            'article_vectors': recommender.article_vectors,
+            'articles_df': recommender.articles_df
+        }, f)
+
+    with pytest.raises(ValueError, match='migrate_legacy_pickle'):
+        ArticleRecommender().load(legacy_path)
+
+    model_path = str(tmp_path / 'model')
+    ArticleRecommender.migrate_legacy_pickle(legacy_path, model_path)
+    loaded = ArticleRecommender()
+    loaded.load(model_path)
+    assert loaded.find_similar_articles(QUERY, top_n=5) == recommender.find_similar_articles(QUERY, top_n=5)
+
+def test_load_uses_recorded_tokenizer(recommender, tmp_path):
+    model_path = tmp_path / 'model'
+    recommender.save(str(model_path))
+
+    loaded = ArticleRecommender()
+    loaded.load(str(model_path))
+    assert loaded.text_preprocessor.backend == recommender.text_preprocessor.backend
+
+    try:
+        resolve_backend('nltk')
+        pytest.skip('NLTK resources are installed')
+    except LookupError:
+        pass
+
+    # A model built with NLTK must not silently fall back to the regex tokenizer
+    manifest = json.loads((model_path / 'manifest.json').read_text())
+    manifest['tokenizer'] = 'nltk'
+    (model_path / 'manifest.json').write_text(json.dumps(manifest))
+    with pytest.raises(LookupError):
+        ArticleRecommender().load(str(model_path))
+
+def test_queries_do_not_wait_for_writers(recommender):
+    expected = recommender.find_similar_articles(QUERY, top_n=5)
+    results = []
+
+    # A writer holding the lock must not block scoring
+    with recommender._lock:
+        reader = threading.Thread(target=lambda: results.append(recommender.find_similar_articles(QUERY, top_n=5)))
+        reader.start()
+        reader.join(timeout=30)
+    assert results == [expected]
+
+def test_snapshot_is_unchanged_by_added_articles(recommender):
+    recommender.use_inverted_index = True
+    recommender.build_article_vectors()
+    snapshot = recommender._snapshot
+    expected = recommender._rank_query(recommender.preprocess_text(QUERY), 5, None)
+
+    new_articles = recommender.articles_df.head(20).copy()
+    new_articles['article_id'] = [f'new-{i}' for i in range(len(new_articles))]
+    new_articles[['title', 'content', 'tags']] = QUERY
+    recommender.add_articles(new_articles)
+
+    # Queries that took the old snapshot keep scoring the old articles
+    indices, scores = recommender._rank_query(recommender.preprocess_text(QUERY), 5, None, snapshot=snapshot)
+    assert indices.tolist() == expected[0].tolist()
+    assert scores.tolist() == expected[1].tolist()
+    results = recommender.find_similar_articles(QUERY, top_n=5)
+    assert all(str(article['article_id']).startswith('new-') for article in results)
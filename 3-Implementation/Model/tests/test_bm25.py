@@ -0,0 +1,65 @@
+"""
+Tests for BM25 scoring against a brute-force implementation.
+"""
+
+import math
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from article_recommender import TEXT_FIELDS, ArticleRecommender
+
+QUERIES = ['protein muscle building', 'heart health heart fiber', 'vitamins for children']
+
+def brute_force_bm25(recommender, query, k1, b):
+    """Score every article term by term with the Okapi BM25 formula."""
+    analyzer = recommender.vectorizer.build_analyzer()
+    vocabulary = recommender.vectorizer.vocabulary_
+    field_weights = recommender.field_weights or {field: 1.0 for field in TEXT_FIELDS}
+
+    # Field-weighted term frequencies of each article
+    documents = []
+    for _, article in recommender.articles_df.iterrows():
+        tf = Counter()
+        for field in TEXT_FIELDS:
+            for token in analyzer(recommender.preprocess_text(article[field])):
+                if token in vocabulary:
+                    tf[token] += field_weights[field]
+        documents.append(tf)
+
+    num_docs = len(documents)
+    avg_length = sum(sum(tf.values()) for tf in documents) / num_docs
+    doc_freq = Counter(term for tf in documents for term in tf)
+    query_terms = Counter(token for token in analyzer(recommender.preprocess_text(query)) if token in vocabulary)
+
+    scores = np.zeros(num_docs)
+    for doc, tf in enumerate(documents):
+        length = sum(tf.values())
+        for term, query_count in query_terms.items():
+            if tf[term] == 0:
+                continue
+            idf = math.log1p((num_docs - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            saturation = tf[term] * (k1 + 1) / (tf[term] + k1 * (1 - b + b * length / avg_length))
+            scores[doc] += query_count * idf * saturation
+    return scores
+
+@pytest.mark.parametrize('field_weights', [None, {'title': 3.0, 'content': 1.0, 'tags': 2.0, 'category': 1.0}])
+def test_bm25_matches_brute_force(articles_path, field_weights):
+    recommender = ArticleRecommender()
+    recommender.model_type = 'bm25'
+    recommender.bm25_config = {'k1': 1.2, 'b': 0.75, 'delta': 0.0}
+    recommender.field_weights = field_weights
+    recommender.result_cache = None
+    recommender.load_articles(articles_path)
+    recommender.build_article_vectors()
+
+    for query in QUERIES:
+        scores = brute_force_bm25(recommender, query, k1=1.2, b=0.75)
+        # Descending score, ties by ascending row as in select_top_n
+        expected = np.lexsort((np.arange(len(scores)), -scores))[:10]
+
+        results = recommender.find_similar_articles(query, top_n=10, output='tuples')
+        article_ids = recommender.articles_df['article_id'].to_numpy()
+        assert [row[0] for row in results] == article_ids[expected].tolist()
+        np.testing.assert_allclose([row[-1] for row in results], scores[expected])
@@ -0,0 +1,19 @@
+"""
+Tests for the shared TFLite conversion settings.
+"""
+
+import os
+import pytest
+
+from utils.common import get_tflite_quantization, load_config
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'config', 'model_config.yaml')
+
+def test_legacy_quantization_flag_with_default_config():
+    tflite_config = dict(load_config(CONFIG_PATH)['tflite_conversion'], quantization=True)
+    assert get_tflite_quantization(tflite_config) == 'dynamic'
+    assert get_tflite_quantization(dict(tflite_config, quantization_mode='int8')) == 'int8'
+
+def test_conflicting_quantization_settings_raise():
+    with pytest.raises(ValueError, match='quantization_mode'):
+        get_tflite_quantization({'quantization': True, 'quantization_mode': 'none'})
@@ -0,0 +1,65 @@
+"""
+Tests for facet-filtered search against brute-force filtering.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from article_recommender import ArticleRecommender
+
+QUERIES = ['protein muscle building', 'heart health fiber', 'vitamins for children']
+
+FILTERS = [
+    {'category': 'Sports Nutrition'},
+    {'category': ['sports nutrition', 'Food Science'], 'tags': 'vegan'},
+    {'tags': ['keto', 'paleo'], 'date_from': '2022-06-01', 'date_to': '2023-03-31'},
+    {'date_to': '2022-03-01'}
+]
+
+def matches(article, filters):
+    """Check one article against filters by reading its fields."""
+    if 'category' in filters:
+        categories = [filters['category']] if isinstance(filters['category'], str) else filters['category']
+        if article['category'].strip().lower() not in {value.lower() for value in categories}:
+            return False
+    if 'tags' in filters:
+        tags = [filters['tags']] if isinstance(filters['tags'], str) else filters['tags']
+        article_tags = {tag.strip().lower() for tag in article['tags'].split(',')}
+        if not article_tags & {tag.lower() for tag in tags}:
+            return False
+    date = pd.Timestamp(article['date'])
+    if 'date_from' in filters and date < pd.Timestamp(filters['date_from']):
+        return False
+    if 'date_to' in filters and date > pd.Timestamp(filters['date_to']):
+        return False
+    return True
+
+@pytest.mark.parametrize('model_type', ['tfidf', 'lsa'])
+def test_filtered_search_matches_brute_force(articles_path, model_type):
+    recommender = ArticleRecommender()
+    recommender.model_type = model_type
+    recommender.result_cache = None
+    recommender.load_articles(articles_path)
+    recommender.build_article_vectors()
+    article_ids = recommender.articles_df['article_id'].to_numpy()
+
+    for filters in FILTERS:
+        # Filter by scanning every article, then rank the matches by their full score
+        rows = np.array([
+            row for row, (_, article) in enumerate(recommender.articles_df.iterrows())
+            if matches(article, filters)
+        ])
+        assert len(rows) > 0
+
+        for query in QUERIES:
+            query_vector = recommender.vectorizer.transform([recommender.preprocess_text(query)])
+            if model_type == 'lsa':
+                scores = recommender.article_embeddings @ recommender._embed(query_vector).ravel()
+            else:
+                scores = (recommender.article_vectors @ query_vector.T).toarray().ravel()
+            expected = rows[np.lexsort((rows, -scores[rows]))][:5]
+
+            results = recommender.find_similar_articles(query, top_n=5, output='tuples', filters=filters)
+            assert [row[0] for row in results] == article_ids[expected].tolist()
+            np.testing.assert_allclose([row[-1] for row in results], scores[expected], rtol=1e-5)
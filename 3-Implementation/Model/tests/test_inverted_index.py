@@ -0,0 +1,63 @@
+"""
+Tests for the inverted index.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+import pytest
+
+from utils.inverted_index import InvertedIndex
+
+def test_many_appends_keep_segments_bounded():
+    vectors = sp.random(600, 50, density=0.1, format='csr', random_state=3)
+    index = InvertedIndex(vectors[:100])
+    for row in range(100, 600):
+        index.append(vectors[row:row + 1])
+
+    assert len(index.segments) <= index.max_segments
+    rebuilt = InvertedIndex(vectors)
+    for term in range(vectors.shape[1]):
+        docs, weights = index.postings(term)
+        expected_docs, expected_weights = rebuilt.postings(term)
+        np.testing.assert_array_equal(docs, expected_docs)
+        np.testing.assert_array_equal(weights, expected_weights)
+
+@pytest.mark.parametrize('mode', ['exhaustive', 'maxscore'])
+def test_search_after_appends_matches_rebuilt_index(mode):
+    vectors = sp.random(300, 40, density=0.1, format='csr', random_state=5)
+    index = InvertedIndex(vectors[:50])
+    for start in range(50, 300, 7):
+        index.append(vectors[start:start + 7])
+
+    rebuilt = InvertedIndex(vectors)
+    query = sp.random(1, 40, density=0.2, format='csr', random_state=7)
+    docs, scores = index.search(query, top_n=10, mode=mode)
+    expected_docs, expected_scores = rebuilt.search(query, top_n=10, mode=mode)
+    np.testing.assert_array_equal(docs, expected_docs)
+    np.testing.assert_allclose(scores, expected_scores)
+
+@pytest.mark.parametrize('min_score', [None, 0.2])
+def test_maxscore_matches_brute_force_on_articles(recommender, min_score):
+    vectors = recommender.article_vectors
+    index = InvertedIndex(vectors)
+    exclude = np.zeros(vectors.shape[0], dtype=bool)
+    exclude[::5] = True
+
+    # Long queries with a small top-N, so most terms are only probed for candidates
+    terms = recommender.vectorizer.get_feature_names_out()
+    rng = np.random.default_rng(11)
+    for _ in range(20):
+        query = ' '.join(rng.choice(terms, size=12, replace=False))
+        query_vector = recommender.vectorizer.transform([query])
+
+        # Score every article and keep the best matching ones
+        scores = (vectors @ query_vector.T).toarray().ravel()
+        keep = (scores > 0) & ~exclude
+        if min_score is not None:
+            keep &= scores >= min_score
+        candidates = np.flatnonzero(keep)
+        expected = candidates[np.lexsort((candidates, -scores[candidates]))][:3]
+
+        docs, doc_scores = index.search(query_vector, top_n=3, mode='maxscore', min_score=min_score, exclude=exclude)
+        np.testing.assert_array_equal(docs, expected)
+        np.testing.assert_allclose(doc_scores, scores[expected])
@@ -0,0 +1,70 @@
+"""
+Tests for the HTTP handling of the recommendation service.
+"""
+
+import json
+import asyncio
+import pytest
+
+from recommender_service import RecommendationService
+
+async def send_request(service: RecommendationService, content_length: str, body: bytes = b'') -> tuple:
+    """Send one POST /recommend request and return the status and JSON payload."""
+    server = await asyncio.start_server(service.handle_connection, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(
+            f"POST /recommend HTTP/1.1\r\nContent-Length: {content_length}\r\n\r\n".encode('latin-1') + body
+        )
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+    head, _, payload = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(payload)
+
+@pytest.mark.parametrize('content_length', ['abc', '-5', '1.5'])
+def test_invalid_content_length_is_rejected(recommender, content_length):
+    service = RecommendationService(recommender)
+    status, payload = asyncio.run(send_request(service, content_length))
+    assert status == 400
+    assert payload == {'error': 'Invalid Content-Length'}
+
+def test_body_over_limit_is_rejected(recommender):
+    service = RecommendationService(recommender, max_body_bytes=16)
+    status, _ = asyncio.run(send_request(service, '17', b'{' * 17))
+    assert status == 413
+
+VALID_PROFILES = [
+    {'user_profile': {'age': 25, 'gender': 'female'}, 'food_items': ['oats']},
+    {'user_profile': {'age': 60, 'gender': 'male'}, 'health_status': {'bmi': 27}}
+]
+INVALID_PROFILE = {'user_profile': {'age': 'thirty'}}
+
+async def recommend_all(service: RecommendationService, profiles: list) -> list:
+    """Send the profiles concurrently so they are scored in one batch."""
+    await service.start()
+    try:
+        return await asyncio.gather(
+            *[service.recommend(profile, top_n=3) for profile in profiles], return_exceptions=True
+        )
+    finally:
+        await service.stop()
+
+def test_invalid_profile_fails_only_its_request(recommender):
+    expected = recommender.recommend_for_users(VALID_PROFILES, top_n=3, output='records')
+    service = RecommendationService(recommender, batch_window_ms=50)
+    results = asyncio.run(recommend_all(service, [VALID_PROFILES[0], INVALID_PROFILE, VALID_PROFILES[1]]))
+
+    assert isinstance(results[1], TypeError)
+    assert [results[0], results[2]] == expected
+    assert service.metrics.batches == 1
+
+def test_failed_batch_is_retried_per_request(recommender):
+    # Requests queued without validation still only fail on their own
+    service = RecommendationService(recommender)
+    batch = [(profile, 3, None, None, None) for profile in (VALID_PROFILES[0], INVALID_PROFILE, VALID_PROFILES[1])]
+    results = service._score_batch(batch)
+
+    assert isinstance(results[1], TypeError)
+    assert [results[0], results[2]] == recommender.recommend_for_users(VALID_PROFILES, top_n=3, output='records')
@@ -0,0 +1,66 @@
+"""
+Tests for sharded article search.
+"""
+
+import pytest
+
+from article_recommender import ArticleRecommender
+
+QUERIES = ['protein muscle building', 'heart health fiber', 'vitamins for children']
+
+def build(articles_path, model_type, num_shards, n_workers=1):
+    recommender = ArticleRecommender()
+    recommender.model_type = model_type
+    recommender.result_cache = None
+    recommender.sharding_config = {'num_shards': num_shards, 'strategy': 'hash', 'n_workers': n_workers}
+    recommender.load_articles(articles_path)
+    recommender.build_article_vectors()
+    return recommender
+
+def assert_same_results(results, expected):
+    assert [row[:-1] for row in results] == [row[:-1] for row in expected]
+    assert [row[-1] for row in results] == pytest.approx([row[-1] for row in expected])
+
+@pytest.mark.parametrize('model_type', ['tfidf', 'lsa'])
+@pytest.mark.parametrize('n_workers', [1, 0])
+def test_sharded_results_match_unsharded(articles_path, model_type, n_workers):
+    reference = build(articles_path, model_type, 1)
+    sharded = build(articles_path, model_type, 4, n_workers)
+
+    # The shards hold the only copy of the vectors
+    assert sharded._article_vectors is None
+    assert (sharded.article_vectors != reference.article_vectors).nnz == 0
+
+    new_articles = reference.articles_df.head(10).copy()
+    new_articles['article_id'] = [f'new-{i}' for i in range(len(new_articles))]
+    for recommender in (reference, sharded):
+        recommender.add_articles(new_articles)
+        recommender.remove_articles([0, 1, 2])
+
+    filters = {'category': reference.articles_df['category'].iloc[0]}
+    for query in QUERIES:
+        assert_same_results(
+            sharded.find_similar_articles(query, top_n=5, output='tuples'),
+            reference.find_similar_articles(query, top_n=5, output='tuples')
+        )
+        assert_same_results(
+            sharded.find_similar_articles(query, top_n=5, output='tuples', filters=filters),
+            reference.find_similar_articles(query, top_n=5, output='tuples', filters=filters)
+        )
+    batch = sharded.find_similar_articles_batch(QUERIES, top_n=5, output='tuples')
+    expected = reference.find_similar_articles_batch(QUERIES, top_n=5, output='tuples')
+    for results, expected_results in zip(batch, expected):
+        assert_same_results(results, expected_results)
+
+    sharded.compact()
+    assert sharded._article_vectors is None
+    sharded.close()
+
+def test_rebuild_reuses_scoring_threads(articles_path):
+    recommender = build(articles_path, 'tfidf', 4, n_workers=0)
+    executor = recommender._shard_executor
+    recommender.build_sharded_index()
+    assert recommender._shard_executor is executor
+
+    recommender.close()
+    assert executor._shutdown